@@ -0,0 +1,363 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+from config import MATCH_TOP_K, MATCH_CHUNK_SIZE, MATCH_SKILL_WEIGHT
+from utils.instrumentation import metrics
+from utils.job_attributes import SKILLS, extract_skills
+from utils.parallel import SharedColumns, process_pool
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc few for from further had has have having he her here hers him his how i if in
+into is it its just me more most my no nor not of off on once only or other our ours out over own
+same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+would you your yours able work working team role experience years year job company including
+""".split())
+
+_SKILL_IDS = {skill: i for i, skill in enumerate(SKILLS)}
+
+
+def resume_text(resume_data):
+    """All free text of a parsed resume: skills, experience, education and summary."""
+    parts = []
+    for key in ("skills", "experience", "education", "projects", "certifications"):
+        value = resume_data.get(key) or []
+        parts.extend(str(item) for item in (value if isinstance(value, (list, tuple)) else [value]))
+    for key in ("summary", "text", "raw_text"):
+        if resume_data.get(key):
+            parts.append(str(resume_data[key]))
+    return "\n".join(parts)
+
+
+def resume_skills(resume_data):
+    """Canonical skills of a parsed resume, from its skill list and the rest of its text."""
+    return extract_skills(resume_text(resume_data))
+
+
+def job_skills(job):
+    """Canonical skills of a job, as extracted at ingestion when available."""
+    if "skills" in job:
+        return list(job["skills"] or [])
+    return extract_skills(f"{job.get('title', '')}\n{job.get('description', '')}")
+
+
+class _Vocabulary(dict):
+    """Term -> column, numbering terms as they are first looked up; stopwords map to -1."""
+
+    def __init__(self):
+        super().__init__((word, -1) for word in _STOPWORDS)
+        self.terms = []
+
+    def __missing__(self, term):
+        column = self[term] = len(self.terms)
+        self.terms.append(term)
+        return column
+
+
+def _count_terms(docs):
+    """
+    Term occurrences of docs over a vocabulary local to this call.
+
+    Returns:
+        tuple: (rows, columns, terms): one (row, column) pair per occurrence,
+            and the term of each local column
+    """
+    vocabulary = _Vocabulary()
+    columns, lengths = [], []
+    for doc in docs:
+        ids = list(map(vocabulary.__getitem__, _TOKEN.findall(str(doc or "").lower())))
+        columns.extend(ids)
+        lengths.append(len(ids))
+    columns = np.array(columns, dtype=np.int64)
+    rows = np.repeat(np.arange(len(docs)), lengths)
+    keep = columns >= 0
+    return rows[keep], columns[keep], vocabulary.terms
+
+
+def _count_terms_chunk(columns, start, stop):
+    """Worker task: _count_terms over rows start:stop of a shared "docs" text column."""
+    rows, term_columns, terms = _count_terms([columns.text("docs", row) for row in range(start, stop)])
+    return rows + start, term_columns, terms
+
+
+def _skill_matrix(skill_lists):
+    rows, columns = [], []
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            column = _SKILL_IDS.get(skill)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(len(skill_lists), len(_SKILL_IDS))
+    )
+
+
+def _term_matrices(resume_docs, job_docs):
+    """L2-normalized TF-IDF matrices for resumes and jobs over one shared vocabulary.
+
+    IDF comes from the job corpus, so terms every posting uses weigh little.
+    """
+    vocabulary = _Vocabulary()
+
+    def counts(docs):
+        if process_pool.offload(len(docs)):
+            # Tokenizing is pure Python; large corpora are split across worker processes
+            with SharedColumns(texts={"docs": docs}) as shared:
+                parts = process_pool.map(_count_terms_chunk, shared, len(docs), stage="match_terms")
+        else:
+            parts = [_count_terms(docs)]
+        # Map each part's local columns onto the shared vocabulary
+        rows, columns = [], []
+        for part_rows, part_columns, terms in parts:
+            ids = np.array(list(map(vocabulary.__getitem__, terms)) or [0], dtype=np.int64)
+            rows.append(part_rows)
+            columns.append(ids[part_columns])
+        return np.concatenate(rows), np.concatenate(columns)
+
+    job_rows, job_columns = counts(job_docs)
+    resume_rows, resume_columns = counts(resume_docs)
+    size = len(vocabulary.terms)
+
+    def matrix(rows, columns, n_docs):
+        data = np.ones(len(rows), dtype=np.float32)
+        # Duplicate (row, column) entries are summed into term counts
+        return sparse.csr_matrix((data, (rows, columns)), shape=(n_docs, size))
+
+    jobs = matrix(job_rows, job_columns, len(job_docs))
+    resumes = matrix(resume_rows, resume_columns, len(resume_docs))
+
+    document_frequency = np.bincount(jobs.indices, minlength=size)
+    idf = (np.log((1 + len(job_docs)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def weigh(m):
+        m.data = (1 + np.log(m.data)) * idf[m.indices]  # sublinear term frequency
+        norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.csr_matrix(sparse.diags(1 / norms) @ m)
+
+    return weigh(resumes), weigh(jobs)
+
+
+def _score_block(features, start, stop, skill_weight):
+    """Dense resumes x (stop - start) scores for one chunk of jobs."""
+    coverage = (features["resume_skills"] @ features["job_skills_t"][:, start:stop]).toarray()
+    counts = features["job_skill_counts"][start:stop]
+    similarity = (features["resume_terms"] @ features["job_terms_t"][:, start:stop]).toarray()
+    has_skills = counts > 0
+    coverage /= np.where(has_skills, counts, 1)
+    # Jobs naming no known skill are scored on text similarity alone
+    return np.where(has_skills, skill_weight * coverage + (1 - skill_weight) * similarity, similarity)
+
+
+def _top_block(features, start, stop, k, skill_weight):
+    """(job indices, scores) of the best k jobs of one chunk for every resume."""
+    scores = _score_block(features, start, stop, skill_weight)
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top + start, np.take_along_axis(scores, top, axis=1)
+
+
+# Sparse feature matrices shared with worker processes, as (name, format)
+_SHARED_MATRICES = (("resume_skills", "csr"), ("job_skills_t", "csc"), ("resume_terms", "csr"), ("job_terms_t", "csc"))
+
+
+def _share_features(features):
+    arrays = {"job_skill_counts": features["job_skill_counts"]}
+    shapes = {}
+    for name, _ in _SHARED_MATRICES:
+        matrix = features[name]
+        arrays.update({f"{name}.data": matrix.data, f"{name}.indices": matrix.indices, f"{name}.indptr": matrix.indptr})
+        shapes[name] = matrix.shape
+    return SharedColumns(arrays), shapes
+
+
+def _top_block_task(columns, start, stop, k, skill_weight, shapes):
+    """Worker task: _top_block over shared feature matrices, read in place."""
+    features = {"job_skill_counts": columns.array("job_skill_counts")}
+    for name, kind in _SHARED_MATRICES:
+        parts = tuple(columns.array(f"{name}.{part}") for part in ("data", "indices", "indptr"))
+        features[name] = (sparse.csr_matrix if kind == "csr" else sparse.csc_matrix)(parts, shape=shapes[name], copy=False)
+    indices, scores = _top_block(features, start, stop, k, skill_weight)
+    return indices.copy(), scores.copy()
+
+
+class MatchResult:
+    """Top-K jobs per resume from a batch match."""
+
+    def __init__(self, resumes, jobs, indices, scores, resume_skill_lists, job_skill_lists):
+        self.resumes = resumes
+        self.jobs = jobs
+        self.indices = indices  # resumes x K job indices, best first
+        self.scores = scores    # resumes x K scores in [0, 1]
+        self._resume_skills = resume_skill_lists
+        self._job_skills = job_skill_lists
+
+    def top(self, resume_index):
+        """
+        Ranked matches of one resume.
+
+        Key matches and gaps are the job's required skills the resume has and
+        lacks; no LLM is involved.
+
+        Args:
+            resume_index (int): Position of the resume in the batch
+
+        Returns:
+            list: Dicts with job, job_index, match_score (0-100), key_matches and gaps
+        """
+        owned = set(self._resume_skills[resume_index])
+        matches = []
+        for job_index, score in zip(self.indices[resume_index], self.scores[resume_index]):
+            required = self._job_skills[job_index]
+            matches.append({
+                "job": self.jobs[job_index],
+                "job_index": int(job_index),
+                "match_score": int(round(float(score) * 100)),
+                "key_matches": [skill for skill in required if skill in owned],
+                "gaps": [skill for skill in required if skill not in owned],
+            })
+        return matches
+
+    def __len__(self):
+        return len(self.resumes)
+
+
+class BatchMatcher:
+    """Scores many resumes against many jobs with sparse matrix products.
+
+    Resumes and jobs become two sparse feature blocks: canonical skills from
+    the job_attributes dictionary, and TF-IDF weighted terms. A job's score
+    for a resume mixes the share of the job's skills the resume covers with
+    the cosine similarity of their terms. The resumes x jobs score matrix is
+    never materialized: jobs are scored in chunks, and each chunk keeps only
+    its top K per resume before the chunks are merged.
+
+    Large batches run on the process pool: documents are tokenized in
+    worker processes, and chunks are scored there from feature matrices
+    placed in shared memory, so a cohort uses every core.
+    """
+
+    def __init__(self, top_k=MATCH_TOP_K, chunk_size=MATCH_CHUNK_SIZE, skill_weight=MATCH_SKILL_WEIGHT):
+        """
+        Args:
+            top_k (int): Jobs kept per resume
+            chunk_size (int): Jobs scored per chunk
+            skill_weight (float): Share of the score from skill coverage, between 0 and 1
+        """
+        self.top_k = top_k
+        self.chunk_size = chunk_size
+        self.skill_weight = skill_weight
+
+    def _features(self, resumes, jobs):
+        resume_skill_lists = [resume_skills(resume) for resume in resumes]
+        job_skill_lists = [job_skills(job) for job in jobs]
+        resume_terms, job_terms = _term_matrices(
+            [resume_text(resume) for resume in resumes],
+            [f"{job.get('title', '')}\n{job.get('description', '')}" for job in jobs],
+        )
+        job_skill_matrix = _skill_matrix(job_skill_lists)
+        return {
+            "resume_skill_lists": resume_skill_lists,
+            "job_skill_lists": job_skill_lists,
+            "resume_skills": _skill_matrix(resume_skill_lists),
+            # Transposed once so every chunk is a cheap column slice
+            "job_skills_t": job_skill_matrix.T.tocsc(),
+            "job_skill_counts": np.asarray(job_skill_matrix.sum(axis=1)).ravel(),
+            "resume_terms": resume_terms,
+            "job_terms_t": job_terms.T.tocsc(),
+        }
+
+    def score(self, resume_data, jobs):
+        """
+        Score every job for one resume.
+
+        Args:
+            resume_data (dict): The parsed resume data
+            jobs (list): Job dictionaries
+
+        Returns:
+            numpy.ndarray: Score in [0, 1] per job, in job order
+        """
+        if not jobs:
+            return np.zeros(0)
+        features = self._features([resume_data], jobs)
+        return np.concatenate([
+            _score_block(features, start, min(start + self.chunk_size, len(jobs)), self.skill_weight)[0]
+            for start in range(0, len(jobs), self.chunk_size)
+        ])
+
+    def match(self, resumes, jobs, top_k=None):
+        """
+        Best jobs for each of many resumes.
+
+        Jobs with equal scores are listed in job order. Which of them are kept
+        when they tie at the top_k cut-off depends on the chunking.
+
+        Args:
+            resumes (list): Parsed resume dictionaries
+            jobs (list): Job dictionaries
+            top_k (int, optional): Jobs kept per resume, defaults to the matcher's top_k
+
+        Returns:
+            MatchResult: Top jobs and scores per resume
+        """
+        k = top_k or self.top_k
+        if not resumes or not jobs:
+            empty = np.zeros((len(resumes), 0))
+            return MatchResult(resumes, jobs, empty.astype(int), empty, [[] for _ in resumes], [])
+
+        with metrics.span("batch_match", resumes=len(resumes), jobs=len(jobs)):
+            with metrics.span("match_features"):
+                features = self._features(resumes, jobs)
+
+            with metrics.span("match_score"):
+                if process_pool.offload(len(jobs)) and len(jobs) > self.chunk_size:
+                    shared, shapes = _share_features(features)
+                    with shared:
+                        parts = process_pool.map(_top_block_task, shared, len(jobs), k, self.skill_weight, shapes,
+                                                 chunk_size=self.chunk_size, stage="match_score")
+                else:
+                    parts = [
+                        _top_block(features, start, min(start + self.chunk_size, len(jobs)), k, self.skill_weight)
+                        for start in range(0, len(jobs), self.chunk_size)
+                    ]
+
+                # Merge the chunks' candidates and order each resume's best first
+                indices = np.hstack([part[0] for part in parts])
+                scores = np.hstack([part[1] for part in parts])
+                k = min(k, scores.shape[1])
+                best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                indices = np.take_along_axis(indices, best, axis=1)
+                scores = np.take_along_axis(scores, best, axis=1)
+                order = np.lexsort((indices, -scores))
+                indices = np.take_along_axis(indices, order, axis=1)
+                scores = np.take_along_axis(scores, order, axis=1)
+
+        return MatchResult(resumes, jobs, indices, scores, features["resume_skill_lists"], features["job_skill_lists"])
+
+    def explain(self, result, resume_index, rank=0, agent=None):
+        """
+        Detailed analysis of one match, the only step that calls the LLM.
+
+        Args:
+            result (MatchResult): Result of match()
+            resume_index (int): Position of the resume in the batch
+            rank (int): Position of the job in that resume's top matches
+            agent (JobSearchAgent, optional): Agent whose model writes the analysis
+
+        Returns:
+            dict: Match analysis with score and recommendations
+        """
+        if agent is None:
+            from agents.job_search_agent import JobSearchAgent
+            agent = JobSearchAgent()
+        match = result.top(resume_index)[rank]
+        return agent.get_job_match_analysis(result.resumes[resume_index], match["job"])
+
+
+batch_matcher = BatchMatcher()
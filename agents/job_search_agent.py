@@ -1,19 +1,96 @@
-from google.generativeai import GenerativeModel
-from utils.job_scraper import JobScraper
-from utils.serp_api_searcher import SerpApiSearcher
-from config import GEMINI_API_KEY, GEMINI_MODEL, JOB_PLATFORMS
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.instrumentation import metrics
+from config import JOB_PLATFORMS, SEARCH_MAX_WORKERS
+
+# Structured output requested from the LLM. Fields are listed in the order the
+# prompt asks for them, so the score streams first and the lists follow.
+MATCH_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "match_score": {"type": "integer"},
+        "key_matches": {"type": "array", "items": {"type": "string"}},
+        "gaps": {"type": "array", "items": {"type": "string"}},
+        "recommendations": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["match_score", "key_matches", "gaps", "recommendations"],
+}
 
 class JobSearchAgent:
     """Agent for searching and matching jobs."""
     
     def __init__(self):
         """Initialize the job search agent."""
-        self.api_key = GEMINI_API_KEY
-        self.model = GEMINI_MODEL
-        self.job_scraper = JobScraper()
-        self.serp_api_searcher = SerpApiSearcher()
+        # Search backends come from the process-wide provider registry on first use,
+        # so every agent shares one connection pool, cache and rate limit per backend.
+        # Entries set here override the registry for this agent only.
+        self.provider_names = None  # None = every registered provider
+        self._providers = {}
+        self._executor = None
+        self._planner = None
+        self._llm = None
+
+    @property
+    def planner(self):
+        """Query planner deciding providers and pages per search, shared process-wide by default."""
+        if self._planner is None:
+            from utils.query_planner import planner
+            self._planner = planner
+        return self._planner
+
+    @planner.setter
+    def planner(self, value):
+        self._planner = value
+
+    def get_provider(self, name):
+        """Provider instance for name, from this agent's overrides or the registry."""
+        if name not in self._providers:
+            from utils.providers import get_provider
+            self._providers[name] = get_provider(name)
+        return self._providers[name]
+
+    def set_provider(self, name, provider):
+        """Use provider for name in this agent instead of the registry's instance."""
+        self._providers[name] = provider
+
+    @property
+    def job_scraper(self):
+        return self.get_provider("scraper")
+
+    @job_scraper.setter
+    def job_scraper(self, value):
+        self.set_provider("scraper", value)
+
+    @property
+    def serp_api_searcher(self):
+        return self.get_provider("scrapingdog")
+
+    @serp_api_searcher.setter
+    def serp_api_searcher(self, value):
+        self.set_provider("scrapingdog", value)
+
+    @property
+    def llm(self):
+        """LLM backend writing match analyses, the process-wide LLM_BACKEND by default."""
+        if self._llm is None:
+            from utils.llm import get_llm_backend
+            self._llm = get_llm_backend()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value):
+        self._llm = value
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="provider")
+        return self._executor
     
-    def search_jobs(self, resume_data, keywords, location, platforms=None, count=5):
+    def search_jobs(self, resume_data, keywords, location, platforms=None, count=5, days_ago=5, stale_ok=True,
+                    job_filter=None):
         """
         Search for jobs based on resume and keywords.
         
@@ -23,44 +100,164 @@ class JobSearchAgent:
             location (str): Job location
             platforms (list): List of job platforms to search
             count (int): Number of jobs per platform
+            days_ago (int): Only jobs posted within this many days, where the provider supports it
+            stale_ok (bool): Accept stale cached provider answers (refreshed in the background)
+            job_filter (JobFilter, optional): Filters pushed down to providers that support
+                them and applied locally to the results of the others
             
         Returns:
             list: List of job dictionaries
         """
         if not platforms:
             platforms = JOB_PLATFORMS
-            
-        # Try the SerpAPI approach first (this will have real links)
-        api_jobs = []
-        
-        for platform in platforms:
-            # Use SerpAPI to search for real jobs
-            platform_jobs = self.serp_api_searcher.search_jobs(
-                keywords, 
-                location, 
-                platform=platform, 
-                count=count
-            )
-            api_jobs.extend(platform_jobs)
-        
-        # If we got results from SerpAPI, use those
-        if api_jobs:
-            return api_jobs
-            
-        # Fallback to the scraper if SerpAPI fails
-        print("SerpAPI search returned no results. Falling back to scraper.")
-        all_jobs = []
-        for platform in platforms:
-            platform_jobs = self.job_scraper.search_jobs(
-                keywords, 
-                location, 
-                platform=platform, 
-                count=count
+
+        with metrics.trace("agent_search", keywords=keywords, location=location):
+            return self._search_all_platforms(keywords, location, platforms, count, days_ago, stale_ok, job_filter)
+
+    def search_new_jobs(self, resume_data, owner, keywords, location, platforms=None, count=5, days_ago=5,
+                        stale_ok=True, job_filter=None):
+        """
+        Search, then keep only postings the owner has not seen for this query or that changed.
+
+        Args:
+            resume_data (dict): The parsed resume data
+            owner (str): User or session whose seen postings are tracked
+            keywords (str): Search keywords or job title
+            location (str): Job location
+            platforms (list): List of job platforms to search
+            count (int): Number of jobs per platform
+            days_ago (int): Only jobs posted within this many days, where the provider supports it
+            stale_ok (bool): Accept stale cached provider answers (refreshed in the background)
+            job_filter (JobFilter, optional): Structured filters, see search_jobs
+
+        Returns:
+            list: New or changed job dictionaries, each with "delta" set to "new" or "changed"
+        """
+        from utils.delta import delta_tracker, query_key
+
+        if not platforms:
+            platforms = JOB_PLATFORMS
+        jobs = self.search_jobs(
+            resume_data, keywords, location, platforms=platforms, count=count, days_ago=days_ago, stale_ok=stale_ok,
+            job_filter=job_filter
+        )
+        with metrics.span("delta_filter"):
+            return delta_tracker.delta(owner, query_key(keywords, location, platforms, days_ago, job_filter), jobs)
+
+    def plan_search(self, keywords, location, platforms, count, days_ago=5, job_filter=None):
+        """
+        Plan which providers to call for a search and how many pages each fetches.
+
+        Returns:
+            QueryPlan: Primary and fallback calls plus skipped providers
+        """
+        from utils.providers import registry
+
+        providers = [self.get_provider(name) for name in self.provider_names or registry.names()]
+        return self.planner.plan(providers, keywords, location, platforms, count, days_ago, job_filter)
+
+    def refreshes_pending(self, keywords, location, platforms, count=5, days_ago=5, job_filter=None):
+        """
+        Whether any provider is still refreshing a stale cached answer for this search.
+
+        Once this turns False, repeating the search returns the refreshed results
+        straight from the providers' caches.
+        """
+        from utils.providers import registry
+
+        if not platforms:
+            platforms = JOB_PLATFORMS
+        for name in self.provider_names or registry.names():
+            provider = self.get_provider(name)
+            filters = self._split_filter(provider, job_filter)[0]
+            # The planner may have asked for any number of pages, each cached on its own
+            for platform in platforms:
+                for pages in range(1, self.planner.max_pages + 1):
+                    if provider.is_refreshing(keywords, location, platform=platform, count=count,
+                                              days_ago=days_ago, pages=pages, filters=filters):
+                        return True
+        return False
+
+    @staticmethod
+    def _split_filter(provider, job_filter):
+        """(pushed, residual) parts of job_filter for provider, (None, None) without a filter."""
+        if job_filter is None:
+            return None, None
+        return job_filter.pushdown(provider.capabilities.filter_pushdown)
+
+    def _run_calls(self, calls, keywords, location, count, days_ago, stale_ok=True, job_filter=None):
+        """Run planned calls concurrently; results keep the plan's order."""
+        if not calls:
+            return []
+
+        splits = [self._split_filter(call.provider, job_filter) for call in calls]
+
+        # Each call runs in a copy of this context so its spans land in the current trace
+        futures = [
+            self.executor.submit(
+                contextvars.copy_context().run,
+                call.provider.search_jobs, keywords, location,
+                platform=call.platform, count=count, days_ago=days_ago, pages=max(1, call.pages),
+                stale_ok=stale_ok, filters=pushed
             )
-            all_jobs.extend(platform_jobs)
-        
-        return all_jobs
+            for call, (pushed, _) in zip(calls, splits)
+        ]
+
+        jobs = []
+        for call, (_, residual), future in zip(calls, splits, futures):
+            try:
+                call_jobs = future.result()
+            except Exception as e:
+                metrics.inc("provider_errors_total", provider=call.provider.name)
+                print(f"Error searching {call.platform} with {call.provider.name}: {e}")
+                continue
+            if not call.cached:
+                self.planner.record(
+                    call.provider.name, call.platform, call.pages,
+                    call.provider.capabilities.results_per_page, len(call_jobs), count
+                )
+            if residual is not None and residual.active():
+                # Whatever the provider could not filter natively is applied here
+                from utils.job_filters import filter_jobs
+                with metrics.span("filter", provider=call.provider.name):
+                    call_jobs = filter_jobs(call_jobs, residual)
+            jobs.extend(call_jobs)
+        return jobs
+
+    def _search_all_platforms(self, keywords, location, platforms, count, days_ago=5, stale_ok=True,
+                              job_filter=None):
+        plan = self.plan_search(keywords, location, platforms, count, days_ago, job_filter)
+
+        # Query the providers with real listings first
+        jobs = self._run_calls(plan.primary, keywords, location, count, days_ago, stale_ok, job_filter)
+        if jobs:
+            # Providers and overlapping pages can return the same posting more than once
+            from utils.job_filters import dedupe_jobs
+            with metrics.span("dedupe"):
+                return dedupe_jobs(jobs)
+
+        # Fall back to the placeholder providers if none of them returned anything
+        print("Search providers returned no results. Falling back to scraper.")
+        return self._run_calls(plan.fallback, keywords, location, count, days_ago, stale_ok, job_filter)
     
+    def match_resumes(self, resumes, jobs, top_k=None):
+        """
+        Score many resumes against many jobs and keep the best jobs per resume.
+
+        Scoring is vectorized and makes no LLM calls; use get_job_match_analysis
+        for a detailed explanation of the matches worth explaining.
+
+        Args:
+            resumes (list): Parsed resume dictionaries
+            jobs (list): Job dictionaries
+            top_k (int, optional): Jobs kept per resume
+
+        Returns:
+            MatchResult: Top jobs, scores, key matches and gaps per resume
+        """
+        from agents.batch_matcher import batch_matcher
+        return batch_matcher.match(resumes, jobs, top_k)
+
     def get_job_match_analysis(self, resume_data, job_data):
         """
         Analyze how well a resume matches a job description.
@@ -72,89 +269,92 @@ class JobSearchAgent:
         Returns:
             dict: Match analysis with score and recommendations
         """
-        if not self.api_key:
-            return self._generate_basic_match_analysis(resume_data, job_data)
-            
+        analysis = None
+        for analysis in self.stream_job_match_analysis(resume_data, job_data):
+            pass
+        return analysis
+
+    def stream_job_match_analysis(self, resume_data, job_data):
+        """
+        Analyze how well a resume matches a job description, yielding the analysis as it streams in.
+
+        The prompt holds the compacted resume and the job's requirement
+        sentences within PROMPT_TOKEN_BUDGET. The LLM is asked for JSON
+        following MATCH_ANALYSIS_SCHEMA and the streamed text is parsed
+        incrementally, so the score and the first matches can be shown while
+        the rest is still being generated. Estimated prompt and output tokens
+        are counted in llm_prompt_tokens_total and llm_output_tokens_total.
+
+        Args:
+            resume_data (dict): The parsed resume data
+            job_data (dict): The job listing data
+
+        Yields:
+            dict: The analysis so far; the last one is complete, with every schema field
+        """
+        llm = self.llm
+        if not llm.is_available():
+            yield self._generate_basic_match_analysis(resume_data, job_data)
+            return
+
+        from utils.llm import estimate_tokens
+        from utils.prompt_builder import build_match_prompt
+        from utils.streaming_json import PartialJSONParser
+
+        # Compact resume and the job's requirements within the token budget;
+        # the response format is enforced by the schema
+        prompt = build_match_prompt(resume_data, job_data)
+        metrics.inc("llm_prompt_tokens_total", prompt.total_tokens, model=llm.model)
+        if prompt.trimmed:
+            metrics.inc("llm_prompt_trimmed_total", model=llm.model)
+
+        parser = PartialJSONParser()
+        analysis = None
         try:
-            # Initialize Gemini client
-            model = GenerativeModel(model_name=self.model, api_key=self.api_key)
-            
-            # Extract relevant data
-            skills = resume_data.get("skills", [])
-            experience = resume_data.get("experience", [])
-            job_title = job_data.get("title", "")
-            job_description = job_data.get("description", "")
-            
-            # Create a prompt for matching analysis
-            prompt = f"""
-            Analyze how well this resume matches the job description and provide a detailed match analysis.
-            
-            === RESUME DATA ===
-            Skills: {", ".join(skills)}
-            
-            Experience:
-            {chr(10).join([f"- {exp}" for exp in experience])}
-            
-            === JOB DATA ===
-            Title: {job_title}
-            
-            Description:
-            {job_description}
-            
-            === ANALYSIS INSTRUCTIONS ===
-            
-            Provide a match analysis with the following components:
-            
-            1. MATCH SCORE: Calculate a percentage match (0-100%) based on how well the resume matches the job requirements.
-            
-            2. KEY MATCHES: List 3-5 specific skills or experiences from the resume that align well with the job requirements.
-            
-            3. GAPS: Identify 2-4 requirements in the job description that are not clearly demonstrated in the resume.
-            
-            4. RECOMMENDATIONS: Suggest 3-5 specific actions the candidate can take to better position themselves for this role.
-            
-            Format your response as a JSON with the following structure:
-            {{
-                "match_score": 85,
-                "key_matches": ["match1", "match2", ...],
-                "gaps": ["gap1", "gap2", ...],
-                "recommendations": ["rec1", "rec2", ...]
-            }}
-            
-            Ensure your analysis is specific, objective, and focused on the actual content in the resume and job description.
-            """
-            
-            # Get analysis from Gemini
-            response = model.generate_content(prompt)
-            
-            # Parse the response as JSON
-            try:
-                import json
-                analysis = json.loads(response.text.strip())
-                return analysis
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return the raw text
-                return {"match_analysis": response.text.strip()}
-            
+            with metrics.span("llm_call", model=llm.model):
+                start = time.perf_counter()
+                first_chunk = True
+                for chunk in llm.stream(prompt.text, schema=MATCH_ANALYSIS_SCHEMA):
+                    if first_chunk:
+                        metrics.observe("llm_first_chunk_seconds", time.perf_counter() - start, model=llm.model)
+                        first_chunk = False
+                    partial = parser.feed(chunk)
+                    if isinstance(partial, dict):
+                        analysis = partial
+                        yield analysis
         except Exception as e:
             print(f"Error in job match analysis: {e}")
-            return self._generate_basic_match_analysis(resume_data, job_data)
+            yield self._generate_basic_match_analysis(resume_data, job_data)
+            return
+
+        metrics.inc("llm_output_tokens_total", estimate_tokens(parser.text), model=llm.model)
+        if not parser.complete:
+            metrics.inc("llm_incomplete_responses_total", model=llm.model)
+        # A truncated response keeps what arrived; missing fields come from the local analysis
+        missing = [field for field in MATCH_ANALYSIS_SCHEMA["required"] if field not in (analysis or {})]
+        if missing:
+            basic = self._generate_basic_match_analysis(resume_data, job_data)
+            yield dict(analysis or {}, **{field: basic[field] for field in missing})
     
     def _generate_basic_match_analysis(self, resume_data, job_data):
-        """Generate basic job match analysis when Gemini is not available."""
+        """Generate basic job match analysis when no LLM backend is available."""
+        from agents.batch_matcher import batch_matcher
+
+        # Same scoring as batch matching: skill coverage plus text similarity
+        match = batch_matcher.match([resume_data], [job_data], top_k=1).top(0)[0]
+
+        # Resume skills outside the skill dictionary still count when the description names them
         skills = resume_data.get("skills", [])
         job_description = job_data.get("description", "").lower()
-        
-        # Count matching skills
-        matching_skills = [skill for skill in skills if skill.lower() in job_description]
-        
-        # Calculate a simple match score
-        match_score = min(len(matching_skills) * 10, 100) if skills else 50
+        matching_skills = match["key_matches"] + [
+            skill for skill in skills
+            if skill.lower() in job_description and skill not in match["key_matches"]
+        ]
         
         return {
-            "match_score": match_score,
+            "match_score": match["match_score"] if resume_data else 50,
             "key_matches": matching_skills[:5],
-            "gaps": ["Unable to analyze gaps without AI processing"],
+            "gaps": match["gaps"][:4] or ["Unable to analyze gaps without AI processing"],
             "recommendations": [
                 "Review the job description and identify key requirements",
                 "Customize your resume to highlight relevant skills and experience",
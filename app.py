@@ -1,19 +1,19 @@
 
 import streamlit as st
-import pandas as pd
-import os
-import json
-import tempfile
-import PyPDF2
-import docx
-from datetime import datetime, timedelta
 # Import the UI utilities for improved display
 from ui_utils import (
-    format_job_description
+    render_job_description,
+    job_card_html,
+    match_analysis_html
 )
 
 # Import configuration
-from config import COLORS, JOB_PLATFORMS
+from config import COLORS, JOB_PLATFORMS, RESULTS_PAGE_SIZE, DESCRIPTION_PREVIEW_CHARS
+from utils.instrumentation import metrics, configure_from_env
+from utils.job_model import summarize_jobs, load_job_details
+from utils.result_store import result_store
+from utils.identity import owner_tokens
+from utils.job_attributes import format_salary
 
 # Set page configuration with professional appearance
 st.set_page_config(
@@ -24,23 +24,94 @@ st.set_page_config(
 )
 
 
-# Initialize tools and agents
+# Initialize tools and agents on first use so the first page render doesn't
+# pay for requests, pandas or the Gemini SDK
+def load_serp_api_searcher():
+    """Get the process-wide SerpApiSearcher, the same instance the agent uses."""
+    from utils.providers import get_provider
+    return get_provider("scrapingdog")
+
+
 @st.cache_resource
-def load_resources():
-    """Load and cache all required resources."""
-    from utils.serp_api_searcher import SerpApiSearcher
+def load_job_search_agent():
+    """Create the shared JobSearchAgent the first time the fallback needs it."""
     from agents.job_search_agent import JobSearchAgent
-    
-    job_search_agent = JobSearchAgent()
-    serp_api_searcher = SerpApiSearcher()
-    
-    return {
-        "job_search_agent": job_search_agent,
-        "serp_api_searcher": serp_api_searcher,
-    }
+    return JobSearchAgent()
+
+
+@st.cache_resource
+def load_saved_search_service():
+    """Open the saved search store and notification inbox; the scheduler starts once there is a search to refresh."""
+    from utils.saved_searches import SavedSearchStore, LocalNotificationSink
+    store = SavedSearchStore()
+    sink = LocalNotificationSink()
+    if store.all():
+        start_saved_search_scheduler(store, sink)
+    return store, sink
+
+
+@st.cache_resource
+def start_saved_search_scheduler(_store, _sink):
+    """Start the process-wide refresh scheduler once, building the agent it searches with."""
+    from utils.saved_searches import SearchScheduler
+    return SearchScheduler(_store, load_job_search_agent(), _sink).start()
+
+
+configure_from_env()
+
+
+def current_results():
+    """The session's result set from the shared result store, None without results."""
+    result_id = st.session_state.get("result_id")
+    return result_store.get(result_id) if result_id else None
+
+
+def show_results(jobs, details=None):
+    """Store job summaries and their details in the shared result store and point the session at them."""
+    st.session_state.result_id = result_store.put(jobs, details) if jobs else None
+
+
+@st.fragment(run_every=2)
+def apply_background_refresh():
+    """Swap in refreshed results once the providers finish revalidating a stale cached answer."""
+    spec = st.session_state.get("pending_refresh")
+    if not spec:
+        return
+    job_search_agent = load_job_search_agent()
+    if job_search_agent.refreshes_pending(**spec):
+        st.caption("Showing recently cached results while fresh listings load…")
+        return
+
+    st.session_state.pending_refresh = None
+    resume_data = st.session_state.get("resume_data", {})
+    current = current_results()
+    shown_jobs = current.jobs if current else []
+    # The refreshed answers are now in the provider caches, so this returns without waiting
+    if st.session_state.get("pending_refresh_delta"):
+        # Delta results only list unseen postings, so add whatever the refresh turned up
+        jobs = job_search_agent.search_new_jobs(resume_data, st.session_state.session_owner, **spec)
+        refreshed, details = summarize_jobs(jobs)
+        for job in refreshed:
+            job["is_new"] = True
+        new_count = len(refreshed)
+        refreshed += shown_jobs
+        if current:
+            details = dict(current.details(), **details)
+    else:
+        jobs = job_search_agent.search_jobs(resume_data, **spec)
+        if not jobs:
+            return
+        shown = {job["job_key"] for job in shown_jobs}
+        refreshed, details = summarize_jobs(jobs)
+        for job in refreshed:
+            job["is_new"] = job["job_key"] not in shown
+        new_count = sum(job["is_new"] for job in refreshed)
+    if not new_count:
+        return
+    show_results(refreshed, details)
+    st.toast(f"{new_count} new posting{'s' if new_count != 1 else ''} found")
+    st.rerun(scope="app")
 
-# Load resources
-resources = load_resources()
 
 # Application header with gradient using color palette
 st.markdown(f"""
@@ -60,8 +131,16 @@ border-radius: 12px; margin-bottom: 2rem; box-shadow: 0 4px 12px rgba(0,0,0,0.1)
 </div>
 """, unsafe_allow_html=True)
 
-if "job_results" not in st.session_state:
-    st.session_state.job_results = []
+# Results live in the shared result store; the session keeps only their ID
+if "result_id" not in st.session_state:
+    st.session_state.result_id = None
+
+# Identifies the user for "new since last search" tracking and saved searches; a
+# ?user= token signed by this server keeps the same identity across browser sessions
+if "session_owner" not in st.session_state:
+    st.session_state.session_owner = owner_tokens.owner(st.query_params.get("user")) or owner_tokens.new_owner()
+
+show_debug_panel = st.sidebar.checkbox("Show performance breakdown", value=False, key="show_debug_panel")
 
 # Create main navigation tabs
 tabs = st.tabs([
@@ -146,21 +225,17 @@ with tabs[0]:
                 
                 # Use SerpAPI option
                 use_serp_api = st.checkbox("Use SerpAPI for real job listings", value=True, key="use_serp_api")
+
+                # Delta mode: hide postings already shown for this exact search
+                delta_mode = st.checkbox("Only show postings new since my last search", value=False, key="delta_mode")
             
             submit_search = st.form_submit_button("Search Jobs")
         
         # Execute job search
         if submit_search:
-            # Build the search query including job types and experience
+            # Job types and experience are structured filters, not extra search terms
             search_query = keywords
-            
-            # Add job types to query if selected
-            if selected_job_types:
-                search_query += f" {' '.join(selected_job_types)}"
-            
-            # Add experience level to query if needed
-            if experience_level != "1-3":  # If not default
-                search_query += f" {experience_level} years"
+            experience = experience_level if experience_level != "1-3" else None  # default means no preference
             
             # Convert recency to days for API
             recency_days = {
@@ -169,226 +244,349 @@ with tabs[0]:
             }
             days_ago = recency_days.get(recency, 7)
             
+            st.session_state.last_search_spec = {
+                "keywords": search_query,
+                "location": location,
+                "platforms": selected_platforms,
+                "count": job_count,
+                "days_ago": days_ago,
+                "job_types": selected_job_types,
+                "experience": experience
+            }
+
             search_message = f"Searching for {search_query} jobs in {location}"
             search_message += f" posted within the last {recency}"
             if selected_job_types:
                 search_message += f" ({', '.join(selected_job_types)})"
+
+            from utils.job_filters import JobFilter
+            job_filter = JobFilter(job_types=selected_job_types, max_age_days=days_ago, experience=experience)
             
-            with st.spinner(search_message):
+            with st.spinner(search_message), metrics.trace("search", keywords=search_query, location=location) as search_trace:
                 jobs = []
+                st.session_state.pending_refresh = None
                 
+                serp_api_searcher = load_serp_api_searcher()
+                if use_serp_api and not serp_api_searcher.api_key:
+                    st.info("SCRAPINGDOG_API_KEY is not set, so real listings are unavailable. Showing fallback results.")
+                    use_serp_api = False
+                elif use_serp_api and not serp_api_searcher.is_available():
+                    st.info("The job search API is currently unavailable. Showing fallback results.")
+                    use_serp_api = False
+
                 if use_serp_api:
-                    # Use SerpAPI to get real job listings
-                    serp_api_searcher = resources["serp_api_searcher"]
-                    for platform in selected_platforms:
-                        try:
-                            platform_jobs = serp_api_searcher.search_jobs(
+                    # Query every search provider in parallel across the selected platforms;
+                    # the agent falls back to standard search if none return results
+                    job_search_agent = load_job_search_agent()
+                    search_spec = {
+                        "keywords": search_query,
+                        "location": location,
+                        "platforms": selected_platforms,
+                        "count": job_count,
+                        "days_ago": days_ago,
+                        "job_filter": job_filter
+                    }
+                    try:
+                        if delta_mode:
+                            jobs = job_search_agent.search_new_jobs(
+                                st.session_state.get("resume_data", {}),
+                                st.session_state.session_owner,
+                                **search_spec
+                            )
+                        else:
+                            jobs = job_search_agent.search_jobs(st.session_state.get("resume_data", {}), **search_spec)
+                    except Exception as e:
+                        st.error(f"Error in job search: {str(e)}")
+
+                    # Repeat queries may be answered from a stale cache; poll until the refresh lands
+                    if job_search_agent.refreshes_pending(**search_spec):
+                        st.session_state.pending_refresh = search_spec
+                        st.session_state.pending_refresh_delta = delta_mode
+
+                    if jobs and not any(job.get("is_real_job") for job in jobs):
+                        st.warning("No jobs found via SerpAPI. Showing standard search results.")
+                else:
+                    # Use standard job search
+                    job_search_agent = load_job_search_agent()
+                    try:
+                        if delta_mode:
+                            jobs = job_search_agent.search_new_jobs(
+                                st.session_state.get("resume_data", {}),
+                                st.session_state.session_owner,
                                 search_query,
                                 location,
-                                platform=platform,
+                                platforms=selected_platforms,
                                 count=job_count,
-                                days_ago=days_ago
+                                job_filter=job_filter
                             )
-                            jobs.extend(platform_jobs)
-                        except Exception as e:
-                            st.error(f"Error searching jobs on {platform}: {str(e)}")
-                    
-                    if not jobs:
-                        st.warning("No jobs found via SerpAPI. Falling back to standard search.")
-                        job_search_agent = resources["job_search_agent"]
-                        try:
+                        else:
                             jobs = job_search_agent.search_jobs(
-                                # st.session_state.resume_data,
+                                st.session_state.get("resume_data", {}),
                                 search_query,
-                                location=location,
-                                platform=selected_platforms,
-                                count=job_count
+                                location,
+                                platforms=selected_platforms,
+                                count=job_count,
+                                job_filter=job_filter
                             )
-                        except Exception as e:
-                            st.error(f"Error in job search: {str(e)}")
-                else:
-                    # Use standard job search
-                    job_search_agent = resources["job_search_agent"]
-                    try:
-                        jobs = job_search_agent.search_jobs(
-                            # st.session_state.resume_data,
-                            search_query,
-                            location,
-                            platforms=selected_platforms,
-                            count=job_count
-                        )
                     except Exception as e:
                         st.error(f"Error in job search: {str(e)}")
+
+                if delta_mode:
+                    if jobs:
+                        st.info(f"{len(jobs)} new or updated posting{'s' if len(jobs) != 1 else ''} since your last search.")
+                    else:
+                        st.info("No new postings since your last search.")
                 
-                st.session_state.job_results = jobs
+                # Sessions keep lightweight summaries; descriptions load on selection
+                show_results(*summarize_jobs(jobs))
+            st.session_state.last_search_trace = search_trace.to_dict()
     
+    if st.session_state.get("pending_refresh"):
+        apply_background_refresh()
+
     # Display job results (common to both search methods)
-    if st.session_state.job_results:
-        total_jobs = len(st.session_state.job_results)
-        st.subheader(f"Job Results ({total_jobs})")
-        
-        # Filter options
-        col1, col2 = st.columns(2)
-        with col1:
-            # Sort options
-            sort_option = st.selectbox(
-                "Sort by:",
-                ["Most Recent", "Relevance", "Company Name", "Location"],
-                key="sort_option"
-            )
+    results = current_results()
+    if st.session_state.result_id and results is None:
+        st.info("These results have expired. Search again to see current listings.")
+        st.session_state.result_id = None
+    if results:
+        with metrics.trace("render_results") as render_trace:
+            total_jobs = len(results)
+            st.subheader(f"Job Results ({total_jobs})")
+
+            # Saved searches are refreshed in the background and new matches show up in the sidebar
+            search_spec = st.session_state.get("last_search_spec")
+            if search_spec and st.button("💾 Save this search", key="save_search"):
+                from utils.saved_searches import SavedSearch
+                saved_search_store, notification_sink = load_saved_search_service()
+                saved_search_store.add(SavedSearch(st.session_state.session_owner, **search_spec))
+                start_saved_search_scheduler(saved_search_store, notification_sink)
+                st.success("Search saved. New matches will appear under Saved searches in the sidebar.")
         
-        with col2:
-            # Filter by platform
-            filter_platform = st.selectbox(
-                "Filter by platform:",
-                ["All Platforms"] + JOB_PLATFORMS,
-                key="filter_platform"
-            )
+            # Filter options
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                # Sort options
+                sort_option = st.selectbox(
+                    "Sort by:",
+                    ["Most Recent", "Relevance", "Company Name", "Location", "Highest Salary"],
+                    key="sort_option"
+                )
         
-        # Apply platform filter
-        filtered_jobs = st.session_state.job_results
-        if filter_platform != "All Platforms":
-            filtered_jobs = [job for job in filtered_jobs if job.get("platform", "").lower() == filter_platform.lower()]
+            with col2:
+                # Filter by platform
+                filter_platform = st.selectbox(
+                    "Filter by platform:",
+                    ["All Platforms"] + JOB_PLATFORMS,
+                    key="filter_platform"
+                )
+
+            with col3:
+                # Radius around the searched location, resolved through the offline gazetteer
+                from utils.geo import gazetteer
+                search_place = gazetteer.lookup(search_spec["location"]) if search_spec else None
+                radius_options = {"Any distance": None, "25 km": 25, "50 km": 50, "100 km": 100, "250 km": 250}
+                filter_radius = st.selectbox(
+                    f"Distance from {search_place.label}:" if search_place else "Distance:",
+                    list(radius_options),
+                    key="filter_radius",
+                    disabled=search_place is None
+                )
         
-        # Sort jobs based on selection
-        sorted_jobs = filtered_jobs.copy()
-        # print(type(sorted_jobs))
-        # for job in sorted_jobs:
-        #     sorted_jobs = job['jobs_results']
-        # print(sorted_jobs)
-        if sort_option == "Most Recent":
-            # Try to parse dates for sorting
-            for job in sorted_jobs:
-                if job.get("date_posted") and isinstance(job["date_posted"], str):
-                    try:
-                        if "hour" in job["date_posted"].lower():
-                            hours = int(''.join(filter(str.isdigit, job["date_posted"].split()[0])))
-                            job["sort_date"] = datetime.now() - timedelta(hours=hours)
-                        elif "day" in job["date_posted"].lower():
-                            days = int(''.join(filter(str.isdigit, job["date_posted"].split()[0])))
-                            job["sort_date"] = datetime.now() - timedelta(days=days)
-                        elif "week" in job["date_posted"].lower():
-                            weeks = int(''.join(filter(str.isdigit, job["date_posted"].split()[0])))
-                            job["sort_date"] = datetime.now() - timedelta(weeks=weeks)
-                        elif "month" in job["date_posted"].lower():
-                            months = int(''.join(filter(str.isdigit, job["date_posted"].split()[0])))
-                            job["sort_date"] = datetime.now() - timedelta(days=30 * months)
-                        else:
-                            job["sort_date"] = datetime.now() - timedelta(days=365)
-                    except (ValueError, IndexError):
-                        job["sort_date"] = datetime.now() - timedelta(days=365)
-                else:
-                    job["sort_date"] = datetime.now() - timedelta(days=365)
-            
-            sorted_jobs.sort(key=lambda x: x.get("sort_date"), reverse=False)
-        elif sort_option == "Company Name":
-            sorted_jobs.sort(key=lambda x: x.get("company", "").lower())
-        elif sort_option == "Location":
-            sorted_jobs.sort(key=lambda x: x.get("location", "").lower())
+            # Results are filtered as a columnar table, built once per result set and shared by its sessions
+            from utils.job_filters import JobFilter
+            job_table = results.table
+
+            # Apply platform and distance filters
+            with metrics.span("filter_results"):
+                platforms = [filter_platform] if filter_platform != "All Platforms" else None
+                rows = job_table.rows(JobFilter(
+                    platforms=platforms, near=search_place, radius_km=radius_options[filter_radius]
+                ))
+
+            # Sort jobs based on selection
+            with metrics.span("sort_results", option=sort_option):
+                if sort_option == "Most Recent":
+                    rows = job_table.order_by_age(rows)
+                elif sort_option == "Location":
+                    # Grouped by metro area, nearest to the searched location first
+                    rows = job_table.order_by_location(rows, near=search_place)
+                elif sort_option == "Company Name":
+                    # Interned company IDs carry precomputed ranks, so "Google LLC" sorts with "Google"
+                    rows = job_table.order_by_company(rows)
+                elif sort_option == "Relevance" and st.session_state.get("resume_data"):
+                    # Resume-to-job scores from the batch matcher, computed once per result set
+                    relevance = st.session_state.get("relevance_scores")
+                    if relevance is None or relevance[0] != results.id:
+                        from agents.batch_matcher import batch_matcher
+                        with metrics.span("match_results", jobs=len(job_table)):
+                            relevance = (results.id, batch_matcher.score(st.session_state.resume_data, job_table.jobs))
+                        st.session_state.relevance_scores = relevance
+                    rows = job_table.order_by_score(relevance[1], rows)
+                elif sort_option == "Highest Salary":
+                    # Salaries were extracted at ingestion and compared as yearly amounts
+                    rows = job_table.order_by_salary(rows)
+            # Only the visible page is turned into rows and sent to the browser
+            total_rows = len(rows)
+            page_count = max(1, -(-total_rows // RESULTS_PAGE_SIZE))
+            view = (results.id, filter_platform, filter_radius, sort_option)
+            if st.session_state.get("results_view") != view:
+                st.session_state.results_view = view
+                st.session_state.results_page = 1
+            st.session_state.results_page = min(st.session_state.get("results_page", 1), page_count)
+            first_row = (st.session_state.results_page - 1) * RESULTS_PAGE_SIZE
+            page_jobs = job_table.take(rows[first_row:first_row + RESULTS_PAGE_SIZE])
          
-        if not sorted_jobs:
-            st.warning(f"No jobs found for the selected platform: {filter_platform}")
-        else:
-            # Create a dataframe for easier display
-            job_df = pd.DataFrame([
-                {
-                    "Title": job["title"],
-                    "Company": job["company"],
-                    "Location": job.get("location", "Not specified"),
-                    "Platform": job.get("platform", "Unknown"),
-                    "Posted": job.get("date_posted", "Recent"),
-                    "Job Type": job.get("job_type", ""),
-                    "Real Job": "✓" if job.get("is_real_job", False) else "?"
-                }
-                for job in sorted_jobs
-            ])
+            if not page_jobs:
+                st.warning("No jobs match the selected platform and distance.")
+            else:
+                # Create a dataframe for easier display
+                with metrics.span("render_dataframe", rows=len(page_jobs)):
+                    import pandas as pd
+                    job_df = pd.DataFrame([
+                        {
+                            "Title": job["title"],
+                            "Company": job["company"],
+                            "Location": job.get("location", "Not specified"),
+                            "Platform": job.get("platform", "Unknown"),
+                            "Posted": job.get("date_posted", "Recent"),
+                            "Job Type": job.get("job_type", ""),
+                            "Salary": format_salary(job),
+                            "Real Job": "✓" if job.get("is_real_job", False) else "?",
+                            "New": "✏️" if job.get("delta") == "changed" else ("🆕" if job.get("is_new") or job.get("delta") == "new" else "")
+                        }
+                        for job in page_jobs
+                    ])
             
-            # Display jobs in a dataframe with improved styling
-            st.dataframe(
-                job_df,
-                use_container_width=True,
-                column_config={
-                    "Title": st.column_config.TextColumn("Job Title"),
-                    "Real Job": st.column_config.TextColumn("Verified")
-                },
-                hide_index=True
-            )
-            
-            # Job selection for detailed view
-            if sorted_jobs:
-                st.markdown("### Job Details")
-                selected_index = st.selectbox(
-                    "Select a job to view details:",
-                    range(len(sorted_jobs)),
-                    format_func=lambda i: f"{sorted_jobs[i]['title']} at {sorted_jobs[i]['company']}",
-                    key="job_selection"
-                )
-                
-                if selected_index is not None:
-                    st.session_state.selected_job = sorted_jobs[selected_index]
-                    selected_job = st.session_state.selected_job
-                    
-                    # Job title and company with professional styling
-                    st.markdown(f"""
-                    <div style='background: linear-gradient(90deg, {COLORS["primary"]}, {COLORS["secondary"]}); 
-                    padding: 1rem; border-radius: 10px; margin-bottom: 1rem; box-shadow: 0 3px 10px rgba(0,0,0,0.2);'>
-                        <h3 style='color: white; margin: 0; font-weight: 600; text-shadow: 1px 1px 3px rgba(0,0,0,0.3);'>{selected_job['title']}</h3>
-                        <p style='color: white; font-size: 1.1rem; margin: 0.5rem 0 0 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);'>{selected_job['company']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Create columns for job details
-                    col1, col2, col3 = st.columns(3)
-                    
+                    # Display jobs in a dataframe with improved styling
+                    st.dataframe(
+                        job_df,
+                        use_container_width=True,
+                        column_config={
+                            "Title": st.column_config.TextColumn("Job Title"),
+                            "Real Job": st.column_config.TextColumn("Verified")
+                        },
+                        hide_index=True
+                    )
+
+                if page_count > 1:
+                    col1, col2 = st.columns([1, 3])
                     with col1:
-                        st.markdown(f"""<div style="background-color: {COLORS["primary"]}; color: white; 
-                        padding: 10px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                        <p style="margin: 0; font-weight: bold; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">Location</p>
-                        <p style="margin: 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.1);">{selected_job.get('location', 'Not specified')}</p>
-                        </div>""", unsafe_allow_html=True)
-                    
+                        st.number_input("Page", min_value=1, max_value=page_count, step=1, key="results_page")
                     with col2:
-                        st.markdown(f"""<div style="background-color: {COLORS["primary"]}; color: white; 
-                        padding: 10px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                        <p style="margin: 0; font-weight: bold; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">Platform</p>
-                        <p style="margin: 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.1);">{selected_job.get('platform', 'Unknown')}</p>
-                        </div>""", unsafe_allow_html=True)
-                    
-                    with col3:
-                        st.markdown(f"""<div style="background-color: {COLORS["primary"]}; color: white; 
-                        padding: 10px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                        <p style="margin: 0; font-weight: bold; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">Posted</p>
-                        <p style="margin: 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.1);">{selected_job.get('date_posted', 'Recent')}</p>
-                        </div>""", unsafe_allow_html=True)
+                        st.caption(
+                            f"Showing {first_row + 1}–{first_row + len(page_jobs)} of {total_rows} jobs "
+                            f"(page {st.session_state.results_page} of {page_count})"
+                        )
+            
+                # Job selection for detailed view
+                if page_jobs:
+                    st.markdown("### Job Details")
+                    selected_index = st.selectbox(
+                        "Select a job to view details:",
+                        range(len(page_jobs)),
+                        format_func=lambda i: f"{'🆕 ' if page_jobs[i].get('is_new') else ''}{page_jobs[i]['title']} at {page_jobs[i]['company']}",
+                        key="job_selection"
+                    )
+                
+                    if selected_index is not None:
+                        st.session_state.selected_job = page_jobs[selected_index]
+                        selected_job = st.session_state.selected_job
                     
-                    # Job type if available
-                    if selected_job.get('job_type'):
-                        st.markdown(f"""<div style="background-color: {COLORS["secondary"]}; color: white; 
-                        padding: 8px 15px; border-radius: 20px; display: inline-block; margin: 10px 0; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                        <span style="text-shadow: 1px 1px 1px rgba(0,0,0,0.2);">{selected_job.get('job_type')}</span></div>""", unsafe_allow_html=True)
+                        # Header card, memoized per job across reruns and sessions
+                        with metrics.span("render_job_card"):
+                            st.markdown(job_card_html(selected_job), unsafe_allow_html=True)
+                        if selected_job.get('apply_url'):
+                            if selected_job.get('is_real_job', False):
+                                st.success("This is a real job listing from a job search platform.")
+                            else:
+                                st.warning("This is a generated job listing for demonstration purposes.")
                     
-                    # Apply button
-                    if selected_job.get('apply_url'):
-                        apply_url = selected_job['apply_url']
-                        is_real_job = selected_job.get('is_real_job', False)
-                        
-                        st.markdown(f"""
-                        <div style="background-color: {COLORS["accent"]}; padding: 12px; 
-                        border-radius: 6px; margin: 15px 0; text-align: center; box-shadow: 0 3px 8px rgba(0,0,0,0.15);">
-                        <a href="{apply_url}" target="_blank" style="color: white; 
-                        text-decoration: none; font-weight: bold; display: block; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">
-                        {'➡️ Apply Now' if is_real_job else '➡️ View Job Details'}</a>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        if is_real_job:
-                            st.success("This is a real job listing from a job search platform.")
+                        # Job description
+                        with metrics.span("load_job_details"):
+                            job_details = load_job_details(
+                                selected_job, provider=load_serp_api_searcher(), results=results
+                            )
+                        if job_details.get('description'):
+                            st.subheader("Job Description")
+                            # Long descriptions show a preview until expanded; both renderings are memoized per job
+                            expand_key = f"expand_description_{selected_job.get('job_key')}"
+                            description_html, truncated = render_job_description(
+                                job_details['description'],
+                                key=selected_job.get('job_key'),
+                                max_chars=None if st.session_state.get(expand_key) else DESCRIPTION_PREVIEW_CHARS
+                            )
+                            st.markdown(description_html, unsafe_allow_html=True)
+                            if truncated or st.session_state.get(expand_key):
+                                st.toggle("Show full description", key=expand_key)
                         else:
-                            st.warning("This is a generated job listing for demonstration purposes.")
-                    
-                    # Job description
-                    if selected_job.get('description'):
-                        st.subheader("Job Description")
-                        st.markdown(format_job_description(selected_job['description']), unsafe_allow_html=True)
-                    else:
-                        st.warning("No job description available.")
\ No newline at end of file
+                            st.warning("No job description available.")
+
+                        # Match analysis streams in section by section; the result is kept per job
+                        if st.session_state.get("resume_data"):
+                            analyses = st.session_state.setdefault("match_analyses", {})
+                            analysis_key = selected_job.get('job_key')
+                            placeholder = st.empty()
+                            if analysis_key in analyses:
+                                placeholder.markdown(match_analysis_html(analyses[analysis_key]), unsafe_allow_html=True)
+                            elif st.button("🔍 Analyze match", key=f"analyze_{analysis_key}"):
+                                analysis = None
+                                for analysis in load_job_search_agent().stream_job_match_analysis(
+                                    st.session_state.resume_data, dict(selected_job, **job_details)
+                                ):
+                                    placeholder.markdown(match_analysis_html(analysis), unsafe_allow_html=True)
+                                analyses[analysis_key] = analysis
+        st.session_state.last_render_trace = render_trace.to_dict()
+
+# Saved searches and the alerts the background scheduler raised for them
+saved_search_store, notification_sink = load_saved_search_service()
+owner_searches = saved_search_store.for_owner(st.session_state.session_owner)
+notifications = notification_sink.pending(st.session_state.session_owner)
+if owner_searches or notifications:
+    new_matches = sum(len(notification["jobs"]) for notification in notifications)
+    label = f"Saved searches 🔔 {new_matches}" if new_matches else "Saved searches"
+    with st.sidebar.expander(label, expanded=bool(new_matches)):
+        for notification in notifications:
+            st.markdown(f"**{notification['search_name']}**")
+            for job in notification["jobs"]:
+                marker = "✏️" if job.get("delta") == "changed" else "🆕"
+                title = f"[{job['title']}]({job['apply_url']})" if job.get("apply_url") else job["title"]
+                st.markdown(f"{marker} {title} at {job['company']}")
+        if notifications and st.button("Mark all as read", key="clear_notifications"):
+            notification_sink.pop(st.session_state.session_owner)
+            st.rerun()
+
+        for saved_search in owner_searches:
+            col1, col2 = st.columns([4, 1])
+            col1.caption(saved_search.name)
+            if col2.button("✕", key=f"remove_saved_{saved_search.id}"):
+                saved_search_store.remove(saved_search.id)
+                st.rerun()
+        st.caption(
+            f"Open the app with ?user={owner_tokens.token(st.session_state.session_owner)} "
+            "to keep these across sessions. Anyone with this link sees your saved searches."
+        )
+
+# Optional per-stage timing breakdown for the last search and this rerun
+if show_debug_panel:
+    with st.sidebar.expander("Performance breakdown", expanded=True):
+        for label, trace_key in [("Last search", "last_search_trace"), ("Results rendering", "last_render_trace")]:
+            trace_data = st.session_state.get(trace_key)
+            if not trace_data:
+                st.caption(f"{label}: no data yet")
+                continue
+            st.markdown(f"**{label}** — {trace_data['duration_ms']:.0f} ms total")
+            stages = {}
+            for span in trace_data["spans"]:
+                if span["name"] == trace_data["trace"]:
+                    continue
+                stage = stages.setdefault(span["name"], {"Stage": span["name"], "Calls": 0, "Total ms": 0.0})
+                stage["Calls"] += 1
+                stage["Total ms"] = round(stage["Total ms"] + span["duration_ms"], 1)
+            if stages:
+                import pandas as pd
+                st.dataframe(
+                    pd.DataFrame(sorted(stages.values(), key=lambda s: s["Total ms"], reverse=True)),
+                    hide_index=True,
+                    use_container_width=True
+                )
@@ -0,0 +1,205 @@
+import copy
+import glob
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_payloads(pattern="google_jobs_*.json"):
+    """
+    Load recorded google_jobs payloads from the fixtures directory.
+
+    Args:
+        pattern (str): Glob pattern for fixture files
+
+    Returns:
+        list: List of decoded payload dictionaries
+    """
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, pattern))):
+        with open(path, encoding="utf-8") as f:
+            payloads.append(json.load(f))
+    return payloads
+
+
+def scale_payload(payload, job_count):
+    """
+    Build a larger payload by repeating the recorded jobs.
+
+    Each copy gets a unique job_id so downstream dedup still sees distinct jobs.
+
+    Args:
+        payload (dict): Recorded google_jobs payload
+        job_count (int): Number of jobs the scaled payload should contain
+
+    Returns:
+        dict: Payload with exactly job_count entries in jobs_results
+    """
+    source_jobs = payload.get("jobs_results", [])
+    if not source_jobs:
+        return copy.deepcopy(payload)
+
+    jobs = []
+    for i in range(job_count):
+        job = copy.deepcopy(source_jobs[i % len(source_jobs)])
+        job["job_id"] = f"{job.get('job_id', 'job')}-{i}"
+        jobs.append(job)
+
+    scaled = copy.deepcopy(payload)
+    scaled["jobs_results"] = jobs
+    return scaled
+
+
+class FakeScrapingDogServer:
+    """Local stand-in for the ScrapingDog google_jobs endpoint.
+
+    Replays recorded payloads round-robin and injects configurable latency and
+    failures, so the search pipeline can be measured without the live API.
+    """
+
+    def __init__(self, payloads=None, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 error_mode="http_500", host="127.0.0.1", port=0, seed=None):
+        """
+        Args:
+            payloads (list): Payload dictionaries to replay, defaults to the fixtures
+            latency_ms (float): Base latency added to every response
+            jitter_ms (float): Maximum random latency added on top of the base latency
+            error_rate (float): Fraction of requests (0-1) that fail
+            error_mode (str): "http_500", "api_error" (200 with an error body) or "empty"
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free port
+            seed (int, optional): Seed for the latency and error random generator
+        """
+        self.payloads = payloads if payloads is not None else load_payloads()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_mode = error_mode
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies = [json.dumps(p).encode("utf-8") for p in self.payloads]
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the fake google_jobs endpoint."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/google_jobs"
+
+    def start(self):
+        """Start serving requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _next_response(self):
+        """Pick the delay, status and body for the next request."""
+        with self._lock:
+            index = self.request_count
+            self.request_count += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+
+        if failed:
+            if self.error_mode == "api_error":
+                return delay, 200, b'{"error": "Simulated ScrapingDog failure"}'
+            if self.error_mode == "empty":
+                return delay, 200, b'{"jobs_results": []}'
+            return delay, 500, b'{"status": 500, "message": "Simulated server error"}'
+
+        if not self._bodies:
+            return delay, 200, b'{"jobs_results": []}'
+        return delay, 200, self._bodies[index % len(self._bodies)]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without TCP_NODELAY a
+            # kept-alive client connection waits on delayed ACKs for every response
+            disable_nagle_algorithm = True
+
+            def _respond(self, include_body):
+                path = urlparse(self.path).path
+                if not path.endswith("/google_jobs"):
+                    delay, status, body = 0, 200, b"{}"
+                else:
+                    delay, status, body = server._next_response()
+                if delay:
+                    time.sleep(delay / 1000.0)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if include_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond(include_body=True)
+
+            def do_HEAD(self):
+                self._respond(include_body=False)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local ScrapingDog google_jobs stand-in.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["http_500", "api_error", "empty"], default="http_500")
+    parser.add_argument("--jobs", type=int, default=0, help="Scale each payload to this many jobs")
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    if args.jobs:
+        payloads = [scale_payload(p, args.jobs) for p in payloads]
+
+    server = FakeScrapingDogServer(
+        payloads=payloads,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_mode=args.error_mode,
+        port=args.port
+    )
+    print(f"Serving fake ScrapingDog API at {server.url} (set SCRAPINGDOG_API_URL to use it)")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,136 @@
+"""
+Report import-time cost of the app's modules and the cold start of app.py.
+
+Usage (from the repository root):
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --module agents.job_search_agent --top 15
+    python -m benchmarks.import_profile --app      # also time a first headless render of app.py
+
+Every measurement runs in a fresh interpreter so nothing is already cached in
+sys.modules. Import times come from ``python -X importtime``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "config",
+    "ui_utils",
+    "utils.instrumentation",
+    "utils.job_model",
+    "utils.providers",
+    "utils.geo",
+    "utils.serp_api_searcher",
+    "utils.job_scraper",
+    "agents.job_search_agent",
+]
+
+APP_RENDER_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout=120)
+at.run()
+done = time.perf_counter()
+print(f"{{(ready - start) * 1000:.1f}} {{(done - ready) * 1000:.1f}} {{len(at.exception)}}")
+"""
+
+
+def profile_import(module):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str): Dotted module name
+
+    Returns:
+        tuple: (total_ms, rows) where rows lists (cumulative_ms, self_ms, depth, module_name)
+            for the imports triggered by this module, excluding interpreter startup
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]  # drop the separator space, keep the nesting indentation
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us) / 1000.0, int(self_us) / 1000.0, depth, name.strip()))
+
+    # Rows are printed as imports finish: the target comes last at depth 0,
+    # preceded by its subtree. Anything before that is interpreter startup.
+    end = max(i for i, row in enumerate(rows) if row[2] == 0 and row[3] == module)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    subtree = rows[start:end + 1]
+
+    total_ms = sum(row[0] for row in subtree if row[2] == 0)
+    return total_ms, subtree
+
+
+def profile_app_render():
+    """
+    Time a first headless run of app.py in a fresh interpreter.
+
+    Returns:
+        tuple: (streamlit_import_ms, first_render_ms, exception_count)
+    """
+    snippet = APP_RENDER_SNIPPET.format(path=os.path.join(REPO_ROOT, "app.py"))
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"app render failed:\n{result.stderr.strip()[-2000:]}")
+    import_ms, render_ms, exceptions = result.stdout.strip().splitlines()[-1].split()
+    return float(import_ms), float(render_ms), int(exceptions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time and app cold start.")
+    parser.add_argument("--module", action="append", help="Module to profile (repeatable)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest transitive imports to list per module")
+    parser.add_argument("--app", action="store_true", help="Also time the first headless render of app.py")
+    args = parser.parse_args(argv)
+
+    for module in args.module or DEFAULT_MODULES:
+        try:
+            total_ms, rows = profile_import(module)
+        except RuntimeError as e:
+            print(f"{module}: {e}\n")
+            continue
+        print(f"{module}: {total_ms:.1f} ms")
+        # Third-party and stdlib packages pulled in, ranked by cumulative time
+        packages = [row for row in rows if "." not in row[3] and row[2] > 0]
+        for cumulative_ms, self_ms, depth, name in sorted(packages, reverse=True)[:args.top]:
+            print(f"    {cumulative_ms:9.1f} ms  {name}")
+        print()
+
+    if args.app:
+        start = time.perf_counter()
+        import_ms, render_ms, exceptions = profile_app_render()
+        print(f"app.py cold start: streamlit test harness {import_ms:.0f} ms, "
+              f"first render {render_ms:.0f} ms, {exceptions} exception(s) "
+              f"(wall {(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+Load-test app.py with simulated concurrent Streamlit sessions.
+
+Usage (from the repository root):
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --workers 2 --sessions 8 --rounds 3
+    python -m benchmarks.load_test --llm-latency-ms 800 --output load.json
+
+Each worker process stands for one app.py server: its simulated sessions
+run concurrently on threads, the way Streamlit runs every session of a
+server process. A session opens the page, submits a search, sorts by every
+option, filters by platform, selects a job and streams a match analysis,
+repeating the flow for --rounds searches. ScrapingDog is replaced by the
+local fake server and Gemini by the local LLM stand-in, so nothing leaves
+the machine.
+
+The report lists flows and steps per second, latency percentiles per step,
+and CPU time, CPU utilization and peak RSS per worker.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.fake_scrapingdog import FakeScrapingDogServer
+from benchmarks.run_benchmarks import percentile
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+SORT_OPTIONS = ["Most Recent", "Relevance", "Company Name", "Location", "Highest Salary"]
+
+# Resume every simulated user searches with, so relevance sorting and match analysis run
+RESUME = {
+    "skills": ["Social Media", "Email Marketing", "SEO", "Copywriting", "Google Analytics"],
+    "experience": ["Content creation for fitness brands", "Ran paid social campaigns for e-commerce clients"],
+    "education": ["BA Marketing"],
+}
+
+
+def _rss_kb():
+    """Current resident set size of this process in KB (Linux), None elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return None
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Session:
+    """One simulated user driving app.py through Streamlit's AppTest."""
+
+    def __init__(self, index, args):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.args = args
+        self.app = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+        self.steps = []
+        self.errors = []
+
+    def _step(self, name, action):
+        start = time.perf_counter()
+        try:
+            action()
+            failed = [str(exception.value) for exception in self.app.exception]
+        except Exception as e:
+            failed = [f"{type(e).__name__}: {e}"]
+        self.steps.append((name, time.perf_counter() - start, not failed))
+        self.errors.extend(f"{name}: {message}" for message in failed[:1])
+        if self.args.think_ms:
+            time.sleep(self.args.think_ms / 1000.0)
+        return not failed
+
+    def _widget(self, key, kind="selectbox"):
+        """Widget by key, rendering once more if the last run ended before drawing it."""
+        try:
+            return getattr(self.app, kind)(key=key)
+        except KeyError:
+            # A background-refresh rerun can cut a run short; the next render is complete
+            self.app.run()
+            return getattr(self.app, kind)(key=key)
+
+    def flow(self, round_index):
+        """Run one search and browse its results; returns False if a step failed."""
+        app = self.app
+        if not self._step("open", app.run):
+            return False
+        app.session_state["resume_data"] = RESUME
+
+        # Sessions cycle through --distinct-queries searches, so some hit the provider caches
+        query = (self.index * self.args.rounds + round_index) % self.args.distinct_queries
+        titles = self._widget("job_titles")
+        locations = self._widget("locations")
+        titles.select_index(query % len(titles.options))
+        locations.select_index((query // len(titles.options)) % len(locations.options))
+        if not self._step("search", lambda: app.button[0].click().run()):
+            return False
+        if "job_selection" not in _keys(app):
+            return True  # nothing found to browse
+
+        for option in SORT_OPTIONS:
+            self._step("sort", lambda: self._widget("sort_option").select(option).run())
+        self._step("filter", lambda: self._widget("filter_platform").select_index(1).run())
+        self._step("filter", lambda: self._widget("filter_platform").select("All Platforms").run())
+
+        selection = self._widget("job_selection")
+        self._step("select", lambda: selection.select_index(round_index % len(selection.options)).run())
+        if not self.args.skip_analysis:
+            analyze = [key for key in _keys(app, "button") if key.startswith("analyze_")]
+            if analyze:
+                self._step("analyze", lambda: self._widget(analyze[0], "button").click().run())
+        return True
+
+
+def _keys(app, kind="selectbox"):
+    return [widget.key for widget in getattr(app, kind) if widget.key]
+
+
+def run_worker(index, sessions, args, server_url, barrier, results):
+    """
+    Simulate sessions concurrent users in this process and put a report on results.
+
+    Args:
+        index (int): Worker number
+        sessions (int): Concurrent sessions in this worker
+        args (argparse.Namespace): Parsed command line arguments
+        server_url (str): URL of the fake ScrapingDog endpoint
+        barrier: Barrier shared with the parent, passed once the worker is warmed up
+        results: Queue receiving the worker's report
+    """
+    # Point the app at the stand-ins before anything reads config
+    os.environ["SCRAPINGDOG_API_URL"] = server_url
+    os.environ["SCRAPINGDOG_API_KEY"] = "load-test"  # the fake server accepts any key
+    os.environ["LLM_BACKEND"] = "local"
+    os.environ["LOCAL_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["LOCAL_LLM_TOKENS_PER_SECOND"] = str(args.llm_tokens_per_second)
+    os.environ["JOB_SEARCH_DATA_DIR"] = os.path.join(args.data_dir, f"worker-{index}")
+
+    # Imports and the first render are paid before the clock starts
+    simulated = [Session(index * sessions + i, args) for i in range(sessions)]
+    simulated[0].app.run()
+    rss_samples = []
+    stop = threading.Event()
+
+    def sample_rss():
+        while not stop.wait(0.2):
+            rss_samples.append(_rss_kb() or 0)
+
+    barrier.wait()
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    cpu_start = _cpu_seconds()
+    wall_start = time.perf_counter()
+    flows = []
+
+    def drive(session):
+        for round_index in range(args.rounds):
+            try:
+                flows.append(session.flow(round_index))
+            except Exception as e:
+                # e.g. a widget missing from a page that rendered without raising
+                session.errors.append(f"flow: {type(e).__name__}: {e}")
+                flows.append(False)
+
+    threads = [threading.Thread(target=drive, args=(session,)) for session in simulated]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall_seconds = time.perf_counter() - wall_start
+    cpu_seconds = _cpu_seconds() - cpu_start
+    stop.set()
+    results.put({
+        "worker": index,
+        "sessions": sessions,
+        "flows": len(flows),
+        "failed_flows": flows.count(False),
+        "steps": [step for session in simulated for step in session.steps],
+        "errors": [error for session in simulated for error in session.errors],
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "cpu_percent": 100.0 * cpu_seconds / wall_seconds if wall_seconds else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "mean_rss_mb": sum(rss_samples) / len(rss_samples) / 1024.0 if rss_samples else 0.0,
+    })
+
+
+def summarize(reports, wall_seconds):
+    """
+    Combine worker reports into throughput, per-step latency and per-worker resources.
+
+    Args:
+        reports (list): Worker reports from run_worker
+        wall_seconds (float): Time from the common start to the last worker finishing
+
+    Returns:
+        dict: The summary, as printed by print_report
+    """
+    steps = {}
+    for report in reports:
+        for name, seconds, ok in report["steps"]:
+            steps.setdefault(name, {"latencies": [], "errors": 0})
+            steps[name]["latencies"].append(seconds * 1000.0)
+            steps[name]["errors"] += not ok
+    step_count = sum(len(step["latencies"]) for step in steps.values())
+    flows = sum(report["flows"] for report in reports)
+    return {
+        "workers": len(reports),
+        "sessions": sum(report["sessions"] for report in reports),
+        "flows": flows,
+        "failed_flows": sum(report["failed_flows"] for report in reports),
+        "wall_seconds": round(wall_seconds, 3),
+        "flows_per_sec": round(flows / wall_seconds, 3) if wall_seconds else 0.0,
+        "steps_per_sec": round(step_count / wall_seconds, 3) if wall_seconds else 0.0,
+        "steps": {
+            name: {
+                "count": len(step["latencies"]),
+                "errors": step["errors"],
+                "p50_ms": round(percentile(step["latencies"], 50), 1),
+                "p95_ms": round(percentile(step["latencies"], 95), 1),
+                "p99_ms": round(percentile(step["latencies"], 99), 1),
+            }
+            for name, step in steps.items()
+        },
+        "worker_stats": [
+            {key: round(report[key], 2) if isinstance(report[key], float) else report[key]
+             for key in ("worker", "sessions", "flows", "cpu_seconds", "cpu_percent", "peak_rss_mb", "mean_rss_mb")}
+            for report in sorted(reports, key=lambda report: report["worker"])
+        ],
+        "errors": [error for report in reports for error in report["errors"]][:20],
+    }
+
+
+def print_report(summary):
+    print(f"\n{summary['sessions']} sessions on {summary['workers']} worker(s): {summary['flows']} flows "
+          f"({summary['failed_flows']} failed) in {summary['wall_seconds']:.1f} s, "
+          f"{summary['flows_per_sec']:.2f} flows/s, {summary['steps_per_sec']:.2f} steps/s, "
+          f"{summary.get('upstream_requests', 0)} ScrapingDog requests")
+    print(f"\n{'step':<10}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print("-" * 56)
+    for name, step in summary["steps"].items():
+        print(f"{name:<10}{step['count']:>8}{step['errors']:>8}{step['p50_ms']:>10.1f}"
+              f"{step['p95_ms']:>10.1f}{step['p99_ms']:>10.1f}")
+    print(f"\n{'worker':<10}{'sessions':>9}{'flows':>7}{'cpu s':>9}{'cpu %':>8}{'peak RSS MB':>13}{'mean RSS MB':>13}")
+    print("-" * 69)
+    for worker in summary["worker_stats"]:
+        print(f"{worker['worker']:<10}{worker['sessions']:>9}{worker['flows']:>7}{worker['cpu_seconds']:>9.1f}"
+              f"{worker['cpu_percent']:>8.0f}{worker['peak_rss_mb']:>13.1f}{worker['mean_rss_mb']:>13.1f}")
+    if summary["errors"]:
+        print("\nFirst errors:")
+        for error in summary["errors"]:
+            print(f"  {error[:200]}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of app.py against local stand-ins.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each one app.py server")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions in total, split across workers")
+    parser.add_argument("--rounds", type=int, default=2, help="Searches each session runs")
+    parser.add_argument("--distinct-queries", type=int, default=4, help="Distinct searches the sessions share")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause after every step")
+    parser.add_argument("--skip-analysis", action="store_true", help="Do not request match analyses")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds one step may take")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fake ScrapingDog base latency")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Fake ScrapingDog random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake ScrapingDog failure rate (0-1)")
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0, help="Local LLM time to first chunk")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=150.0, help="Local LLM output throughput")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = max(1, min(args.workers, args.sessions))
+    counts = [args.sessions // workers + (i < args.sessions % workers) for i in range(workers)]
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+    results = context.Queue()
+    with tempfile.TemporaryDirectory(prefix="job-search-load-") as data_dir, FakeScrapingDogServer(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed
+    ) as server:
+        args.data_dir = data_dir
+        processes = [
+            context.Process(target=run_worker, args=(i, counts[i], args, server.url, barrier, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        print(f"Warming up {workers} worker(s)...", file=sys.stderr)
+        barrier.wait(timeout=args.timeout)
+        start = time.perf_counter()
+        print(f"Running {args.sessions} sessions x {args.rounds} rounds...", file=sys.stderr)
+        reports = []
+        while len(reports) < len(processes):
+            try:
+                reports.append(results.get(timeout=1))
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("A load test worker exited without a report")
+        wall_seconds = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+    summary = summarize(reports, wall_seconds)
+    summary["upstream_requests"] = server.request_count
+    print_report(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "args": vars(args), "summary": summary}, f, indent=2)
+    return 1 if summary["failed_flows"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
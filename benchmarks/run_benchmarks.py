@@ -0,0 +1,533 @@
+"""
+Benchmark the job search pipeline against a local ScrapingDog stand-in.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scenario serp_search --iterations 200 --concurrency 8
+    python -m benchmarks.run_benchmarks --check          # fail on threshold regressions
+    python -m benchmarks.run_benchmarks --output results.json
+
+Each scenario reports p50/p95/p99 latency, requests/sec and peak traced memory.
+Thresholds live in benchmarks/thresholds.json and can be refreshed from a run
+with --update-thresholds.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_scrapingdog import FakeScrapingDogServer, load_payloads, scale_payload
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# Headroom applied when writing thresholds from a run
+THRESHOLD_HEADROOM = 1.5
+
+# Floors for written thresholds: sub-millisecond scenarios (cache hits, open
+# circuits) vary by several times between runs without mattering to users
+THRESHOLD_MIN_P95_MS = 5.0
+THRESHOLD_MIN_PEAK_KB = 16.0
+
+KEYWORDS = "digital marketer"
+LOCATION = "New York, NY"
+
+# The fake server accepts any API key; real runs read SCRAPINGDOG_API_KEY from the environment
+API_KEY = "benchmark"
+
+
+def percentile(values, pct):
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values (list): Sample values
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The interpolated percentile, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def uncached_searcher(url):
+    """SerpApiSearcher that always hits the API: no response cache and no rate limit."""
+    from utils.rate_limiter import TokenBucket
+    from utils.result_cache import ResultCache
+    from utils.serp_api_searcher import SerpApiSearcher
+
+    return SerpApiSearcher(
+        api_url=url,
+        api_key=API_KEY,
+        rate_limiter=TokenBucket(rate=1e9, burst=1e9),
+        cache=ResultCache("benchmark", ttl=0)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+#
+# Each scenario is a function taking the parsed arguments and returning
+# (server_kwargs, make_call). server_kwargs configures the fake API and
+# make_call(server_url) returns a zero-argument callable that performs one
+# search. Construction happens outside the timed region.
+# ---------------------------------------------------------------------------
+
+def scenario_serp_search(args):
+    def make_call(url):
+        searcher = uncached_searcher(url)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    return {}, make_call
+
+
+def scenario_serp_search_large(args):
+    payloads = [scale_payload(p, args.large_jobs) for p in load_payloads()]
+
+    def make_call(url):
+        searcher = uncached_searcher(url)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=args.large_jobs, days_ago=7)
+
+    return {"payloads": payloads}, make_call
+
+
+def scenario_serp_search_large_first_page(args):
+    payloads = [scale_payload(p, args.large_jobs) for p in load_payloads()]
+
+    def make_call(url):
+        searcher = uncached_searcher(url)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    return {"payloads": payloads}, make_call
+
+
+def scenario_serp_search_errors(args):
+    def make_call(url):
+        searcher = uncached_searcher(url)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    return {"error_rate": max(args.error_rate, 0.2)}, make_call
+
+
+def scenario_serp_search_outage(args):
+    def make_call(url):
+        searcher = uncached_searcher(url)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    # Slow failures: without the circuit breaker every call would pay the full latency
+    return {"error_rate": 1.0, "latency_ms": max(args.latency_ms, 200.0)}, make_call
+
+
+def scenario_serp_search_cached(args):
+    from utils.serp_api_searcher import SerpApiSearcher
+
+    def make_call(url):
+        # Default cache: after the first call every search is answered locally
+        searcher = SerpApiSearcher(api_url=url, api_key=API_KEY)
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    return {}, make_call
+
+
+def scenario_serp_search_stale(args):
+    from utils.rate_limiter import TokenBucket
+    from utils.result_cache import ResultCache
+    from utils.serp_api_searcher import SerpApiSearcher
+
+    def make_call(url):
+        # Entries go stale immediately: every call after the first is served
+        # from the stale entry while one background refresh runs at a time
+        searcher = SerpApiSearcher(
+            api_url=url,
+            api_key=API_KEY,
+            rate_limiter=TokenBucket(rate=1e9, burst=1e9),
+            cache=ResultCache("benchmark_stale", ttl=1e-6, stale_ttl=3600)
+        )
+        return lambda: searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+
+    return {"latency_ms": max(args.latency_ms, 50.0)}, make_call
+
+
+def scenario_scraper_fallback(args):
+    from utils.job_scraper import JobScraper
+    from config import JOB_PLATFORMS
+
+    def make_call(url):
+        scraper = JobScraper(verify_urls=False)
+
+        def call():
+            jobs = []
+            for platform in JOB_PLATFORMS:
+                jobs.extend(scraper.search_jobs(KEYWORDS, LOCATION, platform=platform, count=5))
+            return jobs
+
+        return call
+
+    return {}, make_call
+
+
+def scenario_scraper_verify_url(args):
+    from utils.job_scraper import JobScraper
+
+    def make_call(url):
+        scraper = JobScraper()
+        return lambda: scraper.verify_url(url)
+
+    return {}, make_call
+
+
+def scenario_filter_results(args):
+    from utils.job_filters import JobFilter, filter_jobs
+
+    def make_call(url):
+        # Parsed listings repeated up to the large result size, filtered the way
+        # the agent filters a provider's results that lacked native support
+        searcher = uncached_searcher(url)
+        sample = searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+        jobs = [dict(sample[i % len(sample)]) for i in range(args.large_jobs)]
+        job_filter = JobFilter(job_types=["Full-time", "Remote"], max_age_days=7, experience="3-5")
+        return lambda: filter_jobs(jobs, job_filter)
+
+    return {}, make_call
+
+
+def scenario_extract_attributes(args):
+    from utils.job_attributes import extract_attributes
+
+    def make_call(url):
+        # The ingestion pass over full descriptions, as providers run it on each new posting
+        searcher = uncached_searcher(url)
+        sample = searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+        jobs = [dict(sample[i % len(sample)]) for i in range(args.large_jobs)]
+        return lambda: [extract_attributes(dict(job)) for job in jobs]
+
+    return {}, make_call
+
+
+def scenario_batch_match(args):
+    from agents.batch_matcher import BatchMatcher
+    from utils.job_attributes import SKILLS
+
+    def make_call(url):
+        # A cohort of resumes with rotating skill sets against parsed listings repeated
+        # to several thousand postings, scored in chunks like a career-services batch
+        searcher = uncached_searcher(url)
+        sample = searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)
+        jobs = [dict(sample[i % len(sample)], title=f"{sample[i % len(sample)]['title']} {i}")
+                for i in range(args.large_jobs * 8)]
+        skills = list(SKILLS)
+        resumes = [
+            {"skills": [skills[(i * 7 + j) % len(skills)] for j in range(8)],
+             "experience": [f"Worked on {skills[i % len(skills)]} projects"]}
+            for i in range(200)
+        ]
+        matcher = BatchMatcher(chunk_size=1024)
+        return lambda: matcher.match(resumes, jobs, top_k=10)
+
+    return {}, make_call
+
+
+def scenario_match_analysis(args):
+    from agents.job_search_agent import JobSearchAgent
+    from utils.llm import LocalLLMBackend
+
+    def make_call(url):
+        # One streamed LLM analysis per call, against the local stand-in model
+        searcher = uncached_searcher(url)
+        job = searcher.search_jobs(KEYWORDS, LOCATION, count=10, days_ago=7)[0]
+        resume = {"skills": ["Social Media", "Email Marketing", "SEO", "Copywriting"],
+                  "experience": ["Content creation for fitness brands", "Ran paid social campaigns"]}
+        agent = JobSearchAgent()
+        agent.llm = LocalLLMBackend(latency_ms=args.llm_latency_ms, tokens_per_second=args.llm_tokens_per_second)
+        return lambda: agent.get_job_match_analysis(resume, job)
+
+    return {}, make_call
+
+
+def scenario_geo_radius(args):
+    from utils.geo import gazetteer
+    from utils.job_filters import JobFilter, JobTable
+
+    def make_call(url):
+        # Provider-style spellings of every gazetteer place, plus unknown and remote rows
+        spellings = [place.label for place in gazetteer.places]
+        spellings += [f"{place.name}, {place.region}, {place.country}" for place in gazetteer.places]
+        spellings += ["Remote", "United States", "Anytown, XY"]
+        jobs = [{"location": spellings[i % len(spellings)]} for i in range(args.large_jobs * 10)]
+        job_filter = JobFilter(near="Austin, TX", radius_km=100)
+
+        def call():
+            table = JobTable(jobs)
+            rows = table.rows(job_filter)
+            return table.order_by_location(rows, near="Austin, TX"), table.metro_groups()
+
+        return call
+
+    return {}, make_call
+
+
+def scenario_company_sort(args):
+    from utils.job_filters import JobTable
+
+    def make_call(url):
+        # Spelling variants of a few hundred employers, interned once at ingestion as providers do
+        suffixes = ["", " LLC", ", Inc.", " Ltd", " Corporation"]
+        names = [f"Employer {i // len(suffixes)}{suffixes[i % len(suffixes)]}" for i in range(1000)]
+        from utils.companies import companies
+        jobs = [
+            {"title": f"Role {i % 7}", "company": names[i % len(names)], "company_id": companies.intern(names[i % len(names)]),
+             "location": "Austin, TX", "platform": "LinkedIn"}
+            for i in range(args.large_jobs * 10)
+        ]
+
+        def call():
+            table = JobTable(jobs)
+            return table.order_by_company(table.dedupe())
+
+        return call
+
+    return {}, make_call
+
+
+def scenario_agent_search(args):
+    from agents.job_search_agent import JobSearchAgent
+    from utils.job_scraper import JobScraper
+
+    def make_call(url):
+        agent = JobSearchAgent()
+        agent.serp_api_searcher = uncached_searcher(url)
+        agent.job_scraper = JobScraper(verify_urls=False)
+        return lambda: agent.search_jobs({}, KEYWORDS, LOCATION, platforms=["Indeed", "Glassdoor"], count=5)
+
+    return {}, make_call
+
+
+def scenario_agent_fallback(args):
+    from agents.job_search_agent import JobSearchAgent
+    from utils.job_scraper import JobScraper
+
+    def make_call(url):
+        agent = JobSearchAgent()
+        agent.serp_api_searcher = uncached_searcher(url)
+        agent.job_scraper = JobScraper(verify_urls=False)
+        return lambda: agent.search_jobs({}, KEYWORDS, LOCATION, platforms=["Indeed", "Glassdoor"], count=5)
+
+    return {"error_rate": 1.0, "error_mode": "api_error"}, make_call
+
+
+SCENARIOS = {
+    "serp_search": scenario_serp_search,
+    "serp_search_large": scenario_serp_search_large,
+    "serp_search_large_first_page": scenario_serp_search_large_first_page,
+    "serp_search_errors": scenario_serp_search_errors,
+    "serp_search_outage": scenario_serp_search_outage,
+    "serp_search_cached": scenario_serp_search_cached,
+    "serp_search_stale": scenario_serp_search_stale,
+    "scraper_fallback": scenario_scraper_fallback,
+    "scraper_verify_url": scenario_scraper_verify_url,
+    "filter_results": scenario_filter_results,
+    "extract_attributes": scenario_extract_attributes,
+    "batch_match": scenario_batch_match,
+    "match_analysis": scenario_match_analysis,
+    "geo_radius": scenario_geo_radius,
+    "company_sort": scenario_company_sort,
+    "agent_search": scenario_agent_search,
+    "agent_fallback": scenario_agent_fallback,
+}
+
+
+def run_scenario(name, args):
+    """
+    Run one scenario against a fresh fake server.
+
+    Args:
+        name (str): Scenario name from SCENARIOS
+        args (argparse.Namespace): Parsed command line arguments
+
+    Returns:
+        dict: Latency percentiles (ms), requests/sec, error count and peak memory (KB)
+    """
+    server_kwargs, make_call = SCENARIOS[name](args)
+    server_kwargs.setdefault("latency_ms", args.latency_ms)
+    server_kwargs.setdefault("jitter_ms", args.jitter_ms)
+    server_kwargs.setdefault("error_rate", args.error_rate)
+    server_kwargs.setdefault("seed", args.seed)
+
+    with FakeScrapingDogServer(**server_kwargs) as server:
+        call = make_call(server.url)
+
+        # Warm up connections and lazy imports outside the measured region
+        for _ in range(min(args.warmup, args.iterations)):
+            call()
+
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+
+        def timed_call(_):
+            start = time.perf_counter()
+            try:
+                call()
+            except Exception as e:
+                with lock:
+                    failures.append(str(e))
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            with lock:
+                latencies.append(elapsed_ms)
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(timed_call, range(args.iterations)))
+        wall_seconds = time.perf_counter() - wall_start
+
+        # Peak memory is measured in a separate, shorter pass because
+        # tracemalloc slows down allocation-heavy code considerably.
+        tracemalloc.start()
+        for _ in range(args.memory_iterations):
+            call()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "requests_per_sec": round(args.iterations / wall_seconds, 2) if wall_seconds else 0.0,
+            "peak_memory_kb": round(peak_bytes / 1024.0, 1),
+            "upstream_requests": server.request_count,
+            "upstream_errors": server.error_count,
+            "exceptions": len(failures),
+        }
+
+
+def check_thresholds(results, thresholds):
+    """
+    Compare results against stored thresholds.
+
+    Args:
+        results (dict): Scenario name -> result dictionary
+        thresholds (dict): Scenario name -> {"max_p95_ms", "min_requests_per_sec", "max_peak_memory_kb"}
+
+    Returns:
+        list: Human readable regression messages, empty when everything passed
+    """
+    regressions = []
+    for name, result in results.items():
+        limits = thresholds.get(name)
+        if not limits:
+            continue
+        if "max_p95_ms" in limits and result["p95_ms"] > limits["max_p95_ms"]:
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms > {limits['max_p95_ms']}ms")
+        if "min_requests_per_sec" in limits and result["requests_per_sec"] < limits["min_requests_per_sec"]:
+            regressions.append(
+                f"{name}: {result['requests_per_sec']} req/s < {limits['min_requests_per_sec']} req/s"
+            )
+        if "max_peak_memory_kb" in limits and result["peak_memory_kb"] > limits["max_peak_memory_kb"]:
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_kb']}KB > {limits['max_peak_memory_kb']}KB"
+            )
+    return regressions
+
+
+def thresholds_from_results(results):
+    """Derive thresholds from a run, leaving THRESHOLD_HEADROOM for noise."""
+    return {
+        name: {
+            "max_p95_ms": round(max(result["p95_ms"] * THRESHOLD_HEADROOM, THRESHOLD_MIN_P95_MS), 1),
+            "min_requests_per_sec": round(
+                min(result["requests_per_sec"] / THRESHOLD_HEADROOM, 1000.0 / THRESHOLD_MIN_P95_MS), 1
+            ),
+            "max_peak_memory_kb": round(max(result["peak_memory_kb"] * THRESHOLD_HEADROOM, THRESHOLD_MIN_PEAK_KB), 1),
+        }
+        for name, result in results.items()
+    }
+
+
+def load_thresholds():
+    if not os.path.exists(THRESHOLDS_PATH):
+        return {}
+    with open(THRESHOLDS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_report(results):
+    header = f"{'scenario':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'peak KB':>12}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<30}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+            f"{r['requests_per_sec']:>10.1f}{r['peak_memory_kb']:>12.1f}{r['upstream_errors']:>8}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job search against a fake ScrapingDog API.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, defaults to all)")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--memory-iterations", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake API base latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Fake API random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake API failure rate (0-1)")
+    parser.add_argument("--large-jobs", type=int, default=500, help="Jobs per payload for serp_search_large")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Local LLM time to first chunk")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=2000.0, help="Local LLM output throughput")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if thresholds are exceeded")
+    parser.add_argument("--update-thresholds", action="store_true",
+                        help="Rewrite benchmarks/thresholds.json from this run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = args.scenario or list(SCENARIOS)
+
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = run_scenario(name, args)
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "args": vars(args), "results": results}, f, indent=2)
+
+    if args.update_thresholds:
+        thresholds = load_thresholds()
+        thresholds.update(thresholds_from_results(results))
+        with open(THRESHOLDS_PATH, "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Updated {THRESHOLDS_PATH}")
+
+    if args.check:
+        regressions = check_thresholds(results, load_thresholds())
+        if regressions:
+            print("\nRegressions:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nAll scenarios within thresholds.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
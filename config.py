@@ -7,12 +7,114 @@ load_dotenv()
 # API keys
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
+SCRAPINGDOG_API_KEY = os.getenv("SCRAPINGDOG_API_KEY")  # required for real listings; without it ScrapingDog is skipped
+
+# ScrapingDog endpoint (override to point at a local stand-in, e.g. for benchmarks)
+SCRAPINGDOG_API_URL = os.getenv("SCRAPINGDOG_API_URL", "https://api.scrapingdog.com/google_jobs")
+
+# Optional ScrapingDog endpoint returning one job's details by job_id;
+# without it, details come from the in-process detail cache and the stored result set
+SCRAPINGDOG_JOB_DETAILS_URL = os.getenv("SCRAPINGDOG_JOB_DETAILS_URL")
+
+# Instrumentation exporters (both optional)
+METRICS_JSON_LOG = os.getenv("METRICS_JSON_LOG")  # path of a JSON-lines trace log
+METRICS_PORT = os.getenv("METRICS_PORT")  # port for a local Prometheus /metrics endpoint
+
+# Provider timeouts (seconds) and circuit breaker settings
+PROVIDER_CONNECT_TIMEOUT = 3.05
+PROVIDER_READ_TIMEOUT = 15
+CIRCUIT_FAILURE_THRESHOLD = 0.5   # rolling error rate that opens the circuit
+CIRCUIT_MIN_REQUESTS = 20         # samples needed before the error rate counts
+CIRCUIT_CONSECUTIVE_FAILURES = 5  # failures in a row that open the circuit
+CIRCUIT_OPEN_SECONDS = 30         # fail-fast period before a half-open probe
+CIRCUIT_SLOW_CALL_SECONDS = 10    # successful calls slower than this count as failures
+
+# Shared HTTP transport and per-backend limits
+HTTP_POOL_CONNECTIONS = 10         # distinct hosts kept in each session's pool
+HTTP_POOL_MAXSIZE = 20             # keep-alive connections per host
+SCRAPINGDOG_RATE_LIMIT = 5         # sustained ScrapingDog requests per second, process-wide
+SCRAPINGDOG_RATE_BURST = 10        # requests allowed in a burst above the sustained rate
+RATE_LIMIT_WAIT_SECONDS = 5        # how long a search waits for a rate limit slot
+RESULT_CACHE_TTL = 300             # seconds a provider response is reused for the same query
+RESULT_CACHE_SIZE = 500            # provider responses kept per backend
+RESULT_CACHE_STALE_TTL = 3600      # seconds past the TTL a response is still served while it refreshes
+BACKGROUND_REFRESH_WORKERS = 2     # concurrent background refreshes of stale responses
+
+# Provider fan-out
+SEARCH_MAX_WORKERS = 8             # provider calls run concurrently per search
+SEARCH_MAX_COST_PER_CALL = None    # skip providers costing more per call (None = no limit)
+SEARCH_LATENCY_BUDGET = 10         # skip providers whose rolling p95 latency (s) exceeds this
+SEARCH_MAX_PAGES = 3               # result pages fetched per provider and platform at most
+PLANNER_SMOOTHING = 0.3            # weight of the newest call in the planner's hit rate average
+
+# Daily ScrapingDog credit allowance seen by the planner (unset = unlimited)
+SCRAPINGDOG_DAILY_QUOTA = int(os.getenv("SCRAPINGDOG_DAILY_QUOTA")) if os.getenv("SCRAPINGDOG_DAILY_QUOTA") else None
 
 # Model settings
 GEMINI_MODEL = "gemini-1.5-flash" 
 
+# LLM backend for match analysis: "gemini", or "local" for the deterministic
+# offline stand-in, which streams with the latency and throughput below
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LOCAL_LLM_LATENCY_MS = float(os.getenv("LOCAL_LLM_LATENCY_MS", "300"))               # time to first chunk
+LOCAL_LLM_TOKENS_PER_SECOND = float(os.getenv("LOCAL_LLM_TOKENS_PER_SECOND", "150"))  # output throughput, 0 = no limit
+LOCAL_LLM_CHUNK_TOKENS = 8                                                             # tokens per streamed chunk
+
+# Match analysis prompts (token counts are estimated at ~4 characters per token)
+PROMPT_TOKEN_BUDGET = 1200         # tokens per match analysis prompt, instructions included
+PROMPT_RESUME_SHARE = 0.4          # share of the content budget reserved for the resume
+PROMPT_RESUME_CACHE_SIZE = 256     # compacted resumes memoized across calls and sessions
+PROMPT_LINE_CHARS = 300            # longest resume line or job requirement kept, in characters
+
 # Job search settings
 DEFAULT_JOB_COUNT = 5
+JOB_DETAIL_CACHE_SIZE = 5000  # job descriptions kept in memory across sessions
+RESULTS_PAGE_SIZE = 25        # result rows sent to the browser per page
+RENDER_CACHE_SIZE = 2000      # rendered job card and description HTML blocks kept in memory across sessions
+DESCRIPTION_PREVIEW_CHARS = 1500  # description characters shown before "Show full description"
+
+# Batch resume x job matching
+MATCH_TOP_K = 10                   # best jobs kept per resume
+MATCH_CHUNK_SIZE = 2048            # jobs scored per chunk; memory stays at resumes x chunk scores per worker
+MATCH_SKILL_WEIGHT = 0.6           # share of a score from required-skill coverage, the rest from text similarity
+
+# Worker processes for CPU-bound enrichment (attribute extraction, batch matching);
+# network I/O stays on threads. 1 runs every stage in the calling thread.
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", os.cpu_count() or 1))
+# Offloading breaks even with in-process extraction at about 200 jobs (~23 ms either way
+# on ~900-character descriptions). A search page is ~10 jobs and always stays
+# in-process; the pool serves bulk batches: large result sets, batch matching, benchmarks.
+PARALLEL_MIN_BATCH = 200           # jobs below which a stage runs in-process, as offloading costs more
+PARALLEL_CHUNK_SIZE = 100          # jobs per task handed to a worker process
+
+# "New since last search" seen-sets: exact sorted hashes until a query has seen
+# DELTA_SORTED_MAX postings, then a Bloom filter with this false positive rate
+DELTA_SORTED_MAX = 4096
+DELTA_BLOOM_ERROR_RATE = 0.001
+DELTA_MAX_QUERIES = 10000     # seen-sets kept in memory, least recently used dropped first
+
+# Saved searches and their background refresh
+DATA_DIR = os.getenv("JOB_SEARCH_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+SAVED_SEARCHES_PATH = os.path.join(DATA_DIR, "saved_searches.json")
+NOTIFICATIONS_PATH = os.path.join(DATA_DIR, "notifications.jsonl")
+NOTIFICATION_INBOX_SIZE = 100      # undelivered notifications kept per user
+
+# Secret signing the ?user= tokens that identify a user across sessions; generated
+# and kept in OWNER_SECRET_PATH when unset. Changing it signs everyone out.
+OWNER_TOKEN_SECRET = os.getenv("OWNER_TOKEN_SECRET")
+OWNER_SECRET_PATH = os.path.join(DATA_DIR, "owner_secret")
+
+# Search results shared across sessions; a session only holds its result set ID
+RESULTS_DIR = os.path.join(DATA_DIR, "results")
+RESULT_STORE_SIZE = 200            # result sets kept in memory, least recently used dropped first
+RESULT_STORE_DISK_FILES = 2000     # result sets kept on disk, oldest removed first (0 = memory only)
+SAVED_SEARCH_INTERVAL_MINUTES = 60 # default refresh interval of a saved search
+SCHEDULER_TICK_SECONDS = 30        # how often the scheduler looks for due searches
+SCHEDULER_MAX_WORKERS = 4          # distinct saved-search specs fetched concurrently
+
+# Offline gazetteer used to normalize locations and answer radius searches
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "gazetteer.csv")
+GEO_LOOKUP_CACHE_SIZE = 4096       # location strings whose normalized place is memoized
 JOB_PLATFORMS = ["LinkedIn", "Indeed", "Glassdoor", "ZipRecruiter", "Monster"]
 
 
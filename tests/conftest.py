@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Saved searches, result sets and the owner secret written by the app under test stay out of the repo
+os.environ.setdefault("JOB_SEARCH_DATA_DIR", tempfile.mkdtemp(prefix="job_search_tests_"))
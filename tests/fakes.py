@@ -0,0 +1,48 @@
+import threading
+import time
+
+from utils.providers import ProviderCapabilities, SearchProvider
+
+
+class FakeProvider(SearchProvider):
+    """In-memory search provider returning canned jobs per platform and recording its calls."""
+
+    def __init__(self, name, jobs_per_platform=3, delay=0.0, error=None, cost_per_call=1.0, fallback_only=False,
+                 supports_paging=False, filter_pushdown=(), quota=None, available=True, cached=False,
+                 results_per_page=3):
+        self.name = name
+        self.capabilities = ProviderCapabilities(
+            supports_paging=supports_paging, cost_per_call=cost_per_call, fallback_only=fallback_only,
+            real_listings=not fallback_only, filter_pushdown=filter_pushdown, results_per_page=results_per_page
+        )
+        self.jobs_per_platform = jobs_per_platform
+        self.delay = delay
+        self.error = error
+        self.quota = quota
+        self.available = available
+        self.cached = cached
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def search_jobs(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, stale_ok=True,
+                    filters=None):
+        with self._lock:
+            self.calls.append({"platform": platform, "count": count, "pages": pages, "filters": filters})
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [
+            {"title": f"{keywords} {i}", "company": f"{self.name} Co", "location": location,
+             "platform": platform, "job_id": f"{self.name}-{platform}-{i}", "is_real_job": not self.capabilities.fallback_only}
+            for i in range(min(count, self.jobs_per_platform))
+        ]
+
+    def is_available(self):
+        return self.available
+
+    def quota_remaining(self):
+        return self.quota
+
+    def is_cached(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, filters=None):
+        return self.cached
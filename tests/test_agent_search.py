@@ -0,0 +1,53 @@
+import time
+
+from agents.job_search_agent import JobSearchAgent
+from tests.fakes import FakeProvider
+from utils.query_planner import QueryPlanner
+
+
+def _agent(*providers):
+    agent = JobSearchAgent()
+    agent.planner = QueryPlanner()
+    agent.provider_names = [provider.name for provider in providers]
+    for provider in providers:
+        agent.set_provider(provider.name, provider)
+    return agent
+
+
+def test_providers_and_platforms_are_queried_in_parallel():
+    slow = [FakeProvider("a", delay=0.2), FakeProvider("b", delay=0.2, cost_per_call=2.0, jobs_per_platform=0)]
+    agent = _agent(*slow)
+    start = time.perf_counter()
+    jobs = agent.search_jobs({}, "Data Analyst", "Austin, TX", platforms=["LinkedIn", "Indeed"], count=5)
+    elapsed = time.perf_counter() - start
+    # Four calls of 0.2s each, run concurrently
+    assert sum(len(provider.calls) for provider in slow) == 4
+    assert elapsed < 0.6
+    assert len(jobs) == 6
+
+
+def test_results_keep_plan_order_and_are_deduplicated():
+    first = FakeProvider("a", jobs_per_platform=2)
+    agent = _agent(first)
+    jobs = agent.search_jobs({}, "Data Analyst", "Austin, TX", platforms=["LinkedIn", "Indeed"], count=5)
+    assert [job["job_id"] for job in jobs] == ["a-LinkedIn-0", "a-LinkedIn-1", "a-Indeed-0", "a-Indeed-1"]
+
+
+def test_a_failing_provider_does_not_sink_the_search():
+    broken = FakeProvider("broken", error=RuntimeError("down"), cost_per_call=0.5, jobs_per_platform=0)
+    working = FakeProvider("working")
+    jobs = _agent(broken, working).search_jobs({}, "Data Analyst", "Austin, TX", platforms=["LinkedIn"], count=5)
+    assert broken.calls and working.calls
+    assert [job["job_id"] for job in jobs] == ["working-LinkedIn-0", "working-LinkedIn-1", "working-LinkedIn-2"]
+
+
+def test_fallback_runs_only_when_primary_returns_nothing():
+    fallback = FakeProvider("fallback", fallback_only=True, cost_per_call=0.0)
+    agent = _agent(FakeProvider("a"), fallback)
+    assert agent.search_jobs({}, "Data Analyst", "Austin, TX", platforms=["LinkedIn"], count=5)
+    assert not fallback.calls
+
+    agent = _agent(FakeProvider("empty", jobs_per_platform=0), fallback)
+    jobs = agent.search_jobs({}, "Data Analyst", "Austin, TX", platforms=["LinkedIn"], count=5)
+    assert fallback.calls
+    assert jobs and not any(job["is_real_job"] for job in jobs)
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from config import RESULTS_PAGE_SIZE
+from utils.job_model import summarize_jobs
+from utils.result_store import result_store
+
+streamlit_testing = pytest.importorskip("streamlit.testing.v1")
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _jobs(n):
+    return [{
+        "title": f"Data Analyst {i:03d}", "company": f"Company {i % 7}", "location": "Austin, TX",
+        "platform": "LinkedIn", "date_posted": f"{i % 30} days ago", "job_type": "Full-time",
+        "apply_url": f"https://example.com/{i}", "description": f"Posting {i}. Requires SQL.", "job_id": f"job-{i}",
+    } for i in range(n)]
+
+
+@pytest.fixture
+def app():
+    at = streamlit_testing.AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _show(at, jobs):
+    at.session_state["result_id"] = result_store.put(*summarize_jobs(jobs))
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _titles(at):
+    return at.dataframe[0].value["Title"].tolist()
+
+
+def test_only_the_visible_page_is_rendered(app):
+    total = 2 * RESULTS_PAGE_SIZE + 10
+    at = _show(app, _jobs(total))
+    assert len(_titles(at)) == RESULTS_PAGE_SIZE
+    assert len(at.selectbox(key="job_selection").options) == RESULTS_PAGE_SIZE
+    assert any(f"of {total} jobs" in caption.value for caption in at.caption)
+
+    at.number_input(key="results_page").set_value(3).run()
+    assert not at.exception
+    assert len(_titles(at)) == 10
+    assert len(at.selectbox(key="job_selection").options) == 10
+
+
+def test_changing_the_sort_returns_to_the_first_page(app):
+    at = _show(app, _jobs(2 * RESULTS_PAGE_SIZE))
+    at.number_input(key="results_page").set_value(2).run()
+    at.selectbox(key="sort_option").select("Company Name").run()
+    assert not at.exception
+    assert at.number_input(key="results_page").value == 1
+
+
+def test_small_result_sets_have_no_pager(app):
+    at = _show(app, _jobs(3))
+    assert len(_titles(at)) == 3
+    assert not any(widget.key == "results_page" for widget in at.number_input)
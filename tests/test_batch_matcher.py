@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import agents.batch_matcher as batch_matcher_module
+from agents.batch_matcher import BatchMatcher, job_skills, resume_skills
+from utils.parallel import ProcessPool
+
+RESUMES = [
+    {"skills": ["Python", "SQL"], "experience": ["Built dashboards in Tableau for the finance team"]},
+    {"skills": ["Java", "Spring"], "experience": ["Backend services on Kubernetes"]},
+    {"summary": "Nurse with ten years of patient care"},
+]
+
+JOBS = [
+    {"title": "Data Analyst", "description": "SQL and Python reporting, Tableau dashboards for finance."},
+    {"title": "Backend Engineer", "description": "Java and Spring microservices on Kubernetes."},
+    {"title": "Registered Nurse", "description": "Patient care in a busy hospital ward."},
+    {"title": "Data Engineer", "description": "Python pipelines, Airflow and SQL warehouses."},
+    {"title": "Frontend Developer", "description": "React and TypeScript interfaces."},
+    {"title": "Java Developer", "description": "Java services, some SQL."},
+    {"title": "Barista", "description": "Coffee and customer service."},
+]
+
+
+def test_each_resume_ranks_its_own_field_first():
+    result = BatchMatcher(top_k=2).match(RESUMES, JOBS)
+    tops = [[match["job"]["title"] for match in result.top(i)] for i in range(len(RESUMES))]
+    assert tops[0][0] == "Data Analyst" and tops[0][1] == "Data Engineer"
+    assert tops[1][0] == "Backend Engineer"
+    assert tops[2][0] == "Registered Nurse"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+def test_chunked_top_k_matches_scoring_every_job(chunk_size):
+    matcher = BatchMatcher(top_k=3, chunk_size=chunk_size)
+    result = matcher.match(RESUMES, JOBS)
+    for i, resume in enumerate(RESUMES):
+        scores = matcher.score(resume, JOBS)
+        # The best three scores, best first; equal scores at the cut-off may be any of the tied jobs
+        assert np.allclose(result.scores[i], np.sort(scores)[::-1][:3])
+        assert np.allclose(scores[result.indices[i]], result.scores[i])
+        assert len(set(result.indices[i])) == 3
+
+
+def test_scores_are_bounded_and_ties_keep_job_order():
+    matcher = BatchMatcher(top_k=3)
+    jobs = [dict(JOBS[6]), dict(JOBS[6]), dict(JOBS[6])]
+    result = matcher.match([RESUMES[0]], jobs)
+    assert list(result.indices[0]) == [0, 1, 2]
+    scores = matcher.score(RESUMES[0], JOBS)
+    assert ((scores >= 0) & (scores <= 1 + 1e-9)).all()
+
+
+def test_matches_list_key_skills_and_gaps():
+    result = BatchMatcher(top_k=1).match([RESUMES[0]], [JOBS[3]])
+    match = result.top(0)[0]
+    assert match["job_index"] == 0
+    assert 0 <= match["match_score"] <= 100
+    assert set(match["key_matches"]) == {"Python", "SQL"}
+    assert "Airflow" in match["gaps"]
+
+
+def test_skills_from_ingestion_are_used_when_present():
+    assert job_skills({"title": "Anything", "skills": ["Go"]}) == ["Go"]
+    assert "Python" in job_skills({"title": "Python Developer"})
+    assert resume_skills({"experience": ["Wrote Terraform modules"]}) == ["Terraform"]
+
+
+def test_top_k_larger_than_the_job_list():
+    result = BatchMatcher(top_k=10).match(RESUMES[:1], JOBS[:2])
+    assert result.indices.shape == (1, 2)
+
+
+def test_empty_batches():
+    result = BatchMatcher().match(RESUMES, [])
+    assert len(result) == 3 and result.top(0) == []
+    assert len(BatchMatcher().match([], JOBS)) == 0
+    assert BatchMatcher().score(RESUMES[0], []).shape == (0,)
+
+
+def test_worker_processes_give_the_same_ranking(monkeypatch):
+    jobs = JOBS * 5
+    expected = BatchMatcher(top_k=4, chunk_size=4).match(RESUMES, jobs)
+    pool = ProcessPool(max_workers=2, min_batch=1, chunk_size=4)
+    monkeypatch.setattr(batch_matcher_module, "process_pool", pool)
+    try:
+        result = BatchMatcher(top_k=4, chunk_size=4).match(RESUMES, jobs)
+    finally:
+        pool.shutdown()
+    assert np.array_equal(result.indices, expected.indices)
+    assert np.allclose(result.scores, expected.scores)
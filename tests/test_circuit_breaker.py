@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ProviderHealth
+
+
+def _breaker(**settings):
+    options = {"min_requests": 4, "consecutive_failures": 3, "failure_threshold": 0.5, "open_seconds": 60}
+    options.update(settings)
+    return CircuitBreaker("test", **options)
+
+
+def test_consecutive_failures_open_the_circuit():
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record_failure(0.01)
+    assert breaker.state == CLOSED
+    breaker.record_failure(0.01)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_error_rate_opens_the_circuit_once_enough_requests_were_seen():
+    breaker = _breaker(consecutive_failures=100)
+    breaker.record_success(0.01)
+    breaker.record_failure(0.01)
+    assert breaker.state == CLOSED  # 50% of 2 requests: too few to trust
+    breaker.record_success(0.01)
+    breaker.record_failure(0.01)
+    assert breaker.state == OPEN
+
+
+def test_success_resets_the_failure_streak():
+    breaker = _breaker(min_requests=100)
+    for _ in range(5):
+        breaker.record_failure(0.01)
+        breaker.record_failure(0.01)
+        breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+
+
+def test_slow_successes_count_as_failures():
+    breaker = _breaker(slow_call_seconds=0.5)
+    for _ in range(3):
+        breaker.record_success(1.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = _breaker(open_seconds=0.05)
+    for _ in range(3):
+        breaker.record_failure(0.01)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one probe at a time
+    breaker.record_failure(0.01)
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["requests"] == 0
+
+
+def test_call_reraises_and_fails_fast_when_open():
+    breaker = _breaker(consecutive_failures=1)
+
+    def boom():
+        raise ValueError("down")
+
+    with pytest.raises(ValueError):
+        breaker.call(boom)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "never called")
+
+
+def test_health_snapshot():
+    health = ProviderHealth()
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        health.record(True, latency)
+    health.record(False, 1.0)
+    stats = health.snapshot()
+    assert stats["requests"] == 5
+    assert stats["failures"] == 1
+    assert stats["error_rate"] == pytest.approx(0.2)
+    assert stats["p50_latency"] == 0.3
+
+
+def test_health_forgets_samples_outside_the_window():
+    health = ProviderHealth(window_seconds=0.05)
+    health.record(False, 0.1)
+    time.sleep(0.06)
+    assert health.snapshot()["requests"] == 0
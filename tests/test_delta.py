@@ -0,0 +1,87 @@
+import random
+
+from utils.delta import BloomFilter, DeltaTracker, SeenSet, SortedHashSet, query_key
+from utils.job_filters import JobFilter
+
+
+def _job(job_id, **fields):
+    job = {"title": "Data Analyst", "company": "Acme", "location": "Austin, TX", "job_id": job_id}
+    job.update(fields)
+    return job
+
+
+def test_first_search_is_all_new_and_repeats_are_not():
+    tracker = DeltaTracker()
+    jobs = [_job("1"), _job("2")]
+    assert [job["delta"] for job in tracker.delta("alice", "q", jobs)] == ["new", "new"]
+    assert tracker.delta("alice", "q", jobs) == []
+    assert tracker.seen_count("alice", "q") == 2
+
+
+def test_changed_content_is_reported_as_changed():
+    tracker = DeltaTracker()
+    tracker.delta("alice", "q", [_job("1")])
+    changes = tracker.delta("alice", "q", [_job("1", title="Senior Data Analyst"), _job("2")])
+    assert [(job["job_id"], job["delta"]) for job in changes] == [("1", "changed"), ("2", "new")]
+    # The relative posting date changes daily and does not count as a change
+    assert tracker.delta("alice", "q", [_job("2", date_posted="3 days ago")]) == []
+
+
+def test_seen_sets_are_per_owner_and_query():
+    tracker = DeltaTracker()
+    tracker.delta("alice", "q", [_job("1")])
+    assert len(tracker.delta("bob", "q", [_job("1")])) == 1
+    assert len(tracker.delta("alice", "other", [_job("1")])) == 1
+
+
+def test_remember_false_and_forget():
+    tracker = DeltaTracker()
+    tracker.delta("alice", "q", [_job("1")], remember=False)
+    assert tracker.seen_count("alice", "q") == 0
+    tracker.delta("alice", "q", [_job("1")])
+    tracker.forget("alice")
+    assert tracker.seen_count("alice", "q") == 0
+
+
+def test_least_recently_used_queries_are_dropped():
+    tracker = DeltaTracker(max_queries=2)
+    for key in ("a", "b", "c"):
+        tracker.delta("alice", key, [_job("1")])
+    assert tracker.seen_count("alice", "a") == 0
+    assert tracker.seen_count("alice", "c") == 1
+
+
+def test_sorted_hash_set():
+    values = SortedHashSet([5, 1, 3])
+    values.add_many([3, 2])
+    assert list(values) == [1, 2, 3, 5]
+    assert 2 in values and 4 not in values
+    assert values.size_bytes() == 4 * 8
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    rnd = random.Random(7)
+    added = [rnd.getrandbits(64) for _ in range(2000)]
+    bloom = BloomFilter(2000, error_rate=0.01)
+    bloom.add_many(added)
+    assert all(value in bloom for value in added)
+    false_positives = sum(rnd.getrandbits(64) in bloom for _ in range(20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_seen_set_switches_to_a_bloom_filter_when_it_grows():
+    seen = SeenSet(sorted_max=10)
+    seen.add_many(range(1, 11))
+    assert isinstance(seen._set, SortedHashSet)
+    seen.add_many(range(11, 20))
+    assert isinstance(seen._set, BloomFilter)
+    assert all(value in seen for value in range(1, 20))
+    assert len(seen) == 19
+
+
+def test_query_key_ignores_case_spacing_and_platform_order():
+    assert query_key("Data  Analyst", "Austin, TX", ["LinkedIn", "Indeed"], 7) == \
+        query_key("data analyst", "austin, tx", ["indeed", "linkedin"], 7)
+    assert query_key("Data Analyst", "Austin, TX", days_ago=7) != query_key("Data Analyst", "Austin, TX", days_ago=3)
+    assert query_key("Data Analyst", "Austin", job_filter=JobFilter(job_types=["Contract"])) != \
+        query_key("Data Analyst", "Austin")
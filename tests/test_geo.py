@@ -0,0 +1,79 @@
+import pytest
+
+from utils.geo import Gazetteer, gazetteer, haversine_km
+
+CSV = """name,aliases,region,region_code,country,country_code,lat,lon,population,metro
+Austin,,Texas,TX,United States,US,30.2672,-97.7431,974,Austin
+Round Rock,,Texas,TX,United States,US,30.5083,-97.6789,127,Austin
+San Antonio,,Texas,TX,United States,US,29.4241,-98.4936,1495,San Antonio
+Dallas,,Texas,TX,United States,US,32.7767,-96.7970,1300,Dallas-Fort Worth
+London,,England,ENG,United Kingdom,GB,51.5074,-0.1278,8982,Greater London
+"""
+
+
+@pytest.fixture
+def small(tmp_path):
+    path = tmp_path / "places.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return Gazetteer(str(path), cache_size=2)
+
+
+def _names(places, indices):
+    return [places.places[i].name for i in indices]
+
+
+@pytest.mark.parametrize("text, label", [
+    ("Austin, TX", "Austin, TX"),
+    ("Austin, TX 78701", "Austin, TX"),
+    ("austin texas", "Austin, TX"),
+    ("Greater London Area", "London, UK"),
+    ("London, United Kingdom", "London, UK"),
+    ("Bengaluru, Karnataka, India", "Bangalore, India"),
+    ("Zürich (Hybrid)", "Zurich, Switzerland"),
+    ("New York City, NY", "New York, NY"),
+])
+def test_lookup_normalizes_provider_strings(text, label):
+    assert gazetteer.lookup(text).label == label
+
+
+def test_qualifiers_pick_between_places_with_the_same_name():
+    assert gazetteer.lookup("Portland, ME").region == "Maine"
+    assert gazetteer.lookup("Portland, OR").region == "Oregon"
+    assert gazetteer.lookup("Birmingham, UK").country_code == "GB"
+    assert gazetteer.lookup("Birmingham, USA").country_code == "US"
+    # Without a qualifier the most populous place wins
+    assert gazetteer.lookup("Portland").region == "Oregon"
+
+
+@pytest.mark.parametrize("text", ["Remote", "", None, "Anywhere", "Atlantis, XX"])
+def test_unknown_locations_are_none(text):
+    assert gazetteer.lookup(text) is None
+
+
+def test_near_respects_the_distance_cutoff(small):
+    austin = small.lookup("Austin, TX")
+    round_rock = haversine_km(austin.lat, austin.lon, 30.5083, -97.6789)
+    san_antonio = haversine_km(austin.lat, austin.lon, 29.4241, -98.4936)
+    assert 25 < round_rock < 30 and 110 < san_antonio < 125
+
+    assert _names(small, small.near(austin, 1)) == ["Austin"]
+    assert _names(small, small.near(austin, round_rock - 0.5)) == ["Austin"]
+    assert _names(small, small.near(austin, round_rock + 0.5)) == ["Austin", "Round Rock"]
+    assert _names(small, small.near(austin, san_antonio + 0.5)) == ["Austin", "Round Rock", "San Antonio"]
+    assert len(small.near(austin, 25000)) == 5  # more than half the circumference covers the globe
+
+
+def test_distances_and_nearest(small):
+    austin = small.lookup("Austin, TX")
+    distances = small.distances_km(austin, small.near(austin, 400))
+    assert distances[0] == pytest.approx(0)
+    assert list(distances) == sorted(distances)
+    assert haversine_km(51.5074, -0.1278, 48.8566, 2.3522) == pytest.approx(344, abs=2)  # London to Paris
+    assert small.nearest(30.3, -97.7).name == "Austin"
+    assert small.nearest(51.0, 0.0).name == "London"
+
+
+def test_lookup_cache_is_bounded(small):
+    for text in ("Austin", "Dallas", "London", "Austin"):
+        small.lookup(text)
+    assert len(small._cache) == 2
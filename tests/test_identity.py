@@ -0,0 +1,31 @@
+from utils.identity import OwnerTokens
+
+
+def test_issued_token_round_trips(tmp_path):
+    tokens = OwnerTokens(secret_path=str(tmp_path / "secret"))
+    owner = tokens.new_owner()
+    assert tokens.owner(tokens.token(owner)) == owner
+
+
+def test_made_up_and_tampered_tokens_are_rejected(tmp_path):
+    tokens = OwnerTokens(secret_path=str(tmp_path / "secret"))
+    owner = tokens.new_owner()
+    signature = tokens.token(owner).rpartition(".")[2]
+    assert tokens.owner("alice") is None
+    assert tokens.owner(owner) is None
+    assert tokens.owner(f"alice.{signature}") is None
+    assert tokens.owner(None) is None
+
+
+def test_generated_secret_is_reused_after_restart(tmp_path):
+    path = str(tmp_path / "data" / "secret")
+    token = OwnerTokens(secret_path=path).token("owner")
+    assert OwnerTokens(secret_path=path).owner(token) == "owner"
+    assert OwnerTokens(secret="other", secret_path=path).owner(token) is None
+
+
+def test_malformed_and_non_ascii_tokens_are_rejected(tmp_path):
+    tokens = OwnerTokens(secret_path=str(tmp_path / "secret"))
+    token = tokens.token("owner")
+    for bad in ("abc.é", "é.é", "é", ".", "owner.", f"{token}é", "ünïcode." + token.rpartition(".")[2], ""):
+        assert tokens.owner(bad) is None
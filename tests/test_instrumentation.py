@@ -0,0 +1,140 @@
+import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.instrumentation import JsonLogExporter, MetricsRegistry, PrometheusServer
+
+
+def _counter(registry, name, **labels):
+    for counter in registry.snapshot()["counters"]:
+        if counter["name"] == name and counter["labels"] == {k: str(v) for k, v in labels.items()}:
+            return counter["value"]
+    return 0
+
+
+def _histogram(registry, name):
+    return next(h for h in registry.snapshot()["histograms"] if h["name"] == name)
+
+
+def test_counters_are_kept_per_label_set():
+    registry = MetricsRegistry()
+    registry.inc("requests_total", provider="a")
+    registry.inc("requests_total", 2, provider="a")
+    registry.inc("requests_total", provider="b")
+    assert _counter(registry, "requests_total", provider="a") == 3
+    assert _counter(registry, "requests_total", provider="b") == 1
+
+
+def test_counters_are_thread_safe():
+    registry = MetricsRegistry()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: [registry.inc("hits_total") for _ in range(1000)], range(8)))
+    assert _counter(registry, "hits_total") == 8000
+
+
+def test_histogram_buckets_values():
+    registry = MetricsRegistry()
+    for value in (0.001, 0.02, 0.02, 100):
+        registry.observe("latency_seconds", value)
+    histogram = _histogram(registry, "latency_seconds")
+    buckets = dict(histogram["buckets"])
+    assert histogram["count"] == 4
+    assert buckets[0.005] == 1 and buckets[0.025] == 2
+    assert sum(buckets.values()) == 3  # 100 s is above every bound, counted only in +Inf
+
+
+def test_span_times_the_block_and_counts_errors():
+    registry = MetricsRegistry()
+    with registry.span("parse", provider="x"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.span("parse", provider="x"):
+            raise ValueError("bad payload")
+    assert _histogram(registry, "parse_seconds")["count"] == 2
+    assert _counter(registry, "parse_errors_total", provider="x") == 1
+
+
+def test_trace_collects_spans_and_nested_traces():
+    registry = MetricsRegistry()
+    with registry.trace("search", keywords="python") as trace:
+        with registry.span("provider_call"):
+            pass
+        with registry.span("provider_call"):
+            pass
+        with registry.trace("inner") as inner:
+            assert inner is trace  # nested traces join the active one
+    totals = trace.stage_totals()
+    assert totals["provider_call"]["count"] == 2
+    assert totals["inner"]["count"] == 1
+    assert trace.duration_ms is not None
+    assert registry.last_trace is trace
+    # Trace labels stay on the trace, not on the histogram
+    assert _histogram(registry, "search_seconds")["labels"] == {}
+
+
+def test_spans_outside_a_trace_are_not_collected():
+    registry = MetricsRegistry()
+    with registry.trace("search") as trace:
+        pass
+    with registry.span("parse"):
+        pass
+    assert [span["name"] for span in trace.spans] == ["search"]
+
+
+def test_exporter_errors_do_not_break_the_span():
+    class Broken:
+        def export_span(self, name, duration_ms, labels):
+            raise RuntimeError("exporter down")
+
+        def export_trace(self, trace):
+            raise RuntimeError("exporter down")
+
+    registry = MetricsRegistry()
+    registry.add_exporter(Broken())
+    with registry.trace("search"):
+        with registry.span("parse"):
+            pass
+    assert _histogram(registry, "parse_seconds")["count"] == 1
+
+
+def test_json_log_exporter_writes_traces(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    registry = MetricsRegistry()
+    registry.add_exporter(JsonLogExporter(str(path), include_spans=True))
+    with registry.trace("search", keywords="python"):
+        with registry.span("parse"):
+            pass
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["type"] for record in records] == ["span", "span", "trace"]
+    assert records[-1]["labels"] == {"keywords": "python"}
+    assert [span["name"] for span in records[-1]["spans"]] == ["parse", "search"]
+
+
+def test_prometheus_text_format_and_endpoint():
+    registry = MetricsRegistry()
+    registry.inc("requests_total", provider='say "hi"')
+    registry.observe("latency_seconds", 0.02)
+    text = registry.render_prometheus()
+    assert 'requests_total{provider="say \\"hi\\""} 1' in text
+    assert 'latency_seconds_bucket{le="0.01"} 0' in text
+    assert 'latency_seconds_bucket{le="0.025"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+
+    server = PrometheusServer(registry, port=0).start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.read().decode("utf-8") == registry.render_prometheus()
+    finally:
+        server.stop()
+
+
+def test_reset_drops_metrics():
+    registry = MetricsRegistry()
+    registry.inc("requests_total")
+    with registry.trace("search"):
+        pass
+    registry.reset()
+    assert registry.snapshot() == {"counters": [], "histograms": []}
+    assert registry.last_trace is None
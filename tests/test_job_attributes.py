@@ -0,0 +1,129 @@
+import copy
+import math
+
+import pytest
+
+import utils.parallel
+from utils.job_attributes import (
+    EXTRACTED_FIELDS, annual_salary, extract_all, extract_attributes, extract_skills, format_salary,
+    parse_min_years, parse_salary
+)
+from utils.parallel import ProcessPool
+
+
+def _job(**fields):
+    job = {"title": "Software Engineer", "location": "Austin, TX", "job_type": "Full-time", "description": ""}
+    job.update(fields)
+    return job
+
+
+def test_parse_salary_ranges_and_rates():
+    assert parse_salary("120K–150K a year") == (120000, 150000, None, "year")
+    assert parse_salary("$50 an hour") == (50, 50, "USD", "hour")
+    assert parse_salary("£40,000 - £45,000") == (40000, 45000, "GBP", "year")
+    assert parse_salary("₹12 lakh per annum") == (1200000, 1200000, "INR", "year")
+
+
+def test_parse_salary_rejects_text_without_pay():
+    assert parse_salary("") is None
+    assert parse_salary("Competitive benefits") is None
+
+
+def test_parse_salary_uses_default_currency():
+    assert parse_salary("80K a year", default_currency="EUR")[2] == "EUR"
+
+
+def test_parse_min_years():
+    assert parse_min_years("3+ years of Python, 5 years overall") == 3
+    assert parse_min_years("2-4 yrs experience") == 2
+    assert math.isnan(parse_min_years("No experience needed"))
+    assert math.isnan(parse_min_years("Serving customers for 45 years"))
+
+
+def test_extract_attributes_from_title_and_description():
+    job = extract_attributes(_job(
+        title="Senior Data Engineer",
+        job_type="Not Specified",
+        description="Fully remote contract role. 4+ years with Python and SQL, AWS a plus. $60-$70 an hour.",
+    ))
+    assert job["seniority"] == "senior"
+    assert job["work_mode"] == "remote"
+    assert job["min_years"] == 4
+    assert job["job_type"] == "Contract"
+    assert (job["salary_min"], job["salary_max"], job["salary_currency"], job["salary_period"]) == (
+        60, 70, "USD", "hour")
+    assert job["skills"][:3] == ["Python", "SQL", "AWS"]
+
+
+def test_most_senior_title_word_wins():
+    assert extract_attributes(_job(title="Associate Director, Engineering"))["seniority"] == "director"
+
+
+def test_seniority_falls_back_to_years_required():
+    assert extract_attributes(_job(description="1 year of experience"))["seniority"] == "junior"
+    assert extract_attributes(_job(description="3 years of experience"))["seniority"] == "mid"
+    assert extract_attributes(_job(description="8 years of experience"))["seniority"] == "senior"
+    assert extract_attributes(_job())["seniority"] is None
+
+
+def test_extract_attributes_keeps_a_known_job_type():
+    assert extract_attributes(_job(description="Contract to hire"))["job_type"] == "Full-time"
+
+
+def test_extensions_take_precedence():
+    job = extract_attributes(_job(description="Pays $40 an hour"),
+                             {"salary": "100K–120K a year", "work_from_home": True})
+    assert (job["salary_min"], job["salary_max"], job["salary_period"]) == (100000, 120000, "year")
+    assert job["work_mode"] == "remote"
+
+
+def test_anywhere_location_is_remote():
+    assert extract_attributes(_job(location="Anywhere"))["work_mode"] == "remote"
+
+
+def test_annual_salary_and_format():
+    hourly = {"salary_min": 50, "salary_max": 60, "salary_currency": "USD", "salary_period": "hour"}
+    yearly = {"salary_min": 120000, "salary_max": 150000, "salary_currency": "USD", "salary_period": "year"}
+    assert annual_salary(hourly) == 60 * 2080
+    assert annual_salary(hourly, "salary_min") == 50 * 2080
+    assert annual_salary({"salary_max": None}) is None
+    assert format_salary(yearly) == "$120K–150K/yr"
+    assert format_salary(hourly) == "$50–60/hr"
+    assert format_salary({}) == ""
+
+
+def test_extract_skills():
+    assert extract_skills("Skills: python, Machine Learning, SQL, python") == ["Python", "Machine Learning", "SQL"]
+    assert extract_skills(None) == []
+
+
+JOBS = [
+    _job(title="Junior Python Developer", description="Hybrid, 1 year of Django", job_type=""),
+    _job(title="Staff Engineer", description="10+ years. Kubernetes, Go. 180K-220K"),
+    _job(title="Intern", description="Summer internship, on-site"),
+]
+EXTENSIONS = [None, {"salary": "$90 an hour"}, {"work_from_home": True}]
+
+
+def test_extract_all_matches_extract_attributes():
+    expected = [extract_attributes(copy.deepcopy(job), ext) for job, ext in zip(JOBS, EXTENSIONS)]
+    assert extract_all(copy.deepcopy(JOBS), EXTENSIONS) == expected
+
+
+def test_extract_all_in_worker_processes(monkeypatch):
+    pool = ProcessPool(max_workers=2, min_batch=1, chunk_size=2)
+    monkeypatch.setattr(utils.parallel, "process_pool", pool)
+    try:
+        jobs = extract_all(copy.deepcopy(JOBS), EXTENSIONS)
+    finally:
+        pool.shutdown()
+    expected = [extract_attributes(copy.deepcopy(job), ext) for job, ext in zip(JOBS, EXTENSIONS)]
+    for job, want in zip(jobs, expected):
+        assert {field: job[field] for field in EXTRACTED_FIELDS + ("job_type",)} == \
+               {field: want[field] for field in EXTRACTED_FIELDS + ("job_type",)}
+
+
+@pytest.mark.parametrize("text", ["$5", "a $3 coupon"])
+def test_lone_small_amounts_are_not_pay(text):
+    job = extract_attributes(_job(description=text))
+    assert job["salary_min"] is None
@@ -0,0 +1,125 @@
+import math
+
+import pytest
+
+from utils.job_filters import (
+    EXPERIENCE, JOB_TYPE, PLATFORM, RECENCY, SALARY, JobFilter, JobTable, canonical_platform, dedupe_jobs,
+    filter_jobs, parse_age_days
+)
+
+
+def _job(**fields):
+    job = {"title": "Software Engineer", "company": "Acme", "location": "Austin, TX", "platform": "LinkedIn"}
+    job.update(fields)
+    return job
+
+
+def test_dedupe_keeps_openings_with_different_job_ids():
+    jobs = [_job(job_id="1"), _job(job_id="2"), _job(job_id="1")]
+    assert [job["job_id"] for job in dedupe_jobs(jobs)] == ["1", "2"]
+
+
+def test_dedupe_matches_rows_without_job_id_on_canonical_fields():
+    jobs = [
+        _job(),
+        _job(title="software  engineer", company="Acme LLC", location="Austin, Texas", platform="via LinkedIn"),
+        _job(location="Dallas, TX"),
+        _job(platform="Indeed"),
+    ]
+    assert [(job["location"], job["platform"]) for job in dedupe_jobs(jobs)] == [
+        ("Austin, TX", "LinkedIn"), ("Dallas, TX", "LinkedIn"), ("Austin, TX", "Indeed"),
+    ]
+
+
+def test_dedupe_compares_unknown_locations_as_written():
+    jobs = [_job(location="Nowhere Town"), _job(location="Elsewhere Village"), _job(location="Nowhere Town")]
+    assert len(dedupe_jobs(jobs)) == 2
+
+
+def test_active_predicates():
+    assert JobFilter().active() == []
+    assert JobFilter(experience="1-3").active() == [EXPERIENCE]
+    assert JobFilter(experience="10+").active() == []  # no upper bound
+    assert JobFilter(platforms=["Indeed"], max_age_days=7, near="Austin, TX").active() == [PLATFORM, RECENCY]
+
+
+def test_pushdown_splits_native_and_local_predicates():
+    job_filter = JobFilter(platforms=["Indeed"], job_types=["Full-time"], max_age_days=7, min_salary=50000)
+    pushed, residual = job_filter.pushdown([PLATFORM, JOB_TYPE, RECENCY])
+    assert pushed.active() == [PLATFORM, JOB_TYPE, RECENCY]
+    assert residual.active() == [SALARY]
+    assert pushed.employment_types() == ["FULLTIME"]
+
+
+def test_job_type_stays_local_unless_every_type_is_native():
+    pushed, residual = JobFilter(job_types=["Full-time", "Remote"]).pushdown([JOB_TYPE])
+    assert pushed.active() == []
+    assert residual.job_types == ["Full-time", "Remote"]
+
+
+def test_company_order_with_companies_not_seen_before():
+    # Names no other test interns, so the first sort has to add them to the company table
+    names = ["Zeta Order Test Ltd", "alpha order test inc", "Mu Order Test"]
+    table = JobTable([_job(company=name) for name in names])
+    assert [names[i] for i in table.order_by_company()] == [names[1], names[2], names[0]]
+
+
+JOBS = [
+    _job(job_id="linkedin", job_type="Full-time", date_posted="2 days ago", min_years=2, salary_max=120000,
+         salary_period="year", seniority="mid", work_mode="onsite", skills=["Python", "SQL"]),
+    _job(job_id="indeed", platform="via Indeed", job_type="Contract", date_posted="3 weeks ago", min_years=7,
+         salary_max=40, salary_period="hour", seniority="senior", work_mode="remote", skills=["Java"],
+         location="Remote"),
+    _job(job_id="unknown", platform="Glassdoor", job_type="Not Specified", date_posted="Recent", location="Dallas, TX"),
+]
+
+
+def _ids(job_filter):
+    return [job["job_id"] for job in filter_jobs(JOBS, job_filter)]
+
+
+def test_platform_and_job_type():
+    assert _ids(JobFilter(platforms=["Indeed"])) == ["indeed"]
+    # Unknown job types pass; "Remote" matches remote work
+    assert _ids(JobFilter(job_types=["Full-time"])) == ["linkedin", "unknown"]
+    assert _ids(JobFilter(job_types=["Remote"])) == ["indeed", "unknown"]
+
+
+def test_recency_and_experience_let_unknown_values_through():
+    assert _ids(JobFilter(max_age_days=7)) == ["linkedin", "unknown"]
+    assert _ids(JobFilter(experience="1-3")) == ["linkedin", "unknown"]
+
+
+def test_salary_is_compared_as_yearly_amount():
+    # $40/hour is 83,200 a year
+    assert _ids(JobFilter(min_salary=80000)) == ["linkedin", "indeed", "unknown"]
+    assert _ids(JobFilter(min_salary=100000)) == ["linkedin", "unknown"]
+
+
+def test_seniority_work_mode_and_skills():
+    assert _ids(JobFilter(seniority=["senior"])) == ["indeed", "unknown"]
+    assert _ids(JobFilter(work_modes=["remote"])) == ["indeed"]
+    assert _ids(JobFilter(skills=["sql", "Go"])) == ["linkedin"]
+
+
+def test_locations_and_radius():
+    assert _ids(JobFilter(locations=["Dallas, TX"])) == ["unknown"]
+    assert _ids(JobFilter(locations=["Remote"])) == ["indeed"]
+    assert _ids(JobFilter(near="Austin, TX", radius_km=50)) == ["linkedin"]
+    assert _ids(JobFilter(near="Austin, TX", radius_km=400)) == ["linkedin", "unknown"]
+
+
+def test_table_orderings():
+    table = JobTable(JOBS)
+    assert [JOBS[i]["job_id"] for i in table.order_by_age()] == ["linkedin", "indeed", "unknown"]
+    assert [JOBS[i]["job_id"] for i in table.order_by_salary()] == ["linkedin", "indeed", "unknown"]
+
+
+def test_parse_age_days_and_platform_names():
+    assert parse_age_days("3 days ago") == 3
+    assert parse_age_days("2 weeks ago") == 14
+    assert parse_age_days("5 hours ago") == pytest.approx(5 / 24.0)
+    assert parse_age_days("Just posted") == 0
+    assert math.isnan(parse_age_days("Recent"))
+    assert canonical_platform("via LinkedIn") == "linkedin"
+    assert canonical_platform("Company Site") == "company site"
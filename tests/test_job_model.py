@@ -0,0 +1,96 @@
+from utils.job_model import (
+    JobDetailStore, job_content_hash, job_fingerprint, load_job_details, summarize_job, summarize_jobs
+)
+
+
+def _job(**fields):
+    job = {
+        "title": "Data Analyst", "company": "Acme Inc.", "location": "Austin, TX", "platform": "LinkedIn",
+        "job_type": "Full-time", "apply_url": "https://example.com/1", "description": "Analyse data with SQL.",
+    }
+    job.update(fields)
+    return job
+
+
+class FakeProvider:
+    def __init__(self, details=None):
+        self.details = details
+        self.calls = []
+
+    def get_job_details(self, job_id):
+        self.calls.append(job_id)
+        return self.details
+
+
+def test_fingerprint_prefers_the_provider_job_id():
+    assert job_fingerprint(_job(job_id="abc")) == job_fingerprint(_job(job_id="abc", title="Other"))
+    assert job_fingerprint(_job(job_id="abc")) != job_fingerprint(_job(job_id="xyz"))
+
+
+def test_fingerprint_normalizes_text_and_company():
+    assert job_fingerprint(_job()) == job_fingerprint(_job(title="  data   ANALYST", company="ACME"))
+    assert job_fingerprint(_job()) != job_fingerprint(_job(platform="Indeed"))
+
+
+def test_content_hash_ignores_whitespace_and_date_posted():
+    job = _job(date_posted="1 day ago")
+    assert job_content_hash(job) == job_content_hash(_job(date_posted="2 days ago", description=" Analyse  data with SQL."))
+    assert job_content_hash(job) != job_content_hash(_job(description="Analyse data with Python."))
+
+
+def test_summary_drops_details_into_the_store():
+    store = JobDetailStore()
+    summary = summarize_job(_job(), store)
+    assert "description" not in summary
+    assert summary["has_description"] is True
+    assert store.get(summary["job_key"]) == {"description": "Analyse data with SQL."}
+
+
+def test_summary_of_a_summary_keeps_its_key_and_flag():
+    store = JobDetailStore()
+    summary = summarize_job(_job(), store)
+    again = summarize_job(dict(summary, title="Renamed"), store)
+    assert again["job_key"] == summary["job_key"]
+    assert again["has_description"] is True
+
+
+def test_summarize_jobs_returns_the_split_off_details():
+    store = JobDetailStore()
+    summaries, details = summarize_jobs([_job(job_id="1"), _job(job_id="2", description="")], store)
+    assert [summary["has_description"] for summary in summaries] == [True, False]
+    assert details == {summaries[0]["job_key"]: {"description": "Analyse data with SQL."},
+                       summaries[1]["job_key"]: {"description": ""}}
+
+
+def test_detail_store_is_a_bounded_lru():
+    store = JobDetailStore(max_entries=2)
+    store.put("a", {"description": "a"})
+    store.put("b", {"description": "b"})
+    store.get("a")
+    store.put("c", {"description": "c"})
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") == {"description": "a"}
+
+
+def test_load_job_details_from_the_store_first():
+    store = JobDetailStore()
+    provider = FakeProvider({"description": "from provider"})
+    summary = summarize_job(_job(job_id="1"), store)
+    assert load_job_details(summary, provider, store) == {"description": "Analyse data with SQL."}
+    assert provider.calls == []
+
+
+def test_load_job_details_fetches_a_miss_by_job_id_and_caches_it():
+    store = JobDetailStore()
+    provider = FakeProvider({"description": "from provider"})
+    summary = summarize_job(_job(job_id="1"), JobDetailStore())
+    assert load_job_details(summary, provider, store) == {"description": "from provider"}
+    assert load_job_details(summary, provider, store) == {"description": "from provider"}
+    assert provider.calls == ["1"]
+
+
+def test_load_job_details_without_a_source_is_empty():
+    summary = summarize_job(_job(), JobDetailStore())
+    assert load_job_details(summary, FakeProvider({"description": "x"}), JobDetailStore()) == {}  # no job_id
+    assert load_job_details(summary, FakeProvider(None), JobDetailStore()) == {}
@@ -0,0 +1,22 @@
+from utils import job_scraper
+from utils.job_scraper import JobScraper
+
+
+def test_search_returns_annotated_fallback_jobs():
+    jobs = JobScraper(verify_urls=False).search_jobs("python developer", "Austin, TX", platform="Indeed", count=3)
+    assert len(jobs) == 3
+    assert all("seniority" in job and job["company_id"] is not None for job in jobs)
+
+
+def test_extraction_failure_keeps_the_jobs(monkeypatch):
+    def broken(jobs, extensions=None):
+        raise RuntimeError("process pool is broken")
+
+    monkeypatch.setattr(job_scraper, "extract_all", broken)
+    jobs = JobScraper(verify_urls=False).search_jobs("python developer", "Austin, TX", platform="Indeed", count=3)
+    assert len(jobs) == 3
+    assert all("seniority" not in job for job in jobs)
+
+
+def test_unsupported_platform():
+    assert JobScraper(verify_urls=False).search_jobs("python", "Austin, TX", platform="Dice") == []
@@ -0,0 +1,129 @@
+import json
+import time
+
+import pytest
+
+from agents.job_search_agent import MATCH_ANALYSIS_SCHEMA, JobSearchAgent
+from utils.llm import LLMBackend, LocalLLMBackend, estimate_tokens, get_llm_backend, register_backend
+
+RESUME = {"skills": ["Python", "SQL"], "experience": ["Built dashboards in Tableau"]}
+JOB = {"title": "Data Analyst", "company": "Acme", "description": "SQL and Python reporting, Tableau dashboards."}
+
+
+class ScriptedBackend(LLMBackend):
+    """Streams fixed chunks, optionally failing after them."""
+
+    name = "scripted"
+    model = "scripted"
+
+    def __init__(self, chunks, error=None, available=True):
+        self.chunks = chunks
+        self.error = error
+        self.available = available
+
+    def is_available(self):
+        return self.available
+
+    def stream(self, prompt, schema=None):
+        yield from self.chunks
+        if self.error:
+            raise self.error
+
+
+def _agent(llm):
+    agent = JobSearchAgent()
+    agent.llm = llm
+    return agent
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_local_backend_is_deterministic_and_follows_the_schema():
+    llm = LocalLLMBackend(latency_ms=0, tokens_per_second=0)
+    prompt = "Rate the match.\n=== JOB ===\nSQL reporting\nPython dashboards\n"
+    first = llm.generate(prompt, MATCH_ANALYSIS_SCHEMA)
+    assert first == llm.generate(prompt, MATCH_ANALYSIS_SCHEMA)
+    assert first != llm.generate(prompt + "Tableau\n", MATCH_ANALYSIS_SCHEMA)
+
+    analysis = json.loads(first)
+    assert set(analysis) == set(MATCH_ANALYSIS_SCHEMA["properties"])
+    assert 0 <= analysis["match_score"] <= 100
+    assert 2 <= len(analysis["key_matches"]) <= 4
+    # Phrases come from the content after the first section marker, not the instructions
+    assert set(analysis["gaps"]) <= {"SQL reporting", "Python dashboards"}
+
+
+def test_local_backend_free_text_and_token_counts():
+    llm = LocalLLMBackend(latency_ms=0, tokens_per_second=0)
+    text = llm.generate("one line here\nanother line\n")
+    assert text and set(text.split()) <= {"one", "line", "here", "another"}
+    assert llm.calls == 1
+    assert llm.output_tokens == estimate_tokens(text)
+    assert llm.generate("") == "n/a"
+
+
+def test_local_backend_streams_in_chunks_after_the_latency():
+    llm = LocalLLMBackend(latency_ms=50, tokens_per_second=400, chunk_tokens=2)
+    text = llm.respond("x\n=== JOB ===\nsome phrase to stream\n", MATCH_ANALYSIS_SCHEMA)
+    start = time.perf_counter()
+    chunks = list(llm.stream("x\n=== JOB ===\nsome phrase to stream\n", MATCH_ANALYSIS_SCHEMA))
+    elapsed = time.perf_counter() - start
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    # 50 ms to the first chunk, then 2 tokens at 400 tokens/s = 5 ms per further chunk
+    assert elapsed >= 0.05 + (len(chunks) - 1) * 0.005 * 0.9
+
+
+def test_backends_are_registered_and_shared():
+    register_backend("scripted-test", lambda: ScriptedBackend(["{}"]))
+    backend = get_llm_backend("scripted-test")
+    assert get_llm_backend("scripted-test") is backend
+    register_backend("scripted-test", lambda: ScriptedBackend(["{}"]))
+    assert get_llm_backend("scripted-test") is not backend
+    with pytest.raises(KeyError):
+        get_llm_backend("missing")
+
+
+def test_stream_yields_partial_analyses_then_the_complete_one():
+    text = json.dumps({"match_score": 80, "key_matches": ["Python", "SQL"], "gaps": ["Airflow"],
+                       "recommendations": ["Learn Airflow"]})
+    chunks = [text[i:i + 10] for i in range(0, len(text), 10)]
+    analyses = list(_agent(ScriptedBackend(chunks)).stream_job_match_analysis(RESUME, JOB))
+    assert len(analyses) > 2
+    assert analyses[0].get("match_score") in (None, 80)
+    assert any(analysis.get("match_score") == 80 and "recommendations" not in analysis for analysis in analyses)
+    assert analyses[-1] == json.loads(text)
+    assert _agent(ScriptedBackend(chunks)).get_job_match_analysis(RESUME, JOB) == json.loads(text)
+
+
+def test_truncated_response_is_completed_from_the_local_analysis():
+    chunks = ['{"match_score": 65, "key_matches": ["Python"], "gaps": ["Air']
+    analyses = list(_agent(ScriptedBackend(chunks)).stream_job_match_analysis(RESUME, JOB))
+    final = analyses[-1]
+    assert final["match_score"] == 65
+    assert final["key_matches"] == ["Python"]
+    assert set(final) == set(MATCH_ANALYSIS_SCHEMA["required"])
+    assert isinstance(final["recommendations"], list)
+
+
+def test_unavailable_or_failing_backend_falls_back_to_the_local_analysis():
+    analyses = list(_agent(ScriptedBackend([], available=False)).stream_job_match_analysis(RESUME, JOB))
+    assert len(analyses) == 1
+    assert set(MATCH_ANALYSIS_SCHEMA["required"]) <= set(analyses[0])
+
+    failing = ScriptedBackend(['{"match_score": 9'], error=RuntimeError("connection reset"))
+    final = list(_agent(failing).stream_job_match_analysis(RESUME, JOB))[-1]
+    assert set(MATCH_ANALYSIS_SCHEMA["required"]) <= set(final)
+    assert "Python" in final["key_matches"]
+
+
+def test_local_backend_answers_the_agent_end_to_end():
+    agent = _agent(LocalLLMBackend(latency_ms=0, tokens_per_second=0))
+    first = agent.get_job_match_analysis(RESUME, JOB)
+    assert first == agent.get_job_match_analysis(RESUME, JOB)
+    assert set(first) == set(MATCH_ANALYSIS_SCHEMA["required"])
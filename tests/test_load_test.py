@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.load_test import parse_args, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _report(worker, steps, flows=2, failed_flows=0, errors=()):
+    return {
+        "worker": worker, "sessions": 1, "flows": flows, "failed_flows": failed_flows, "steps": steps,
+        "errors": list(errors), "wall_seconds": 2.0, "cpu_seconds": 1.0, "cpu_percent": 50.0,
+        "peak_rss_mb": 150.0, "mean_rss_mb": 120.0,
+    }
+
+
+def test_summary_combines_workers_per_step():
+    reports = [
+        _report(1, [("search", 0.2, True), ("sort", 0.01, True)]),
+        _report(0, [("search", 0.4, False), ("search", 0.3, True)], failed_flows=1, errors=["search: boom"]),
+    ]
+    summary = summarize(reports, wall_seconds=2.0)
+    assert summary["workers"] == 2 and summary["sessions"] == 2
+    assert summary["flows"] == 4 and summary["failed_flows"] == 1
+    assert summary["flows_per_sec"] == 2.0
+    assert summary["steps_per_sec"] == 2.0
+    assert summary["steps"]["search"]["count"] == 3
+    assert summary["steps"]["search"]["errors"] == 1
+    assert summary["steps"]["search"]["p50_ms"] == pytest.approx(300.0)
+    assert summary["steps"]["sort"]["p99_ms"] == pytest.approx(10.0)
+    assert [worker["worker"] for worker in summary["worker_stats"]] == [0, 1]
+    assert summary["errors"] == ["search: boom"]
+
+
+def test_summary_of_an_empty_run():
+    summary = summarize([], wall_seconds=0)
+    assert summary["flows"] == 0 and summary["flows_per_sec"] == 0.0 and summary["steps"] == {}
+
+
+def test_arguments_have_working_defaults():
+    args = parse_args([])
+    assert args.workers == 1 and args.sessions >= args.workers
+    assert parse_args(["--skip-analysis", "--error-rate", "0.1"]).error_rate == 0.1
+
+
+def test_load_test_runs_sessions_end_to_end(tmp_path):
+    pytest.importorskip("streamlit.testing.v1")
+    output = tmp_path / "load.json"
+    # Run as from the command line: spawned workers re-import the parent's __main__,
+    # which AppTest in this process may have left pointing at app.py
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.load_test", "--sessions", "2", "--rounds", "1", "--latency-ms", "0",
+         "--jitter-ms", "0", "--llm-latency-ms", "0", "--llm-tokens-per-second", "0", "--output", str(output)],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    summary = json.loads(output.read_text())["summary"]
+    assert completed.returncode == 0, summary["errors"]
+    assert summary["flows"] == 2 and summary["failed_flows"] == 0
+    assert {"open", "search", "sort", "select", "analyze"} <= set(summary["steps"])
+    assert summary["steps"]["sort"]["count"] == 10  # every sort option, in both sessions
+    assert summary["upstream_requests"] > 0
+    assert "flows/s" in completed.stdout
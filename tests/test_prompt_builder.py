@@ -0,0 +1,81 @@
+from utils.prompt_builder import _compact_resume, build_match_prompt, compact_resume, requirement_sentences
+
+RESUME = {
+    "skills": ["Python", "python ", "  SQL", "Docker"],
+    "experience": ["• Built ETL pipelines in   Airflow", "Built ETL pipelines in Airflow", "Led a team of 4 on Kubernetes"],
+    "education": ["BSc Computer Science"],
+    "summary": "Data engineer who also runs Spark jobs.",
+}
+
+DESCRIPTION = """About us
+Acme is a fast-growing company on a mission to make data simple.
+Requirements
+- 5+ years of experience with Python and SQL.
+- Strong knowledge of Kubernetes is required.
+- Familiarity with Terraform is a plus.
+We offer great benefits, 401(k) and paid time off.
+Acme is an equal opportunity employer."""
+
+
+def test_compact_resume_dedupes_and_adds_skills_from_text():
+    skills, experience, education = compact_resume(RESUME)
+    assert skills[:3] == ("Python", "SQL", "Docker")
+    assert "Airflow" in skills and "Kubernetes" in skills and "Spark" in skills
+    assert experience == ("Built ETL pipelines in Airflow", "Led a team of 4 on Kubernetes")
+    assert education == ("BSc Computer Science",)
+
+
+def test_compact_resume_is_memoized_per_resume():
+    _compact_resume.cache_clear()
+    compact_resume(RESUME)
+    compact_resume(dict(reversed(list(RESUME.items()))))  # same resume, other key order
+    info = _compact_resume.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_requirement_sentences_drop_boilerplate_and_headings():
+    sentences = [sentence for _, sentence in requirement_sentences(DESCRIPTION)]
+    assert sentences[0] == "Acme is a fast-growing company on a mission to make data simple."
+    assert "5+ years of experience with Python and SQL." in sentences
+    assert not any("benefits" in sentence or "equal opportunity" in sentence for sentence in sentences)
+    assert "Requirements" not in sentences
+
+
+def test_requirement_sentences_score_skills_and_years():
+    scores = dict((sentence, score) for score, sentence in requirement_sentences(DESCRIPTION))
+    assert scores["Acme is a fast-growing company on a mission to make data simple."] == 0
+    assert scores["5+ years of experience with Python and SQL."] > scores["Familiarity with Terraform is a plus."]
+
+
+def test_prompt_keeps_requirements_and_leaves_out_the_blurb():
+    prompt = build_match_prompt(RESUME, {"title": "Data Engineer", "description": DESCRIPTION})
+    assert not prompt.trimmed
+    assert "Title: Data Engineer" in prompt.text
+    assert "- Strong knowledge of Kubernetes is required." in prompt.text
+    assert "fast-growing" not in prompt.text
+    assert "401(k)" not in prompt.text
+    assert prompt.total_tokens <= prompt.budget
+
+
+def test_prompt_stays_within_budget_and_reports_trimming():
+    resume = dict(RESUME, experience=[f"Shipped project number {i} with Python and SQL" for i in range(200)])
+    description = "\n".join(f"Requirement {i}: experience with Python and SQL is required." for i in range(200))
+    prompt = build_match_prompt(resume, {"title": "Data Engineer", "description": description}, budget=400)
+    assert prompt.trimmed
+    assert prompt.total_tokens <= 400
+    # Both sides keep something
+    assert "Skills: Python" in prompt.text
+    assert "- Requirement 0: experience" in prompt.text
+
+
+def test_description_without_requirement_cues_is_sent_as_is():
+    description = "Greet visitors at the front desk. Answer phone calls. Sort the daily mail."
+    prompt = build_match_prompt(RESUME, {"title": "Receptionist", "description": description})
+    for sentence in ("Greet visitors at the front desk.", "Answer phone calls.", "Sort the daily mail."):
+        assert f"- {sentence}" in prompt.text
+
+
+def test_empty_inputs():
+    prompt = build_match_prompt({}, {})
+    assert "(empty)" in prompt.text and "(no description)" in prompt.text
+    assert not prompt.trimmed
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from utils.http import get_session
+from utils.providers import ProviderRegistry
+from utils.rate_limiter import CallQuota, TokenBucket
+from utils.result_cache import ResultCache
+
+
+def test_registry_builds_each_backend_once():
+    built = []
+    registry = ProviderRegistry()
+    registry.register("fake", lambda: built.append(object()) or built[-1])
+    assert registry.get("fake") is registry.get("fake")
+    assert len(built) == 1
+
+    registry.reset("fake")
+    assert registry.get("fake") is built[1]
+
+
+def test_registry_reregistering_replaces_the_instance():
+    registry = ProviderRegistry()
+    registry.register("fake", lambda: "old")
+    assert registry.get("fake") == "old"
+    registry.register("fake", lambda: "new")
+    assert registry.get("fake") == "new"
+
+
+def test_registry_set_and_unknown_names():
+    registry = ProviderRegistry()
+    instance = object()
+    registry.set("test", instance)
+    assert registry.get("test") is instance
+    assert registry.names() == ["test"]
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_sessions_are_shared_per_backend():
+    assert get_session("test-backend") is get_session("test-backend")
+    assert get_session("test-backend") is not get_session("other-backend")
+
+
+def test_token_bucket_allows_a_burst_then_refills():
+    bucket = TokenBucket(rate=50, burst=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    time.sleep(0.05)
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_acquire_waits_or_times_out():
+    bucket = TokenBucket(rate=20, burst=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.01)
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - start < 0.5
+
+
+def test_call_quota():
+    quota = CallQuota(2, period_seconds=0.05)
+    assert quota.consume() and quota.consume()
+    assert not quota.consume()
+    assert quota.remaining() == 0
+    time.sleep(0.06)
+    assert quota.remaining() == 2
+    assert CallQuota(None).remaining() is None
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache("test", ttl=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_result_cache_serves_stale_entries_within_the_stale_window():
+    cache = ResultCache("test", ttl=0.02, stale_ttl=0.05)
+    cache.put("key", "value")
+    assert cache.lookup("key")[:2] == ("value", True)
+    time.sleep(0.03)
+    assert cache.lookup("key")[:2] == ("value", False)
+    assert cache.get("key") is None
+    assert cache.is_servable("key") and not cache.is_fresh("key")
+    time.sleep(0.05)
+    assert cache.lookup("key") is None
+
+
+def test_result_cache_with_zero_ttl_stores_nothing():
+    cache = ResultCache("test", ttl=0)
+    cache.put("key", "value")
+    assert len(cache) == 0
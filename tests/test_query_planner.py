@@ -0,0 +1,75 @@
+from tests.fakes import FakeProvider
+from utils.query_planner import QueryPlanner
+
+
+def _plan(providers, platforms=("LinkedIn",), count=5, planner=None):
+    planner = planner or QueryPlanner(max_pages=3)
+    return planner.plan(providers, "Data Analyst", "Austin, TX", list(platforms), count)
+
+
+def test_unavailable_expensive_and_exhausted_providers_are_skipped():
+    providers = [
+        FakeProvider("down", available=False),
+        FakeProvider("pricey", cost_per_call=5.0),
+        FakeProvider("spent", quota=0),
+        FakeProvider("ok"),
+    ]
+    plan = _plan(providers, planner=QueryPlanner(max_cost_per_call=2.0))
+    assert plan.skipped == {"down": "circuit open", "pricey": "cost", "spent": "quota"}
+    assert [call.provider.name for call in plan.primary] == ["ok"]
+
+
+def test_cheapest_provider_first_and_stop_once_count_is_covered():
+    cheap = FakeProvider("cheap", cost_per_call=0.5, results_per_page=10)
+    dear = FakeProvider("dear", cost_per_call=2.0, results_per_page=10)
+    plan = _plan([dear, cheap])
+    assert [call.provider.name for call in plan.primary] == ["cheap"]
+    assert plan.expected_cost == 0.5
+
+
+def test_more_providers_are_added_while_count_is_not_covered():
+    plan = _plan([FakeProvider("a", results_per_page=3), FakeProvider("b", cost_per_call=2.0, results_per_page=3)])
+    assert [call.provider.name for call in plan.primary] == ["a", "b"]
+
+
+def test_pages_follow_the_observed_hit_rate_within_limits():
+    planner = QueryPlanner(max_pages=3)
+    provider = FakeProvider("paged", supports_paging=True, results_per_page=10)
+    assert _plan([provider], count=10, planner=planner).primary[0].pages == 1
+
+    # Only 2 of every 10 listings matched LinkedIn last time: 20 wanted needs 10 pages, capped at 3
+    planner.record("paged", "LinkedIn", pages=1, results_per_page=10, jobs_returned=2, count=20)
+    assert planner.hit_rate("paged", "LinkedIn") == 0.2
+    assert _plan([provider], count=20, planner=planner).primary[0].pages == 3
+
+    provider.quota = 2
+    assert _plan([provider], count=20, planner=planner).primary[0].pages == 2
+
+
+def test_hit_rate_is_smoothed():
+    planner = QueryPlanner(smoothing=0.5)
+    planner.record("p", "LinkedIn", pages=1, results_per_page=10, jobs_returned=2, count=20)
+    planner.record("p", "LinkedIn", pages=1, results_per_page=10, jobs_returned=6, count=20)
+    assert planner.hit_rate("p", "LinkedIn") == 0.4
+    assert planner.hit_rate("p", "Indeed") == 1.0
+
+
+def test_cached_queries_cost_nothing_and_cover_the_count():
+    cached = FakeProvider("cached", cached=True, cost_per_call=1.0)
+    other = FakeProvider("other", cost_per_call=2.0)
+    plan = _plan([cached, other])
+    assert [(call.provider.name, call.cached) for call in plan.primary] == [("cached", True)]
+    assert plan.expected_cost == 0
+
+
+def test_quota_is_shared_across_platforms():
+    provider = FakeProvider("limited", quota=1, results_per_page=10)
+    plan = _plan([provider], platforms=("LinkedIn", "Indeed"))
+    assert [call.platform for call in plan.primary] == ["LinkedIn"]
+    assert plan.skipped == {"limited": "quota"}
+
+
+def test_fallback_providers_are_planned_separately():
+    plan = _plan([FakeProvider("real"), FakeProvider("placeholder", fallback_only=True)], platforms=("A", "B"))
+    assert [call.provider.name for call in plan.primary] == ["real", "real"]
+    assert [(call.provider.name, call.platform) for call in plan.fallback] == [("placeholder", "A"), ("placeholder", "B")]
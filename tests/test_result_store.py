@@ -0,0 +1,89 @@
+import os
+
+from utils.job_model import JobDetailStore, load_job_details, summarize_jobs
+from utils.result_store import ResultStore
+
+JOBS = [
+    {"title": "Data Analyst", "company": "Acme", "location": "Austin, TX", "job_id": "a1",
+     "description": "Analyse sales data with SQL."},
+    {"title": "Data Engineer", "company": "Globex", "location": "Remote", "job_id": "b2",
+     "description": "Build pipelines in Python."},
+]
+
+
+def _summaries():
+    return summarize_jobs(JOBS, store=JobDetailStore())
+
+
+def test_same_results_share_one_set(tmp_path):
+    store = ResultStore(directory=str(tmp_path))
+    summaries, details = _summaries()
+    first = store.put(summaries, details)
+    assert store.put([dict(job) for job in summaries], dict(details)) == first
+    assert len(store) == 1
+    assert store.get(first).jobs == summaries
+
+
+def test_different_details_get_different_ids(tmp_path):
+    store = ResultStore(directory=str(tmp_path))
+    summaries, details = _summaries()
+    changed = {key: {"description": "Something else"} for key in details}
+    assert store.put(summaries, details) != store.put(summaries, changed)
+
+
+def test_restored_set_keeps_its_details(tmp_path):
+    summaries, details = _summaries()
+    result_id = ResultStore(directory=str(tmp_path)).put(summaries, details)
+
+    # A new store over the same directory stands in for a restarted process
+    restored = ResultStore(directory=str(tmp_path)).get(result_id)
+    assert [job["title"] for job in restored.jobs] == ["Data Analyst", "Data Engineer"]
+    assert "description" not in restored.jobs[0]
+    assert "company_id" not in restored.jobs[0]
+    key = restored.jobs[1]["job_key"]
+    assert restored.job_details(key) == {"description": "Build pipelines in Python."}
+
+
+def test_load_job_details_falls_back_to_the_result_set(tmp_path):
+    summaries, details = _summaries()
+    result_id = ResultStore(directory=str(tmp_path)).put(summaries, details)
+    restored = ResultStore(directory=str(tmp_path)).get(result_id)
+
+    empty = JobDetailStore()
+    assert load_job_details(restored.jobs[0], store=empty) == {}
+    found = load_job_details(restored.jobs[0], store=empty, results=restored)
+    assert found == {"description": "Analyse sales data with SQL."}
+    # Found details are cached for the next lookup
+    assert len(empty) == 1
+
+
+def test_memory_only_store_keeps_details(tmp_path):
+    store = ResultStore(directory=str(tmp_path), max_files=0)
+    summaries, details = _summaries()
+    result = store.get(store.put(summaries, details))
+    assert result.job_details(summaries[0]["job_key"]) == details[summaries[0]["job_key"]]
+    assert os.listdir(tmp_path) == []
+
+
+def test_evicted_set_is_read_back_from_disk(tmp_path):
+    store = ResultStore(max_entries=1, directory=str(tmp_path))
+    summaries, details = _summaries()
+    first = store.put(summaries[:1], details)
+    store.put(summaries[1:], details)
+    assert len(store) == 1
+    assert store.get(first).jobs[0]["title"] == "Data Analyst"
+
+
+def test_unknown_set_is_none(tmp_path):
+    assert ResultStore(directory=str(tmp_path)).get("missing") is None
+
+
+def test_prune_removes_sets_with_their_details(tmp_path):
+    store = ResultStore(directory=str(tmp_path), max_files=10)
+    summaries, details = _summaries()
+    for i in range(15):
+        store.put([dict(summaries[0], title=f"Role {i}")], details)
+    names = os.listdir(tmp_path)
+    sets = [name for name in names if not name.endswith(".details.json.gz")]
+    assert len(sets) <= 10
+    assert len(names) == 2 * len(sets)
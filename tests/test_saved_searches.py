@@ -0,0 +1,38 @@
+import json
+import threading
+
+from utils.saved_searches import SavedSearch, SavedSearchStore
+
+
+def test_saves_from_many_threads_leave_a_complete_file(tmp_path):
+    path = str(tmp_path / "saved" / "searches.json")
+    store = SavedSearchStore(path)
+    errors = []
+
+    def add(i):
+        try:
+            for j in range(10):
+                store.add(SavedSearch(owner=f"user{i}", keywords=f"job {j}", location="Remote"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 80
+    assert len(SavedSearchStore(path).all()) == 80
+
+
+def test_searches_survive_a_reload(tmp_path):
+    path = str(tmp_path / "searches.json")
+    store = SavedSearchStore(path)
+    search = store.add(SavedSearch(owner="owner", keywords="python", location="Austin, TX", job_types=["Full-time"]))
+    store.remove(store.add(SavedSearch(owner="owner", keywords="java", location="Dallas")).id)
+    loaded = SavedSearchStore(path).get(search.id)
+    assert loaded.to_dict() == search.to_dict()
+    assert len(SavedSearchStore(path).all()) == 1
@@ -0,0 +1,108 @@
+import json
+import time
+
+import pytest
+
+import utils.serp_api_searcher as serp_api_searcher
+from benchmarks.fake_scrapingdog import FakeScrapingDogServer, load_payloads
+from utils.rate_limiter import TokenBucket
+from utils.result_cache import ResultCache
+from utils.serp_api_searcher import SerpApiSearcher
+
+
+@pytest.fixture
+def server():
+    with FakeScrapingDogServer() as fake:
+        yield fake
+
+
+def _searcher(url):
+    return SerpApiSearcher(
+        api_url=url, api_key="test", rate_limiter=TokenBucket(rate=1e9, burst=1e9), cache=ResultCache("test", ttl=0)
+    )
+
+
+def test_search_extracts_attributes(server):
+    jobs = _searcher(server.url).search_jobs("digital marketer", "New York, NY", count=5)
+    assert jobs
+    assert all("salary_min" in job and "skills" in job for job in jobs)
+
+
+def test_extraction_failure_keeps_the_page_and_the_circuit_closed(server, monkeypatch):
+    def broken(jobs, extensions=None):
+        raise RuntimeError("extraction bug")
+
+    monkeypatch.setattr(serp_api_searcher, "extract_all", broken)
+    searcher = _searcher(server.url)
+    jobs = searcher.search_jobs("digital marketer", "New York, NY", count=5)
+    assert jobs
+    assert "salary_min" not in jobs[0]
+    assert searcher.health()["failures"] == 0
+
+
+def test_missing_api_key_skips_the_request(server):
+    searcher = SerpApiSearcher(api_url=server.url)
+    searcher.api_key = None
+    assert not searcher.is_available()
+    assert searcher.search_jobs("digital marketer", "New York, NY") == []
+    assert searcher.health()["requests"] == 0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000])
+def test_parse_is_independent_of_chunk_boundaries(chunk_size):
+    text = json.dumps(load_payloads()[0])
+    searcher = SerpApiSearcher(api_url="http://unused", api_key="test")
+    whole = searcher._parse_jobs_stream([text], None, 50)
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert searcher._parse_jobs_stream(chunks, None, 50) == whole
+
+
+def test_stale_result_is_served_while_it_refreshes_in_the_background():
+    with FakeScrapingDogServer(latency_ms=200) as server:
+        searcher = SerpApiSearcher(
+            api_url=server.url, api_key="test", rate_limiter=TokenBucket(rate=1e9, burst=1e9),
+            cache=ResultCache("test_stale", ttl=0.01, stale_ttl=60)
+        )
+        first = searcher.search_jobs("digital marketer", "New York, NY", count=5)
+        time.sleep(0.02)
+        assert searcher.is_cached("digital marketer", "New York, NY", count=5)
+
+        start = time.perf_counter()
+        stale = searcher.search_jobs("digital marketer", "New York, NY", count=5)
+        assert time.perf_counter() - start < 0.1
+        assert stale == first
+        assert searcher.is_refreshing("digital marketer", "New York, NY", count=5)
+
+        deadline = time.monotonic() + 5
+        while searcher.is_refreshing("digital marketer", "New York, NY", count=5) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not searcher.is_refreshing("digital marketer", "New York, NY", count=5)
+        assert server.request_count == 2
+
+
+def test_stale_result_is_not_served_when_stale_ok_is_off():
+    with FakeScrapingDogServer() as server:
+        searcher = SerpApiSearcher(
+            api_url=server.url, api_key="test", rate_limiter=TokenBucket(rate=1e9, burst=1e9),
+            cache=ResultCache("test_stale_off", ttl=0.01, stale_ttl=60)
+        )
+        searcher.search_jobs("digital marketer", "New York, NY", count=5)
+        time.sleep(0.02)
+        searcher.search_jobs("digital marketer", "New York, NY", count=5, stale_ok=False)
+        assert server.request_count == 2
+        assert not searcher.is_refreshing("digital marketer", "New York, NY", count=5)
+
+
+def test_cached_result_does_not_answer_a_search_allowed_more_pages(server):
+    searcher = SerpApiSearcher(
+        api_url=server.url, api_key="test", rate_limiter=TokenBucket(rate=1e9, burst=1e9),
+        cache=ResultCache("test_pages", ttl=60)
+    )
+    searcher.search_jobs("digital marketer", "New York, NY", count=50, pages=1)
+    assert server.request_count == 1
+    assert searcher.is_cached("digital marketer", "New York, NY", count=50, pages=1)
+    assert not searcher.is_cached("digital marketer", "New York, NY", count=50, pages=3)
+
+    searcher.search_jobs("digital marketer", "New York, NY", count=50, pages=3)
+    assert server.request_count > 1
+    assert searcher.is_cached("digital marketer", "New York, NY", count=50, pages=3)
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from utils.streaming_json import (
+    JSONStreamError, PartialJSONParser, iter_object_stream, iter_partial_values, iter_text_chunks
+)
+
+DOCUMENT = json.dumps({
+    "count": 12,
+    "salary": 85000.5,
+    "ratio": -0.125,
+    "big": 1.5e10,
+    "small": 2E-3,
+    "flags": [True, False, None],
+    "jobs_results": [
+        {"title": "Data Analyst", "salary": 72000.75, "score": 9.5e-1},
+        {"title": "Café Manager", "salary": -1e3, "tags": ["a", "b"]},
+        12.25,
+        0,
+    ],
+    "next": {"page": 2.0},
+    "last": 3.14159,
+})
+
+
+def _members(chunks, stream_keys=()):
+    return list(iter_object_stream(chunks, stream_keys=stream_keys))
+
+
+def _expected(stream_keys=()):
+    members = []
+    for key, value in json.loads(DOCUMENT).items():
+        if key in stream_keys:
+            members.extend((key, element) for element in value)
+        else:
+            members.append((key, value))
+    return members
+
+
+@pytest.mark.parametrize("offset", range(1, len(DOCUMENT)))
+def test_split_at_every_offset(offset):
+    chunks = [DOCUMENT[:offset], DOCUMENT[offset:]]
+    assert _members(chunks) == _expected()
+    assert _members(chunks, stream_keys=("jobs_results",)) == _expected(("jobs_results",))
+
+
+def test_one_character_chunks():
+    assert _members(list(DOCUMENT), stream_keys=("jobs_results",)) == _expected(("jobs_results",))
+
+
+@pytest.mark.parametrize("chunks", [
+    ['{"a": 12.', '5, "b": 1}'],
+    ['{"a": 12', '.5, "b": 1}'],
+    ['{"a": 1e', '3, "b": 1}'],
+    ['{"a": 1e-', '3, "b": 1}'],
+    ['{"a": -', '1.5e+2}'],
+    ['{"a": 12.5', ' ', ' , "b": 1}'],
+])
+def test_number_split_across_chunks(chunks):
+    assert _members(chunks) == list(json.loads("".join(chunks)).items())
+
+
+def test_scalar_at_end_of_stream():
+    assert _members(['{"a": [1, 2.5', "]}"], stream_keys=("a",)) == [("a", 1), ("a", 2.5)]
+
+
+def test_empty_object_and_array():
+    assert _members(["{}"]) == []
+    assert _members(['{"a": [], "b": 1}'], stream_keys=("a",)) == [("b", 1)]
+
+
+def test_caller_can_stop_early():
+    def chunks():
+        yield '{"a": 1, "b": ['
+        raise AssertionError("read past the point the caller stopped")
+
+    stream = iter_object_stream(chunks())
+    assert next(stream) == ("a", 1)
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '{"a": 1 "b": 2}', '{"a": 12x}', '{1: 2}'])
+def test_malformed_documents_raise(text):
+    with pytest.raises(JSONStreamError):
+        _members([text])
+
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError):
+        _members(['{"a": 1, "b": '])
+
+
+def test_text_chunks_keep_multibyte_characters_whole():
+    data = DOCUMENT.encode("utf-8")
+    for offset in range(1, len(data)):
+        assert "".join(iter_text_chunks([data[:offset], data[offset:]])) == DOCUMENT
+
+
+ANALYSIS = '{"match_score": 82, "key_matches": ["Python", "SQL \\"expert\\""], "gaps": [], "note": "caf\\u00e9"}'
+
+
+def test_partial_snapshots_grow_with_the_document():
+    parser = PartialJSONParser()
+    assert parser.feed('```json\n{"match_') == {}  # the fence is skipped, the key is not complete
+    assert parser.feed('score": 8') is None  # the number may continue
+    assert parser.feed('2, "key_matches": ["Pyt') == {"match_score": 82, "key_matches": ["Pyt"]}
+    assert parser.feed('hon"') == {"match_score": 82, "key_matches": ["Python"]}
+    assert parser.feed(']}\n```') is None  # unchanged
+    assert parser.value() == {"match_score": 82, "key_matches": ["Python"]}
+    assert parser.complete
+    assert parser.feed('{"ignored": 1}') is None
+
+
+def test_partial_snapshot_stops_before_an_incomplete_escape():
+    parser = PartialJSONParser()
+    assert parser.feed('{"note": "caf\\u00') == {"note": "caf"}
+    assert parser.feed('e9 au lait"}') == {"note": "café au lait"}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(ANALYSIS)])
+def test_partial_values_end_with_the_full_document(size):
+    chunks = [ANALYSIS[i:i + size] for i in range(0, len(ANALYSIS), size)]
+    values = list(iter_partial_values(chunks))
+    assert values[-1] == json.loads(ANALYSIS)
+    # Each snapshot differs from the one before it
+    assert all(a != b for a, b in zip(values, values[1:]))
+
+
+def test_feed_skips_the_reparse_when_nothing_completed(monkeypatch):
+    parser = PartialJSONParser()
+    assert parser.feed('{"match_score": 82, ') == {"match_score": 82}
+    loads = json.loads
+    calls = []
+    monkeypatch.setattr(json, "loads", lambda text: calls.append(text) or loads(text))
+    for chunk in (" ", '"ga', 'ps": ', "1"):  # whitespace, an open key, an open number
+        assert parser.feed(chunk) is None
+    assert calls == []
+    assert parser.feed("2}") == {"match_score": 82, "gaps": 12}
+    assert len(calls) == 1
@@ -0,0 +1,106 @@
+from ui_utils import RenderCache, format_job_description, job_card_html, render_cache, render_job_description
+
+
+def _job(**fields):
+    job = {"job_key": "k1", "title": "Data Analyst", "company": "Acme", "location": "Austin, TX",
+           "platform": "LinkedIn", "apply_url": "https://example.com/apply", "is_real_job": True}
+    job.update(fields)
+    return job
+
+
+def test_render_cache_renders_once_per_key():
+    cache = RenderCache(max_entries=2)
+    calls = []
+    render = lambda text: (lambda: calls.append(text) or f"<p>{text}</p>")
+    assert cache.get_or_render("a", render("a")) == "<p>a</p>"
+    assert cache.get_or_render("a", render("again")) == "<p>a</p>"
+    assert calls == ["a"]
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2)
+    cache.get_or_render("a", lambda: "a")
+    cache.get_or_render("b", lambda: "b")
+    cache.get_or_render("a", lambda: "a")
+    cache.get_or_render("c", lambda: "c")
+    assert len(cache) == 2
+    assert cache.get_or_render("b", lambda: "b rendered again") == "b rendered again"
+    assert cache.get_or_render("c", lambda: "c rendered again") == "c"
+
+
+def test_job_card_is_memoized_and_rerendered_when_shown_fields_change():
+    job = _job(job_key="card-memo")
+    before = len(render_cache)
+    html = job_card_html(job)
+    assert job_card_html(dict(job)) is html
+    assert len(render_cache) == before + 1
+    # A field the card does not show leaves it cached; a shown one renders a new card
+    assert job_card_html(dict(job, description="changed")) is html
+    changed = job_card_html(dict(job, title="Senior Data Analyst"))
+    assert "Senior Data Analyst" in changed and changed is not html
+
+
+def test_job_card_escapes_provider_text():
+    html = job_card_html(_job(job_key="card-escape", title="<script>alert(1)</script>", company="A & B"))
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html and "A &amp; B" in html
+
+
+def test_job_card_links_only_web_urls():
+    assert 'href="https://example.com/apply"' in job_card_html(_job(job_key="card-link"))
+    unsafe = job_card_html(_job(job_key="card-js", apply_url="javascript:alert(1)"))
+    assert "href" not in unsafe and "javascript" not in unsafe
+
+
+DESCRIPTION = """<p>About the role</p>
+We build data tools &amp; dashboards.
+Requirements:
+• 3+ years of SQL
+- Python
+Skills: • Tableau • Excel
+<script>alert("x")</script> Apply <b>today</b>."""
+
+
+def test_description_detects_headings_bullets_and_paragraphs():
+    html, truncated = render_job_description(DESCRIPTION)
+    assert not truncated
+    assert ">About the role</h4>" in html
+    assert ">Requirements:</h4>" in html
+    assert "We build data tools &amp;amp; dashboards." not in html  # entities are decoded once, then escaped
+    assert ">We build data tools &amp; dashboards.</p>" in html
+    assert html.count("<li>") == 4
+    assert "<li>3+ years of SQL</li><li>Python</li>" in html
+    assert "<li>Tableau</li><li>Excel</li>" in html
+
+
+def test_description_markup_is_stripped_and_text_escaped():
+    html, _ = render_job_description(DESCRIPTION)
+    assert "<script>" not in html and "<b>" not in html
+    assert "alert(&quot;x&quot;) Apply today." in html
+    html, _ = render_job_description("Salary <100K & growth > all")
+    assert "Salary &lt;100K &amp; growth &gt; all" in html
+
+
+def test_long_description_is_truncated_at_a_word():
+    text = "\\n".join(f"Line number {i} of a long description" for i in range(100))
+    html, truncated = render_job_description(text, max_chars=100)
+    assert truncated
+    assert "Line number 2" in html and "Line number 3 " not in html
+    assert " …</p>" in html
+    full, truncated = render_job_description(text)
+    assert not truncated and "Line number 99" in full
+
+
+def test_empty_description():
+    html, truncated = render_job_description("")
+    assert "No description available" in html and not truncated
+
+
+def test_description_rendering_is_memoized_by_key_and_text():
+    first = render_job_description(DESCRIPTION, key="desc-memo")
+    assert render_job_description(DESCRIPTION, key="desc-memo") is first
+    assert render_job_description(DESCRIPTION, key="desc-memo", max_chars=20) is not first
+    # A changed description under the same job key is rendered again
+    changed = render_job_description(DESCRIPTION + "\\nNew line", key="desc-memo")
+    assert changed is not first and "New line" in changed[0]
+    assert format_job_description(DESCRIPTION) == first[0]
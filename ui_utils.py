@@ -1,6 +1,11 @@
 
+import html
+import re
+import threading
+from collections import OrderedDict
+
 import streamlit as st
-from config import COLORS
+from config import COLORS, RENDER_CACHE_SIZE
 
 # def display_resume_analysis_summary(resume_data):
 #     """
@@ -302,6 +307,97 @@ from config import COLORS
 #                 unsafe_allow_html=True
 #             )
 
+_BLOCK_TAG = re.compile(r"<\s*(?:br|/?p|/?li|/?ul|/?ol|/?div|/?h[1-6])\b[^>]*>", re.IGNORECASE)
+# Only "<" followed by a tag name, "/" or "!" starts markup; "<100K" or "< 5 years" is text
+_ANY_TAG = re.compile(r"<[/!]?[A-Za-z!][^<>]{0,200}>")
+_BULLET = re.compile(r"^(?:[•·▪◦‣●○■□➢➤✓✔*\-–—]|\d{1,2}[.)])\s+")
+_HEADING_WORDS = re.compile(
+    r"^(?:about|responsibilities|requirements|qualifications|what you|who you|benefits|skills|"
+    r"job description|duties|the role|role|overview|preferred|minimum|basic|key)\b",
+    re.IGNORECASE
+)
+
+_DESCRIPTION_STYLE = """background-color: #263238; color: white; padding: 15px;
+border-radius: 8px; margin-top: 15px; line-height: 1.5; font-size: 16px;"""
+
+
+def _is_heading(line):
+    if len(line) > 80 or line.endswith("."):
+        return False
+    return line.endswith(":") or (line.isupper() and len(line) > 3) or (
+        bool(_HEADING_WORDS.match(line)) and len(line.split()) <= 6
+    )
+
+
+def _render_description(description, max_chars=None):
+    # Provider markup is reduced to line breaks and plain text before anything is escaped
+    text = html.unescape(_ANY_TAG.sub("", _BLOCK_TAG.sub("\n", description)))
+
+    parts, in_list, used, truncated = [], False, 0, False
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if max_chars is not None and used + len(line) > max_chars:
+            line = line[:max(0, max_chars - used)].rsplit(" ", 1)[0].rstrip(" ,;:") + " …"
+            truncated = True
+        used += len(line)
+
+        # "Skills: • Python • SQL" carries its bullets inline
+        pieces = line.split("•")
+        lead, bullets = pieces[0].strip(), [piece.strip() for piece in pieces[1:] if piece.strip()]
+        match = _BULLET.match(lead)
+        if match:
+            bullets.insert(0, lead[match.end():])
+            lead = ""
+
+        if lead:
+            if in_list:
+                parts.append("</ul>")
+                in_list = False
+            if _is_heading(lead):
+                parts.append(f'<h4 style="color: white; margin: 0.8rem 0 0.3rem 0; font-size: 1.05rem;">{html.escape(lead)}</h4>')
+            else:
+                parts.append(f'<p style="margin: 0 0 0.6rem 0;">{html.escape(lead)}</p>')
+        if bullets:
+            if not in_list:
+                parts.append('<ul style="margin: 0 0 0.6rem 1.2rem; padding: 0;">')
+                in_list = True
+            parts.extend(f"<li>{html.escape(bullet)}</li>" for bullet in bullets)
+        if truncated:
+            break
+    if in_list:
+        parts.append("</ul>")
+
+    return f'<div style="{_DESCRIPTION_STYLE}">{"".join(parts)}</div>', truncated
+
+
+def render_job_description(description, key=None, max_chars=None):
+    """
+    Sanitized HTML for a job description, with headings and bullet lists detected.
+
+    Provider markup is stripped and all text escaped, so the result is safe
+    for unsafe_allow_html. Headings, bullets and paragraphs are found in one
+    pass over the lines.
+
+    Args:
+        description (str): Job description text
+        key (str, optional): Job fingerprint; when given the HTML is memoized
+        max_chars (int, optional): Render only about this many characters
+
+    Returns:
+        tuple: (html, truncated) where truncated is True if text was left out
+    """
+    if not description:
+        return """<div style="background-color: #455A64; color: white; padding: 15px; 
+                border-radius: 8px; margin-top: 15px;">No description available</div>""", False
+    if key is None:
+        return _render_description(description, max_chars)
+    # str caches its hash, so keying on it stays cheap for the same stored description
+    cache_key = ("description", key, hash(description), max_chars)
+    return render_cache.get_or_render(cache_key, lambda: _render_description(description, max_chars))
+
+
 def format_job_description(description):
     """
     Format the job description for better readability with high contrast.
@@ -312,22 +408,143 @@ def format_job_description(description):
     Returns:
         str: Formatted HTML for the job description
     """
-    if not description:
-        return """<div style="background-color: #455A64; color: white; padding: 15px; 
-                border-radius: 8px; margin-top: 15px;">No description available</div>"""
-    
-    # Clean up any problematic formatting
-    description = description.replace('\n\n', '<br><br>').replace('\n', '<br>')
-    
-    # Wrap the description in a styled div with high contrast
-    formatted_description = f"""
-    <div style="background-color: #263238; color: white; padding: 15px; 
-    border-radius: 8px; margin-top: 15px; line-height: 1.5; font-size: 16px;">
-        {description}
-    </div>
+    return render_job_description(description)[0]
+
+
+class RenderCache:
+    """Bounded, process-wide LRU of rendered HTML blocks (or tuples holding them).
+
+    Reruns and other sessions showing the same job reuse the markup instead
+    of rebuilding it.
     """
-    
-    return formatted_description
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """
+        Cached HTML for key, calling render() to build it on a miss.
+
+        Args:
+            key (hashable): Identifies the rendered content
+            render (callable): Zero-argument function returning the HTML
+
+        Returns:
+            str: Rendered HTML
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+        rendered = render()
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+render_cache = RenderCache()
+
+# Job fields shown on the detail card; any change renders a new card
+CARD_FIELDS = ("title", "company", "location", "platform", "date_posted", "job_type", "apply_url", "is_real_job",
+               "salary_min", "salary_max", "salary_currency", "salary_period", "seniority", "work_mode", "skills")
+
+
+def _render_job_card(job):
+    field = lambda name, default="": html.escape(str(job.get(name) or default))
+    info_box = lambda label, value: f"""<div style="flex: 1; background-color: {COLORS["primary"]}; color: white;
+        padding: 10px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
+        <p style="margin: 0; font-weight: bold; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">{label}</p>
+        <p style="margin: 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.1);">{value}</p></div>"""
+
+    parts = [f"""<div style='background: linear-gradient(90deg, {COLORS["primary"]}, {COLORS["secondary"]});
+        padding: 1rem; border-radius: 10px; margin-bottom: 1rem; box-shadow: 0 3px 10px rgba(0,0,0,0.2);'>
+        <h3 style='color: white; margin: 0; font-weight: 600; text-shadow: 1px 1px 3px rgba(0,0,0,0.3);'>{field("title")}</h3>
+        <p style='color: white; font-size: 1.1rem; margin: 0.5rem 0 0 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);'>{field("company")}</p>
+        </div>""",
+        f"""<div style="display: flex; gap: 1rem;">{info_box("Location", field("location", "Not specified"))}
+        {info_box("Platform", field("platform", "Unknown"))}{info_box("Posted", field("date_posted", "Recent"))}</div>"""]
+
+    if job.get("job_type"):
+        parts.append(f"""<div style="background-color: {COLORS["secondary"]}; color: white;
+        padding: 8px 15px; border-radius: 20px; display: inline-block; margin: 10px 0; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
+        <span style="text-shadow: 1px 1px 1px rgba(0,0,0,0.2);">{field("job_type")}</span></div>""")
+
+    # Attributes extracted at ingestion
+    from utils.job_attributes import format_salary
+    chips = [format_salary(job), str(job.get("work_mode") or "").capitalize(),
+             str(job.get("seniority") or "").capitalize()]
+    chips = [chip for chip in chips if chip] + list(job.get("skills") or [])[:12]
+    if chips:
+        parts.append("<div style='margin: 5px 0 10px 0;'>" + "".join(
+            f"""<span style="background-color: {COLORS["accent2"]}; color: white; padding: 4px 10px;
+            border-radius: 12px; display: inline-block; margin: 2px 4px 2px 0; font-size: 0.9rem;">{html.escape(chip)}</span>"""
+            for chip in chips
+        ) + "</div>")
+
+    # Only web links become anchors; anything else (e.g. javascript:) is dropped
+    if str(job.get("apply_url") or "").lower().startswith(("http://", "https://")):
+        parts.append(f"""<div style="background-color: {COLORS["accent"]}; padding: 12px;
+        border-radius: 6px; margin: 15px 0; text-align: center; box-shadow: 0 3px 8px rgba(0,0,0,0.15);">
+        <a href="{html.escape(job["apply_url"], quote=True)}" target="_blank" rel="noopener noreferrer" style="color: white;
+        text-decoration: none; font-weight: bold; display: block; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);">
+        {'➡️ Apply Now' if job.get("is_real_job") else '➡️ View Job Details'}</a></div>""")
+
+    return "\n".join(parts)
+
+
+def job_card_html(job):
+    """
+    HTML for the header of the job detail view: title, company, location,
+    platform, posting date, job type, salary, work mode, seniority, skills
+    and apply link, with provider text escaped.
+
+    Args:
+        job (dict): Job summary
+
+    Returns:
+        str: Rendered HTML, memoized per job and displayed content
+    """
+    key = ("card", job.get("job_key")) + tuple(
+        tuple(value) if isinstance(value, list) else value for value in (job.get(name) for name in CARD_FIELDS)
+    )
+    return render_cache.get_or_render(key, lambda: _render_job_card(job))
+
+
+def match_analysis_html(analysis):
+    """
+    HTML for a match analysis, complete or still streaming in.
+
+    Sections appear as soon as the analysis has them, so the same function
+    renders every partial result; model text is escaped.
+
+    Args:
+        analysis (dict): Match analysis with match_score, key_matches, gaps and recommendations
+
+    Returns:
+        str: Rendered HTML
+    """
+    parts = []
+    if analysis.get("match_score") is not None:
+        parts.append(f"""<div style="background-color: {COLORS["primary"]}; color: white; padding: 10px 15px;
+        border-radius: 8px; margin-bottom: 10px; font-size: 1.2rem; font-weight: bold;">
+        Match score: {html.escape(str(analysis["match_score"]))}%</div>""")
+    for field, label, color in (("key_matches", "Key matches", COLORS["success"]), ("gaps", "Gaps", COLORS["warning"]),
+                                ("recommendations", "Recommendations", COLORS["info"])):
+        items = analysis.get(field)
+        if isinstance(items, list) and items:
+            parts.append(f"""<div style="background-color: {color}; color: white; padding: 10px 15px;
+            border-radius: 8px; margin-bottom: 10px;"><p style="margin: 0 0 0.3rem 0; font-weight: bold;">{label}</p>
+            <ul style="margin: 0;">{"".join(f"<li>{html.escape(str(item))}</li>" for item in items)}</ul></div>""")
+    return "\n".join(parts)
 
 # def display_matching_skills(skills, job_description):
 #     """
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+
+from utils.instrumentation import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the provider's circuit is open."""
+
+
+class ProviderHealth:
+    """Rolling error rate and latency for one provider.
+
+    Keeps (timestamp, success, latency) samples for the last window_seconds.
+    """
+
+    def __init__(self, window_seconds=60.0, max_samples=1000):
+        """
+        Args:
+            window_seconds (float): Age after which samples stop counting
+            max_samples (int): Hard cap on retained samples
+        """
+        self.window_seconds = window_seconds
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, success, latency):
+        with self._lock:
+            self._samples.append((time.monotonic(), success, latency))
+
+    def _recent(self):
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            return list(self._samples)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        """
+        Summarize the current window.
+
+        Returns:
+            dict: requests, failures, error_rate, p50_latency and p95_latency (seconds)
+        """
+        samples = self._recent()
+        total = len(samples)
+        failures = sum(1 for _, success, _ in samples if not success)
+        latencies = sorted(latency for _, _, latency in samples)
+
+        def pick(pct):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(pct / 100.0 * len(latencies)))]
+
+        return {
+            "requests": total,
+            "failures": failures,
+            "error_rate": failures / total if total else 0.0,
+            "p50_latency": pick(50),
+            "p95_latency": pick(95),
+        }
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker around a provider.
+
+    The circuit opens when the rolling error rate reaches failure_threshold
+    (once at least min_requests were seen) or after consecutive_failures
+    failures in a row. While open every call is rejected immediately. After
+    open_seconds the breaker lets up to half_open_max_calls probe requests
+    through; a successful probe closes the circuit, a failed one re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=0.5, min_requests=5, consecutive_failures=3,
+                 open_seconds=30.0, half_open_max_calls=1, slow_call_seconds=None, window_seconds=60.0):
+        """
+        Args:
+            name (str): Provider name, used for metrics and logging
+            failure_threshold (float): Error rate (0-1) that opens the circuit
+            min_requests (int): Samples required before the error rate is trusted
+            consecutive_failures (int): Failures in a row that open the circuit regardless of rate
+            open_seconds (float): How long to fail fast before probing again
+            half_open_max_calls (int): Concurrent probe requests allowed while half-open
+            slow_call_seconds (float, optional): Successful calls slower than this count as failures
+            window_seconds (float): Rolling window for the health statistics
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.consecutive_failures = consecutive_failures
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.health = ProviderHealth(window_seconds=window_seconds)
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._failure_streak = 0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state):
+        if state == self._state:
+            return
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state in (OPEN, HALF_OPEN):
+            self._half_open_calls = 0
+        if state == CLOSED:
+            self._failure_streak = 0
+            self.health.reset()
+        metrics.inc("circuit_transitions_total", provider=self.name, state=state)
+        print(f"Circuit for {self.name} is now {state}")
+
+    def allow_request(self):
+        """
+        Check whether a call may go to the provider right now.
+
+        Callers that get True must report the outcome with record_success or
+        record_failure, otherwise a half-open probe slot stays taken.
+
+        Returns:
+            bool: False if the circuit is open and the call should fail fast
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            metrics.inc("circuit_rejections_total", provider=self.name)
+            return False
+
+    def record_success(self, latency):
+        if self.slow_call_seconds is not None and latency > self.slow_call_seconds:
+            self.record_failure(latency)
+            return
+        self.health.record(True, latency)
+        with self._lock:
+            self._failure_streak = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self, latency):
+        self.health.record(False, latency)
+        with self._lock:
+            self._failure_streak += 1
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            if self._state != CLOSED:
+                return
+            if self._failure_streak >= self.consecutive_failures:
+                self._transition(OPEN)
+                return
+            stats = self.health.snapshot()
+            if stats["requests"] >= self.min_requests and stats["error_rate"] >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func through the breaker.
+
+        Any exception raised by func counts as a failure and is re-raised.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure(time.perf_counter() - start)
+            raise
+        self.record_success(time.perf_counter() - start)
+        return result
+
+    def snapshot(self):
+        """Current state plus rolling health statistics."""
+        stats = self.health.snapshot()
+        stats["state"] = self.state
+        stats["name"] = self.name
+        return stats
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, **kwargs):
+    """
+    Get the process-wide breaker for a provider, creating it on first use.
+
+    Args:
+        name (str): Provider name
+        **kwargs: CircuitBreaker settings, only used when the breaker is created
+
+    Returns:
+        CircuitBreaker: Shared breaker instance
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **kwargs)
+        return breaker
+
+
+def all_breakers():
+    """Snapshot of every registered breaker, keyed by provider name."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
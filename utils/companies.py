@@ -0,0 +1,146 @@
+import re
+import threading
+import unicodedata
+
+# Trailing legal forms dropped when normalizing, longest first
+LEGAL_SUFFIXES = (
+    "private limited", "pvt ltd", "pvt", "limited", "ltd", "llc", "l.l.c", "llp", "inc", "incorporated",
+    "corporation", "corp", "company", "co", "plc", "gmbh", "ag", "se", "sa", "s.a", "bv", "b.v", "nv", "pte",
+    "pty", "group", "holdings",
+)
+
+# Normalized names that refer to the same employer -> canonical normalized name
+COMPANY_ALIASES = {
+    "alphabet": "google",
+    "google cloud": "google",
+    "facebook": "meta",
+    "meta platforms": "meta",
+    "amazon.com": "amazon",
+    "amazon web services": "amazon",
+    "aws": "amazon",
+    "jpmorgan": "jp morgan",
+    "jpmorgan chase": "jp morgan",
+    "jp morgan chase": "jp morgan",
+    "j.p. morgan": "jp morgan",
+    "international business machines": "ibm",
+}
+
+# Separators between a parent and a brand, as in "Alphabet - Google"
+_PARTS = re.compile(r"\s+[-|/–—]\s+")
+_PARENS = re.compile(r"\([^)]*\)")
+_PUNCTUATION = re.compile(r"[^\w&.+ ]+")
+_SUFFIX = re.compile(r"(?:[\s,&]+(?:%s)\.?)+$" % "|".join(re.escape(suffix) for suffix in LEGAL_SUFFIXES))
+
+
+def _normalize_part(text):
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    text = _PARENS.sub(" ", text)
+    text = _SUFFIX.sub("", " ".join(text.replace(",", " ,").split()))
+    text = " ".join(_PUNCTUATION.sub(" ", text).split()).strip(" .")
+    if text.startswith("the ") and len(text) > 4:
+        text = text[4:]
+    return COMPANY_ALIASES.get(text, text)
+
+
+def normalize_company(name):
+    """
+    Canonical key for a company name.
+
+    Drops case, accents, punctuation and legal forms ("Google LLC" ->
+    "google") and resolves known aliases. For "Parent - Brand" names the
+    first part that is a known alias target wins, else the first part.
+
+    Args:
+        name (str): Company name as a provider wrote it
+
+    Returns:
+        str: Normalized key, "" for a missing name
+    """
+    parts = [_normalize_part(part) for part in _PARTS.split(str(name or "").strip())]
+    parts = [part for part in parts if part]
+    if not parts:
+        return ""
+    targets = set(COMPANY_ALIASES.values())
+    return next((part for part in parts if part in targets), parts[0])
+
+
+class CompanyTable:
+    """Interned canonical companies with integer IDs and precomputed sort ranks.
+
+    Each distinct raw name is normalized once; jobs then carry the integer
+    company_id, so grouping, dedup and sorting compare integers instead of
+    lower-casing strings on every rerun. IDs are stable for the life of the
+    process and the table only grows, by one entry per distinct employer.
+    """
+
+    def __init__(self):
+        self._ids_by_raw = {}
+        self._ids_by_key = {}
+        self._keys = []
+        self._names = []
+        self._ranks = None
+        self._lock = threading.Lock()
+
+    def intern(self, name):
+        """
+        ID of the canonical company for a raw name, creating it on first sight.
+
+        Args:
+            name (str): Company name as a provider wrote it
+
+        Returns:
+            int: Company ID
+        """
+        raw = str(name or "")
+        company_id = self._ids_by_raw.get(raw)
+        if company_id is not None:
+            return company_id
+
+        key = normalize_company(raw)
+        with self._lock:
+            company_id = self._ids_by_key.get(key)
+            if company_id is None:
+                company_id = len(self._keys)
+                self._ids_by_key[key] = company_id
+                self._keys.append(key)
+                self._names.append(raw.strip() or "Unknown Company")
+                self._ranks = None
+            self._ids_by_raw[raw] = company_id
+        return company_id
+
+    def key(self, company_id):
+        """Normalized key of a company ID."""
+        return self._keys[company_id]
+
+    def name(self, company_id):
+        """Display name of a company ID: the first raw spelling seen."""
+        return self._names[company_id]
+
+    def ranks(self):
+        """Alphabetical rank of every company ID by normalized key, as a numpy array."""
+        ranks = self._ranks
+        if ranks is None:
+            import numpy as np
+
+            with self._lock:
+                keys = list(self._keys)
+            order = np.argsort(np.array(keys, dtype=str), kind="stable")
+            ranks = np.empty(len(keys), dtype=np.int64)
+            ranks[order] = np.arange(len(keys))
+            with self._lock:
+                if len(self._keys) == len(keys):
+                    self._ranks = ranks
+        return ranks
+
+    def __len__(self):
+        return len(self._keys)
+
+
+companies = CompanyTable()
+
+
+def company_id(job):
+    """Interned company ID of a job, using the one set at ingestion when present."""
+    value = job.get("company_id")
+    return value if value is not None else companies.intern(job.get("company"))
@@ -0,0 +1,216 @@
+import bisect
+import hashlib
+import math
+import threading
+from array import array
+from collections import OrderedDict
+
+from config import DELTA_SORTED_MAX, DELTA_BLOOM_ERROR_RATE, DELTA_MAX_QUERIES
+from utils.instrumentation import metrics
+from utils.job_model import job_fingerprint, job_content_hash
+
+
+class SortedHashSet:
+    """Exact set of 64-bit hashes kept as one sorted array (8 bytes per entry)."""
+
+    def __init__(self, values=()):
+        self._values = array("Q", sorted(set(values)))
+
+    def __contains__(self, value):
+        index = bisect.bisect_left(self._values, value)
+        return index < len(self._values) and self._values[index] == value
+
+    def add_many(self, values):
+        new = [value for value in set(values) if value not in self]
+        if new:
+            self._values = array("Q", sorted(list(self._values) + new))
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def size_bytes(self):
+        return self._values.itemsize * len(self._values)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit hashes.
+
+    Membership tests can return false positives at roughly error_rate while
+    fewer than capacity values were added, never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=DELTA_BLOOM_ERROR_RATE):
+        """
+        Args:
+            capacity (int): Values the filter is sized for
+            error_rate (float): Target false positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, value):
+        # Double hashing: both halves of the 64-bit value seed the k probe positions
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def __contains__(self, value):
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def add_many(self, values):
+        bits = self._bits
+        for value in values:
+            if value in self:
+                continue
+            for pos in self._positions(value):
+                bits[pos >> 3] |= 1 << (pos & 7)
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def size_bytes(self):
+        return len(self._bits)
+
+
+class SeenSet:
+    """Seen hashes for one query: exact while small, a Bloom filter once it grows."""
+
+    def __init__(self, sorted_max=DELTA_SORTED_MAX, error_rate=DELTA_BLOOM_ERROR_RATE):
+        self.sorted_max = sorted_max
+        self.error_rate = error_rate
+        self._set = SortedHashSet()
+
+    def __contains__(self, value):
+        return value in self._set
+
+    def add_many(self, values):
+        values = list(values)
+        if isinstance(self._set, SortedHashSet) and len(self._set) + len(values) > self.sorted_max:
+            # Leave room to keep growing before the false positive rate degrades
+            bloom = BloomFilter(max(4 * self.sorted_max, 2 * (len(self._set) + len(values))), self.error_rate)
+            bloom.add_many(self._set)
+            self._set = bloom
+        self._set.add_many(values)
+
+    def __len__(self):
+        return len(self._set)
+
+    def size_bytes(self):
+        return self._set.size_bytes()
+
+
+def query_key(keywords, location, platforms=None, days_ago=None, job_filter=None):
+    """
+    Stable key for a search, independent of platform order and letter case.
+
+    Args:
+        job_filter (JobFilter, optional): Job type and experience filters also part of the search
+
+    Returns:
+        str: 16 character hex key
+    """
+    parts = [
+        " ".join(str(keywords).lower().split()),
+        " ".join(str(location).lower().split()),
+        ",".join(sorted(platform.lower() for platform in platforms or [])),
+        str(days_ago or "")
+    ]
+    if job_filter is not None and (job_filter.job_types or job_filter.experience):
+        parts.append(",".join(sorted(job_type.lower() for job_type in job_filter.job_types)))
+        parts.append(str(job_filter.experience or ""))
+    basis = "|".join(parts)
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+class DeltaTracker:
+    """Remembers which postings each owner has already seen for each query.
+
+    Per (owner, query) it keeps two seen-sets: job fingerprints, to spot new
+    postings, and content hashes, to spot postings that changed since they
+    were last shown.
+    """
+
+    def __init__(self, max_queries=DELTA_MAX_QUERIES, sorted_max=DELTA_SORTED_MAX,
+                 error_rate=DELTA_BLOOM_ERROR_RATE):
+        """
+        Args:
+            max_queries (int): (owner, query) seen-sets kept before the least recently used is dropped
+            sorted_max (int): Postings per query tracked exactly before switching to a Bloom filter
+            error_rate (float): Bloom filter false positive rate
+        """
+        self.max_queries = max_queries
+        self.sorted_max = sorted_max
+        self.error_rate = error_rate
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sets(self, owner, key, create):
+        entry = self._queries.get((owner, key))
+        if entry is None and create:
+            entry = (SeenSet(self.sorted_max, self.error_rate), SeenSet(self.sorted_max, self.error_rate))
+            self._queries[(owner, key)] = entry
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+        if entry is not None:
+            self._queries.move_to_end((owner, key))
+        return entry
+
+    def delta(self, owner, key, jobs, remember=True):
+        """
+        Keep only the postings the owner has not seen for this query, or that changed.
+
+        Args:
+            owner (str): User or session the seen-set belongs to
+            key (str): Query key, see query_key()
+            jobs (list): Job dictionaries from a search
+            remember (bool): Mark the returned postings as seen
+
+        Returns:
+            list: New or changed jobs, each copied with "delta" set to "new" or "changed"
+        """
+        hashes = [(int(job_fingerprint(job), 16), int(job_content_hash(job), 16)) for job in jobs]
+        with self._lock:
+            ids, contents = self._sets(owner, key, create=True)
+            changes = []
+            for job, (job_id, content) in zip(jobs, hashes):
+                if job_id not in ids:
+                    changes.append(dict(job, delta="new"))
+                elif content not in contents:
+                    changes.append(dict(job, delta="changed"))
+            if remember:
+                ids.add_many(job_id for job_id, _ in hashes)
+                contents.add_many(content for _, content in hashes)
+
+        metrics.inc("delta_postings_total", len(jobs) - len(changes), result="seen")
+        metrics.inc("delta_postings_total", sum(1 for job in changes if job["delta"] == "new"), result="new")
+        metrics.inc("delta_postings_total", sum(1 for job in changes if job["delta"] == "changed"), result="changed")
+        return changes
+
+    def seen_count(self, owner, key):
+        """Postings remembered for this owner and query."""
+        with self._lock:
+            entry = self._sets(owner, key, create=False)
+            return len(entry[0]) if entry else 0
+
+    def forget(self, owner, key=None):
+        """Drop one query's seen-set, or every seen-set of the owner when key is None."""
+        with self._lock:
+            for entry_key in [k for k in self._queries if k[0] == owner and (key is None or k[1] == key)]:
+                del self._queries[entry_key]
+
+    def size_bytes(self):
+        """Memory held by all seen-sets (hash storage only)."""
+        with self._lock:
+            return sum(ids.size_bytes() + contents.size_bytes() for ids, contents in self._queries.values())
+
+
+delta_tracker = DeltaTracker()
@@ -0,0 +1,250 @@
+import csv
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from config import GAZETTEER_PATH, GEO_LOOKUP_CACHE_SIZE
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Country names providers use that differ from the gazetteer's, folded to lower case
+COUNTRY_ALIASES = {
+    "usa": "US", "u.s.": "US", "u.s.a.": "US", "united states of america": "US", "america": "US",
+    "uk": "GB", "u.k.": "GB", "great britain": "GB", "britain": "GB",
+    "uae": "AE", "holland": "NL",
+}
+
+# Countries whose places are labelled by region code ("Austin, TX") rather than country
+_REGION_LABEL_COUNTRIES = ("US",)
+_COUNTRY_LABELS = {"GB": "UK"}
+
+_PARENS = re.compile(r"\([^)]*\)")
+_NUMBERS = re.compile(r"\b\d[\d-]*\b")
+_AREA = re.compile(r"^(?:greater\s+)?(.+?)(?:\s+(?:bay|metropolitan|metro))?(?:\s+area)?$")
+
+
+def _fold(text):
+    """Lower-case text without accents or repeated whitespace."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; accepts scalars or numpy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _unit_vectors(lat, lon):
+    # Points on the unit sphere: straight-line (chord) distance grows with great-circle distance
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+class Place:
+    """A canonical place from the gazetteer."""
+
+    __slots__ = ("index", "name", "region", "region_code", "country", "country_code", "lat", "lon",
+                 "population", "metro")
+
+    def __init__(self, index, name, region, region_code, country, country_code, lat, lon, population, metro):
+        self.index = index
+        self.name = name
+        self.region = region
+        self.region_code = region_code
+        self.country = country
+        self.country_code = country_code
+        self.lat = lat
+        self.lon = lon
+        self.population = population
+        self.metro = metro
+
+    @property
+    def label(self):
+        """Display name in the form the search form uses, e.g. "Austin, TX" or "London, UK"."""
+        if self.country_code in _REGION_LABEL_COUNTRIES:
+            return f"{self.name}, {self.region_code}"
+        return f"{self.name}, {_COUNTRY_LABELS.get(self.country_code, self.country)}"
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"Place({self.label!r})"
+
+
+class Gazetteer:
+    """Offline place lookup and spatial index over a bundled CSV of places.
+
+    lookup() maps the free-form location strings providers return ("Austin,
+    TX 78701", "Greater London Area", "Bengaluru, Karnataka, India") to
+    canonical places; results are memoized since a result set repeats the
+    same few strings. near() answers radius queries from a k-d tree built
+    over the places' unit-sphere coordinates.
+    """
+
+    def __init__(self, path=GAZETTEER_PATH, cache_size=GEO_LOOKUP_CACHE_SIZE):
+        """
+        Args:
+            path (str): CSV with name, aliases, region, region_code, country, country_code,
+                lat, lon, population and metro columns
+            cache_size (int): Location strings whose lookup result is memoized
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self._places = None
+        self._tree = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._places is not None:
+                return
+            places, by_name, qualifiers = [], {}, []
+            with open(self.path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    place = Place(
+                        len(places), row["name"], row["region"], row["region_code"], row["country"],
+                        row["country_code"], float(row["lat"]), float(row["lon"]), int(row["population"]),
+                        row["metro"]
+                    )
+                    places.append(place)
+                    names = [row["name"]] + [alias for alias in row["aliases"].split("|") if alias]
+                    for name in names:
+                        by_name.setdefault(_fold(name), []).append(place.index)
+                    qualifiers.append(frozenset(_fold(value) for value in (
+                        place.region, place.region_code, place.country, place.country_code
+                    )))
+
+            metros = sorted({place.metro for place in places})
+            metro_ids = {metro: i for i, metro in enumerate(metros)}
+            self.lat = np.array([place.lat for place in places])
+            self.lon = np.array([place.lon for place in places])
+            self.metro_ids = np.array([metro_ids[place.metro] for place in places])
+            self.metros = metros
+            # Most populous place of each metro, used as the metro's position
+            anchors = {}
+            for place in places:
+                anchor = anchors.get(place.metro)
+                if anchor is None or place.population > anchor.population:
+                    anchors[place.metro] = place
+            self.metro_anchors = np.array([anchors[metro].index for metro in metros])
+            self.name_ranks = np.argsort(np.argsort([_fold(place.label) for place in places], kind="stable"))
+            self._by_name = by_name
+            self._qualifiers = qualifiers
+            self._qualifier_keys = frozenset().union(*qualifiers) | frozenset(COUNTRY_ALIASES)
+            self._places = places
+
+    @property
+    def places(self):
+        if self._places is None:
+            self._load()
+        return self._places
+
+    def __len__(self):
+        return len(self.places)
+
+    def _qualifies(self, index, qualifier):
+        return qualifier in self._qualifiers[index] or COUNTRY_ALIASES.get(qualifier) == self._places[index].country_code
+
+    def _resolve(self, text):
+        folded = _NUMBERS.sub(" ", _fold(_PARENS.sub(" ", str(text or ""))))
+        parts = [part.strip(" .") for part in folded.split(",")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+
+        city, qualifiers = _AREA.match(parts[0]).group(1), parts[1:]
+        candidates = self._by_name.get(city)
+        if not candidates and not qualifiers and " " in city:
+            # "Austin TX": the last word may be a region or country
+            head, last = city.rsplit(" ", 1)
+            if last in self._qualifier_keys:
+                city, qualifiers = head, [last]
+                candidates = self._by_name.get(city)
+        if not candidates:
+            return None
+
+        if qualifiers:
+            # Prefer places matching every qualifier, then any, then ignore unknown qualifiers
+            candidates = (
+                [i for i in candidates if all(self._qualifies(i, q) for q in qualifiers)]
+                or [i for i in candidates if any(self._qualifies(i, q) for q in qualifiers)]
+                or candidates
+            )
+        return self._places[max(candidates, key=lambda i: self._places[i].population)]
+
+    def lookup(self, text):
+        """
+        Normalize a location string to a canonical place.
+
+        Args:
+            text (str): Location as written by a user or provider
+
+        Returns:
+            Place: The most populous matching place, or None if unknown (including "Remote")
+        """
+        if self._places is None:
+            self._load()
+        key = str(text or "")
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        place = self._resolve(key)
+        with self._lock:
+            self._cache[key] = place
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return place
+
+    def _get_tree(self):
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            places = self.places
+            tree = cKDTree(_unit_vectors(self.lat, self.lon)) if places else None
+            with self._lock:
+                if self._tree is None:
+                    self._tree = tree
+        return self._tree
+
+    def near(self, place, radius_km):
+        """
+        Places within radius_km of place, place itself included.
+
+        Args:
+            place (Place): Center of the search
+            radius_km (float): Search radius
+
+        Returns:
+            numpy.ndarray: Sorted gazetteer indices
+        """
+        tree = self._get_tree()
+        if tree is None:
+            return np.array([], dtype=int)
+        chord = 2 * math.sin(min(radius_km / (2 * EARTH_RADIUS_KM), math.pi / 2))
+        center = _unit_vectors(np.array([place.lat]), np.array([place.lon]))[0]
+        return np.array(sorted(tree.query_ball_point(center, chord)), dtype=int)
+
+    def nearest(self, lat, lon):
+        """Place closest to a coordinate."""
+        tree = self._get_tree()
+        if tree is None:
+            return None
+        _, index = tree.query(_unit_vectors(np.array([lat]), np.array([lon]))[0])
+        return self._places[int(index)]
+
+    def distances_km(self, place, indices):
+        """Distance from place to each gazetteer index in indices."""
+        indices = np.asarray(indices, dtype=int)
+        return haversine_km(place.lat, place.lon, self.lat[indices], self.lon[indices])
+
+
+gazetteer = Gazetteer()
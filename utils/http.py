@@ -0,0 +1,33 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name):
+    """
+    Get the process-wide requests.Session for a backend, creating it on first use.
+
+    Sharing one session per backend reuses keep-alive connections across
+    searches and users instead of opening a new TLS connection per request.
+
+    Args:
+        name (str): Backend name, e.g. "scrapingdog"
+
+    Returns:
+        requests.Session: Shared session with a sized connection pool
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+        return session
@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+from config import OWNER_TOKEN_SECRET, OWNER_SECRET_PATH
+
+
+class OwnerTokens:
+    """Issues and checks the tokens that keep a user's identity across browser sessions.
+
+    Owner IDs are random. A token is the ID plus an HMAC of it under a
+    server-side secret, so a ?user= value only counts if this server issued
+    it: a plain name, or another user's ID without its signature, is
+    rejected.
+    """
+
+    def __init__(self, secret=OWNER_TOKEN_SECRET, secret_path=OWNER_SECRET_PATH):
+        """
+        Args:
+            secret (str, optional): Signing secret; without one it is read from secret_path,
+                or generated and written there on first use
+            secret_path (str): File holding the generated secret
+        """
+        self._secret = secret.encode("utf-8") if secret else None
+        self.secret_path = secret_path
+        self._lock = threading.Lock()
+
+    def _key(self):
+        with self._lock:
+            if self._secret is None:
+                self._secret = self._load_secret()
+            return self._secret
+
+    def _load_secret(self):
+        try:
+            with open(self.secret_path, "rb") as f:
+                secret = f.read().strip()
+            if secret:
+                return secret
+        except OSError:
+            pass
+        secret = secrets.token_hex(32).encode("ascii")
+        try:
+            directory = os.path.dirname(self.secret_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.secret_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(secret)
+        except OSError as e:
+            # Tokens still work, but only until the process restarts
+            print(f"Could not write owner token secret to {self.secret_path}: {e}")
+        return secret
+
+    def _signature(self, owner):
+        return hmac.new(self._key(), owner.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def new_owner(self):
+        """A new random owner ID."""
+        return secrets.token_hex(16)
+
+    def token(self, owner):
+        """The signed token for owner, as used in the ?user= query parameter."""
+        return f"{owner}.{self._signature(owner)}"
+
+    def owner(self, token):
+        """
+        The owner ID a token was issued for.
+
+        Args:
+            token (str): Value of the ?user= query parameter
+
+        Returns:
+            str: The owner ID, or None if the token is missing or was not issued by this server
+        """
+        owner, _, signature = str(token or "").rpartition(".")
+        # Compared as bytes: compare_digest rejects non-ASCII str, and the token is user input
+        if not owner or not hmac.compare_digest(signature.encode("utf-8"), self._signature(owner).encode("utf-8")):
+            return None
+        return owner
+
+
+owner_tokens = OwnerTokens()
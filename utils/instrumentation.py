@@ -0,0 +1,360 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative on export."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Trace:
+    """Per-stage timing breakdown for a single operation, e.g. one search."""
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.spans = []
+        self.started_at = time.time()
+        self.duration_ms = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_span(self, name, duration_ms, labels):
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "duration_ms": round(duration_ms, 3),
+                "offset_ms": round((time.perf_counter() - self._start) * 1000.0 - duration_ms, 3),
+                "labels": dict(labels),
+            })
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000.0, 3)
+
+    def stage_totals(self):
+        """
+        Sum span durations per stage name.
+
+        Returns:
+            dict: Stage name -> {"count", "total_ms"}
+        """
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                stage = totals.setdefault(span["name"], {"count": 0, "total_ms": 0.0})
+                stage["count"] += 1
+                stage["total_ms"] = round(stage["total_ms"] + span["duration_ms"], 3)
+        return totals
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "trace": self.name,
+            "labels": self.labels,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": spans,
+        }
+
+
+class MetricsRegistry:
+    """Process-wide counters, histograms and exporters.
+
+    Instrumentation is cheap when nothing is listening: spans always feed the
+    in-memory histograms, and exporters are only called if one is registered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._exporters = []
+        self.last_trace = None
+
+    def add_exporter(self, exporter):
+        """
+        Register an exporter.
+
+        Args:
+            exporter: Object with export_span(name, duration_ms, labels) and
+                export_trace(trace) methods
+        """
+        with self._lock:
+            self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter):
+        with self._lock:
+            if exporter in self._exporters:
+                self._exporters.remove(exporter)
+
+    def inc(self, name, value=1, **labels):
+        """Increment a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record a value in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Time a block of code as a named stage.
+
+        The duration is recorded in the ``<name>_seconds`` histogram and, if a
+        trace is active, appended to it. Exceptions are counted in
+        ``<name>_errors_total`` and re-raised.
+
+        Args:
+            name (str): Stage name, e.g. "provider_call" or "parse"
+            **labels: Extra dimensions such as provider or platform
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(f"{name}_seconds", duration, **labels)
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add_span(name, duration * 1000.0, labels)
+            for exporter in list(self._exporters):
+                try:
+                    exporter.export_span(name, duration * 1000.0, labels)
+                except Exception as e:
+                    print(f"Metrics exporter error: {e}")
+
+    @contextmanager
+    def trace(self, name, **labels):
+        """
+        Collect all spans in this block into a Trace.
+
+        If a trace is already active the block is recorded as a span of it
+        instead, so nested components don't split one search into several
+        traces. Trace labels are kept on the Trace only, not on the
+        histogram, so free-text values like keywords don't explode the
+        metric cardinality.
+
+        Args:
+            name (str): Trace name, e.g. "search"
+            **labels: Extra dimensions attached to the trace
+
+        Yields:
+            Trace: The active trace
+        """
+        active = _current_trace.get()
+        if active is not None:
+            with self.span(name):
+                yield active
+            return
+
+        trace = Trace(name, **labels)
+        token = _current_trace.set(trace)
+        try:
+            with self.span(name):
+                yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.finish()
+            self.last_trace = trace
+            for exporter in list(self._exporters):
+                try:
+                    exporter.export_trace(trace)
+                except Exception as e:
+                    print(f"Metrics exporter error: {e}")
+
+    def snapshot(self):
+        """
+        Copy the current counters and histograms.
+
+        Returns:
+            dict: {"counters": [...], "histograms": [...]} with plain values
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": list(zip(h.buckets, h.counts)),
+                    "count": h.count,
+                    "sum": h.sum,
+                }
+                for (name, labels), h in self._histograms.items()
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def fmt_labels(labels, extra=None):
+            items = list(labels.items()) + (extra or [])
+            if not items:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in items)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+        for counter in snapshot["counters"]:
+            lines.append(f"{counter['name']}{fmt_labels(counter['labels'])} {counter['value']}")
+
+        for h in snapshot["histograms"]:
+            cumulative = 0
+            for bound, count in h["buckets"]:
+                cumulative += count
+                lines.append(f"{h['name']}_bucket{fmt_labels(h['labels'], [('le', bound)])} {cumulative}")
+            lines.append(f"{h['name']}_bucket{fmt_labels(h['labels'], [('le', '+Inf')])} {h['count']}")
+            lines.append(f"{h['name']}_count{fmt_labels(h['labels'])} {h['count']}")
+            lines.append(f"{h['name']}_sum{fmt_labels(h['labels'])} {h['sum']:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop all recorded metrics (exporters stay registered)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.last_trace = None
+
+
+class JsonLogExporter:
+    """Append spans and traces as JSON lines to a file."""
+
+    def __init__(self, path, include_spans=False):
+        """
+        Args:
+            path (str): File to append to
+            include_spans (bool): Also write every individual span, not just finished traces
+        """
+        self.path = path
+        self.include_spans = include_spans
+        self._lock = threading.Lock()
+
+    def _write(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def export_span(self, name, duration_ms, labels):
+        if self.include_spans:
+            self._write({"type": "span", "ts": time.time(), "name": name,
+                         "duration_ms": round(duration_ms, 3), "labels": labels})
+
+    def export_trace(self, trace):
+        record = trace.to_dict()
+        record["type"] = "trace"
+        self._write(record)
+
+
+class PrometheusServer:
+    """Serve the registry at /metrics on a local port."""
+
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = registry_ref.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+metrics = MetricsRegistry()
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_from_env():
+    """
+    Attach exporters configured in config.py (METRICS_JSON_LOG, METRICS_PORT).
+
+    Safe to call repeatedly; exporters are only attached once per process.
+
+    Returns:
+        MetricsRegistry: The process-wide registry
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return metrics
+        _configured = True
+
+        from config import METRICS_JSON_LOG, METRICS_PORT
+
+        if METRICS_JSON_LOG:
+            metrics.add_exporter(JsonLogExporter(METRICS_JSON_LOG))
+        if METRICS_PORT:
+            try:
+                PrometheusServer(metrics, port=int(METRICS_PORT)).start()
+            except OSError as e:
+                print(f"Could not start metrics endpoint on port {METRICS_PORT}: {e}")
+    return metrics
@@ -0,0 +1,412 @@
+import re
+
+# Canonical skill -> spellings found in postings, matched case-insensitively as whole words.
+# Words that are also plain English ("go", "r") are only matched in unambiguous forms.
+SKILLS = {
+    "Python": ("python",),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "js", "ecmascript"),
+    "TypeScript": ("typescript",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    ".NET": (".net", "dotnet", "asp.net"),
+    "Go": ("golang",),
+    "Rust": ("rust",),
+    "Ruby": ("ruby", "ruby on rails", "rails"),
+    "PHP": ("php",),
+    "Scala": ("scala",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("swift",),
+    "R": ("r programming", "rstudio", "tidyverse"),
+    "SQL": ("sql", "t-sql", "pl/sql"),
+    "MySQL": ("mysql",),
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MongoDB": ("mongodb", "mongo"),
+    "NoSQL": ("nosql",),
+    "Redis": ("redis",),
+    "Spark": ("spark", "pyspark", "apache spark"),
+    "Hadoop": ("hadoop",),
+    "Kafka": ("kafka",),
+    "Airflow": ("airflow",),
+    "Snowflake": ("snowflake",),
+    "dbt": ("dbt",),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "scikit-learn": ("scikit-learn", "sklearn", "scikit"),
+    "TensorFlow": ("tensorflow",),
+    "PyTorch": ("pytorch", "torch"),
+    "Keras": ("keras",),
+    "Machine Learning": ("machine learning", "ml"),
+    "Deep Learning": ("deep learning",),
+    "NLP": ("nlp", "natural language processing"),
+    "Computer Vision": ("computer vision",),
+    "LLMs": ("llm", "llms", "large language models", "generative ai", "genai"),
+    "AI": ("ai", "artificial intelligence"),
+    "Statistics": ("statistics", "statistical modeling", "statistical analysis"),
+    "Data Analysis": ("data analysis", "data analytics"),
+    "Data Visualization": ("data visualization", "data visualisation"),
+    "Tableau": ("tableau",),
+    "Power BI": ("power bi", "powerbi"),
+    "Excel": ("ms excel", "microsoft excel", "advanced excel", "excel spreadsheets"),
+    "AWS": ("aws", "amazon web services"),
+    "Azure": ("azure",),
+    "GCP": ("gcp", "google cloud", "google cloud platform"),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "CI/CD": ("ci/cd", "continuous integration", "continuous delivery"),
+    "Git": ("git", "github", "gitlab"),
+    "Linux": ("linux", "unix"),
+    "React": ("react", "react.js", "reactjs"),
+    "Angular": ("angular", "angularjs"),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "Node.js": ("node.js", "nodejs"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring": ("spring boot", "spring framework"),
+    "REST APIs": ("restful", "rest api", "rest apis"),
+    "GraphQL": ("graphql",),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "css3", "sass"),
+    "Android": ("android",),
+    "iOS": ("ios",),
+    "Figma": ("figma",),
+    "SEO": ("seo", "search engine optimization"),
+    "Digital Marketing": ("digital marketing", "performance marketing"),
+    "Social Media": ("social media", "social media marketing"),
+    "Email Marketing": ("email marketing", "email campaigns"),
+    "Content Creation": ("content creation", "content marketing"),
+    "Copywriting": ("copywriting", "copy writing"),
+    "Video Editing": ("video editing", "premiere pro", "final cut pro"),
+    "Photoshop": ("photoshop", "adobe photoshop"),
+    "Accounting": ("accounting", "quickbooks"),
+    "Customer Service": ("customer service", "customer support"),
+    "Google Analytics": ("google analytics",),
+    "Salesforce": ("salesforce",),
+    "Agile": ("agile", "scrum", "kanban"),
+    "Project Management": ("project management", "pmp"),
+    "Product Management": ("product management",),
+    "Communication": ("communication skills", "written and verbal communication"),
+}
+
+# Seniority levels from most junior to most senior
+SENIORITY_LEVELS = ("intern", "junior", "mid", "senior", "lead", "manager", "director")
+
+_SENIORITY_WORDS = {
+    "intern": "intern", "internship": "intern", "trainee": "intern",
+    "junior": "junior", "jr": "junior", "entry level": "junior", "graduate": "junior", "associate": "junior",
+    "mid level": "mid", "intermediate": "mid",
+    "senior": "senior", "sr": "senior",
+    "lead": "lead", "staff": "lead", "principal": "lead", "architect": "lead",
+    "manager": "manager", "head of": "director", "director": "director", "vp": "director",
+    "vice president": "director", "chief": "director",
+}
+
+_EMPLOYMENT_WORDS = {
+    "full time": "Full-time", "fulltime": "Full-time", "part time": "Part-time", "parttime": "Part-time",
+    "contract": "Contract", "contractor": "Contract", "freelance": "Contract",
+    "internship": "Internship", "temporary": "Temporary",
+}
+
+_WORK_MODE_WORDS = {
+    "remote": "remote", "fully remote": "remote", "work from home": "remote", "wfh": "remote",
+    "hybrid": "hybrid", "on site": "onsite", "onsite": "onsite", "in office": "onsite",
+}
+
+_CURRENCIES = {"$": "USD", "£": "GBP", "€": "EUR", "₹": "INR", "usd": "USD", "gbp": "GBP", "eur": "EUR",
+               "inr": "INR", "rs": "INR", "rs.": "INR"}
+_MULTIPLIERS = {"k": 1e3, "m": 1e6, "l": 1e5, "lakh": 1e5, "lakhs": 1e5, "lpa": 1e5, "cr": 1e7, "crore": 1e7}
+_PERIODS = {"hour": "hour", "hr": "hour", "hourly": "hour", "day": "day", "daily": "day", "week": "week",
+            "weekly": "week", "month": "month", "mo": "month", "monthly": "month", "year": "year", "yr": "year",
+            "annum": "year", "annual": "year", "annually": "year"}
+
+# Multipliers turning a salary per period into a yearly figure
+ANNUAL_FACTORS = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+_NUMBER = r"\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_UNIT = r"\s?(?:k|m|lakhs?|lpa|l|cr|crore)\b"
+_SALARY = (
+    r"(?P<cur>[$£€₹]|\b(?:usd|gbp|eur|inr|rs\.?)\s?)\s?(?P<lo>" + _NUMBER + r")(?P<lo_unit>" + _UNIT + r")?"
+    r"(?:\s?(?:-|–|—|to)\s?(?:[$£€₹]|(?:usd|gbp|eur|inr|rs\.?)\s?)?\s?(?P<hi>" + _NUMBER + r")(?P<hi_unit>" + _UNIT + r")?)?"
+    r"(?:\s?(?:per|an|a|/)\s?(?P<per>hour|hr|day|week|month|mo|year|yr|annum)\b|\s(?P<per_word>hourly|daily|weekly|monthly|annually|annual)\b)?"
+)
+_YEARS = r"(?P<years>\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b"
+
+
+def _phrase(text):
+    """Lookup form of a matched word or phrase: hyphens as spaces, single spaces."""
+    return " ".join(text.replace("-", " ").split())
+
+
+def _phrase_table():
+    """Phrase -> [(attribute, value), ...] over every word list; "internship" is both a level and a job type."""
+    skills = {alias: skill for skill, aliases in SKILLS.items() for alias in aliases}
+    table = {}
+    for attribute, words in (("skill", skills), ("level", _SENIORITY_WORDS), ("employment", _EMPLOYMENT_WORDS),
+                             ("mode", _WORK_MODE_WORDS)):
+        for word, value in words.items():
+            table.setdefault(_phrase(word), []).append((attribute, value))
+    return table
+
+
+_PHRASES = _phrase_table()
+
+
+def _trie_pattern(words):
+    """Regex matching any of words, factored into a prefix trie.
+
+    A flat alternation of a few hundred phrases is tried branch by branch
+    at every position; the trie rejects most positions on the first character.
+    Longer words are preferred where one word is a prefix of another, and
+    spaces match any run of whitespace or hyphens.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [
+            (r"[\s-]+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+# Every attribute in one alternation, so a posting's text is scanned once: salary,
+# years, and one trie over all skill, seniority, job type and work mode phrases.
+# Each starts a token, so positions inside a word are rejected before any branch is
+# tried. Matched against lower-cased text, which is faster than re.IGNORECASE.
+ATTRIBUTE_PATTERN = re.compile(
+    r"(?<![\w+#.])(?:" + _SALARY + "|" + _YEARS + r"|(?P<phrase>" + _trie_pattern(_PHRASES) + r")(?![\w+#]|\.\w))"
+)
+_LOOSE_SALARY_PATTERN = re.compile(
+    r"(?P<cur>[$£€₹])?\s?(?P<lo>" + _NUMBER + r")(?P<lo_unit>" + _UNIT + r")?"
+    r"(?:\s?(?:-|–|—|to)\s?[$£€₹]?\s?(?P<hi>" + _NUMBER + r")(?P<hi_unit>" + _UNIT + r")?)?"
+    r"(?:\s?(?:per|an|a|/)\s?(?P<per>hour|hr|day|week|month|mo|year|yr|annum)\b|\s(?P<per_word>hourly|daily|weekly|monthly|annually|annual)\b)?",
+    re.IGNORECASE
+)
+_YEARS_PATTERN = re.compile(_YEARS, re.IGNORECASE)
+
+
+def parse_min_years(text):
+    """Smallest "N years" requirement mentioned in text, NaN if none."""
+    years = [int(match.group("years")) for match in _YEARS_PATTERN.finditer(str(text or ""))]
+    years = [value for value in years if value <= 40]
+    return float(min(years)) if years else float("nan")
+
+
+def _amount(number, unit):
+    value = float(number.replace(",", ""))
+    if unit:
+        value *= _MULTIPLIERS.get(unit.strip().lower(), 1)
+    return value
+
+
+def _salary(match, default_currency=None, strict=True):
+    """(min, max, currency, period) from a salary match, None if it does not look like pay."""
+    lo_unit, hi_unit = match.group("lo_unit"), match.group("hi_unit")
+    if match.group("hi") and not lo_unit:
+        lo_unit = hi_unit  # "120-150K" applies the unit to both ends
+    low = _amount(match.group("lo"), lo_unit)
+    high = _amount(match.group("hi"), hi_unit) if match.group("hi") else low
+    currency = match.group("cur")
+    currency = _CURRENCIES.get(currency.strip().lower(), currency.strip()) if currency else default_currency
+    period = _PERIODS.get((match.group("per") or match.group("per_word") or "").lower())
+    if period is None and strict and not match.group("hi") and not lo_unit:
+        return None  # a lone "$5" in running text is rarely pay
+    if period is None:
+        # Without a stated period, small amounts are hourly rates and large ones yearly
+        period = "hour" if high < 500 else "year"
+    if low <= 0 or high < low or (period == "year" and high < 1000):
+        return None
+    return low, high, currency, period
+
+
+def parse_salary(text, default_currency=None):
+    """
+    First salary range in text, with or without a currency symbol.
+
+    Args:
+        text (str): Salary text such as "120K–150K a year" or "$50 an hour"
+        default_currency (str, optional): Currency when the text names none
+
+    Returns:
+        tuple: (min, max, currency, period) or None
+    """
+    for match in _LOOSE_SALARY_PATTERN.finditer(str(text or "")):
+        salary = _salary(match, default_currency, strict=False)
+        if salary is not None:
+            return salary
+    return None
+
+
+def extract_attributes(job, extensions=None):
+    """
+    Extract typed attributes from a job in one scan of its text, and store them on the job.
+
+    Title, location, job type and description are scanned together once.
+    Salary, years, work mode and employment type take the first mention;
+    seniority comes from the title, or else from the years required; skills
+    are collected in order of first mention. A missing job type is filled
+    from the description. Filters and ranking read these fields instead of
+    rescanning the description.
+
+    Args:
+        job (dict): Job dictionary, updated in place
+        extensions (dict, optional): Provider's structured hints, e.g. ScrapingDog's
+            detected_extensions (salary, work_from_home, schedule_type)
+
+    Returns:
+        dict: The same job
+    """
+    extensions = extensions or {}
+    title = str(job.get("title") or "").lower()
+    text = "\n".join((title, str(job.get("location") or ""), str(job.get("job_type") or ""),
+                      str(job.get("description") or ""))).lower()
+
+    salary = parse_salary(extensions["salary"]) if extensions.get("salary") else None
+    years = title_level = work_mode = employment = None
+    skills = {}
+    for match in ATTRIBUTE_PATTERN.finditer(text):
+        if match.group("lo") is not None:
+            if salary is None:
+                salary = _salary(match)
+            continue
+        if match.group("years") is not None:
+            value = int(match.group("years"))
+            if value <= 40 and (years is None or value < years):
+                years = value
+            continue
+        for attribute, value in _PHRASES.get(_phrase(match.group("phrase")), ()):
+            if attribute == "skill":
+                skills.setdefault(value, None)
+            elif attribute == "mode":
+                work_mode = work_mode or value
+            elif attribute == "employment":
+                employment = employment or value
+            elif match.start() < len(title):
+                # The most senior word in the title wins: "Associate Director" is a director
+                if title_level is None or SENIORITY_LEVELS.index(value) > SENIORITY_LEVELS.index(title_level):
+                    title_level = value
+
+    if extensions.get("work_from_home") or str(job.get("location") or "").strip().lower() == "anywhere":
+        work_mode = "remote"
+    seniority = title_level
+    if seniority is None and years is not None:
+        seniority = "junior" if years < 2 else ("mid" if years < 5 else "senior")
+
+    job["salary_min"], job["salary_max"], job["salary_currency"], job["salary_period"] = salary or (None,) * 4
+    job["min_years"] = years
+    job["seniority"] = seniority
+    job["work_mode"] = work_mode
+    job["skills"] = list(skills)
+    if employment and str(job.get("job_type") or "").lower() in ("", "not specified", "unknown"):
+        job["job_type"] = employment
+    return job
+
+
+# Fields set by extract_attributes
+EXTRACTED_FIELDS = ("salary_min", "salary_max", "salary_currency", "salary_period", "min_years", "seniority",
+                    "work_mode", "skills")
+_TEXT_FIELDS = ("title", "location", "job_type", "description")
+
+
+def _extract_chunk(columns, start, stop):
+    """Worker task: extracted fields for rows start:stop of a shared batch."""
+    results = []
+    work_from_home = columns.array("work_from_home")
+    for row in range(start, stop):
+        job = {field: columns.text(field, row) for field in _TEXT_FIELDS}
+        extensions = {"salary": columns.text("salary", row), "work_from_home": bool(work_from_home[row])}
+        job_type = job["job_type"]
+        extract_attributes(job, extensions)
+        result = {field: job[field] for field in EXTRACTED_FIELDS}
+        if job["job_type"] != job_type:
+            result["job_type"] = job["job_type"]
+        results.append(result)
+    return results
+
+
+def extract_all(jobs, extensions=None):
+    """
+    extract_attributes over a batch of jobs, in worker processes when the batch is large.
+
+    Large batches go to the process pool as shared text columns, so the
+    regex scan does not hold the GIL other sessions need.
+
+    Args:
+        jobs (list): Job dictionaries, updated in place
+        extensions (list, optional): Provider hints per job, see extract_attributes
+
+    Returns:
+        list: The same jobs
+    """
+    from utils.parallel import SharedColumns, process_pool
+
+    extensions = extensions or [None] * len(jobs)
+    if not process_pool.offload(len(jobs)):
+        for job, job_extensions in zip(jobs, extensions):
+            extract_attributes(job, job_extensions)
+        return jobs
+
+    import numpy as np
+
+    texts = {field: [job.get(field) for job in jobs] for field in _TEXT_FIELDS}
+    texts["salary"] = [(job_extensions or {}).get("salary") for job_extensions in extensions]
+    arrays = {"work_from_home": np.array(
+        [bool((job_extensions or {}).get("work_from_home")) for job_extensions in extensions], dtype=bool
+    )}
+    with SharedColumns(arrays, texts) as columns:
+        chunks = process_pool.map(_extract_chunk, columns, len(jobs), stage="extract_attributes")
+    for job, result in zip(jobs, (result for chunk in chunks for result in chunk)):
+        job.update(result)
+    return jobs
+
+
+def extract_skills(text):
+    """
+    Canonical skills mentioned in free text, such as a resume's skill list.
+
+    Args:
+        text (str): Text to scan
+
+    Returns:
+        list: Skill names from SKILLS, in order of first mention
+    """
+    skills = {}
+    for match in ATTRIBUTE_PATTERN.finditer(str(text or "").lower()):
+        if match.group("phrase") is not None:
+            for attribute, value in _PHRASES.get(_phrase(match.group("phrase")), ()):
+                if attribute == "skill":
+                    skills.setdefault(value, None)
+    return list(skills)
+
+
+def annual_salary(job, field="salary_max"):
+    """Yearly equivalent of a job's salary_min or salary_max, None if unknown."""
+    value, period = job.get(field), job.get("salary_period")
+    if value is None or period not in ANNUAL_FACTORS:
+        return None
+    return value * ANNUAL_FACTORS[period]
+
+
+def format_salary(job):
+    """Short salary text such as "$120K–150K/yr", "" if unknown."""
+    low, high = job.get("salary_min"), job.get("salary_max")
+    if low is None:
+        return ""
+    symbol = {"USD": "$", "GBP": "£", "EUR": "€", "INR": "₹"}.get(job.get("salary_currency"), "")
+    short = lambda value: (f"{value / 1e6:g}M" if value >= 1e6 else
+                           f"{value / 1e3:g}K" if value >= 1e3 else f"{value:g}")
+    amount = short(low) if high in (None, low) else f"{short(low)}–{short(high)}"
+    suffix = {"hour": "/hr", "day": "/day", "week": "/wk", "month": "/mo", "year": "/yr"}.get(job.get("salary_period"), "")
+    return f"{symbol}{amount}{suffix}"
@@ -0,0 +1,494 @@
+import re
+
+import numpy as np
+
+from config import JOB_PLATFORMS
+from utils.companies import companies, company_id
+from utils.geo import gazetteer
+from utils.job_attributes import ANNUAL_FACTORS, SENIORITY_LEVELS, SKILLS, parse_min_years
+
+# Predicate names, as used in ProviderCapabilities.filter_pushdown
+PLATFORM = "platform"
+JOB_TYPE = "job_type"
+RECENCY = "recency"
+LOCATION = "location"
+EXPERIENCE = "experience"
+RADIUS = "radius"
+SALARY = "salary"
+SENIORITY = "seniority"
+WORK_MODE = "work_mode"
+SKILL = "skills"
+
+# Job types a provider can filter on natively; "Remote" is checked locally
+EMPLOYMENT_TYPES = {
+    "full-time": "FULLTIME",
+    "part-time": "PARTTIME",
+    "contract": "CONTRACTOR",
+    "internship": "INTERN",
+}
+
+# Upper bound in years of each experience option in the search form, None = no upper bound
+EXPERIENCE_RANGES = {"0-1": 1, "1-3": 3, "3-5": 5, "5-10": 10, "10+": None}
+
+_AGE_UNITS = {"minute": 1 / 1440.0, "hour": 1 / 24.0, "day": 1, "week": 7, "month": 30, "year": 365}
+_AGE_PATTERN = re.compile(r"(\d+)\+?\s*(minute|hour|day|week|month|year)")
+_REMOTE_PATTERN = re.compile(r"remote|work from home|wfh|anywhere", re.IGNORECASE)
+
+
+def parse_age_days(date_posted):
+    """
+    Age in days of a relative posting date such as "3 days ago".
+
+    Args:
+        date_posted (str): Provider's posting date text
+
+    Returns:
+        float: Age in days, 0 for "today"/"just posted", NaN if unknown
+    """
+    text = str(date_posted or "").lower()
+    match = _AGE_PATTERN.search(text)
+    if match:
+        return int(match.group(1)) * _AGE_UNITS[match.group(2)]
+    if "today" in text or "just" in text:
+        return 0.0
+    return float("nan")
+
+
+def canonical_platform(via):
+    """Lower-cased known platform named in a provider's "via" text, else the text itself."""
+    text = str(via or "").lower()
+    for platform in JOB_PLATFORMS:
+        if platform.lower() in text:
+            return platform.lower()
+    return text
+
+
+def _job_type_text(job_type):
+    text = str(job_type or "").lower()
+    return "" if text in ("not specified", "unknown") else text
+
+
+def _place_index(location):
+    place = gazetteer.lookup(location)
+    return place.index if place is not None else -1
+
+
+def _center(near):
+    return near if near is None or hasattr(near, "lat") else gazetteer.lookup(near)
+
+
+def _extracted(field, fallback):
+    """Column value from the attribute extracted at ingestion, or fallback(job) for jobs without it."""
+    def value(job):
+        if field in job:
+            result = job[field]
+            return float("nan") if result is None else result
+        return fallback(job)
+    return value
+
+
+def _annual(field):
+    def value(job):
+        amount = job.get(field)
+        factor = ANNUAL_FACTORS.get(job.get("salary_period"))
+        return float("nan") if amount is None or factor is None else amount * factor
+    return value
+
+
+def _work_mode(job):
+    if "work_mode" in job:
+        return job["work_mode"] or ""
+    return "remote" if _REMOTE_PATTERN.search(
+        f"{job.get('location', '')} {job.get('job_type', '')} {job.get('title', '')}"
+    ) else ""
+
+
+_SKILL_IDS = {skill.lower(): i for i, skill in enumerate(SKILLS)}
+
+
+def platform_matches(via, platform):
+    """Scalar platform predicate, shared by providers that filter while they parse."""
+    if not platform or platform.lower() == "all":
+        return True
+    return platform.lower() in str(via or "").lower()
+
+
+# Predicate name -> JobFilter attributes it reads
+_FIELDS = (
+    (PLATFORM, ("platforms",)),
+    (JOB_TYPE, ("job_types",)),
+    (RECENCY, ("max_age_days",)),
+    (LOCATION, ("locations",)),
+    (EXPERIENCE, ("experience",)),
+    (RADIUS, ("near", "radius_km")),
+    (SALARY, ("min_salary",)),
+    (SENIORITY, ("seniority",)),
+    (WORK_MODE, ("work_modes",)),
+    (SKILL, ("skills",)),
+)
+
+
+class JobFilter:
+    """Structured search filters, evaluated as one predicate per field."""
+
+    def __init__(self, platforms=None, job_types=None, max_age_days=None, locations=None, experience=None,
+                 near=None, radius_km=None, min_salary=None, seniority=None, work_modes=None, skills=None):
+        """
+        Args:
+            platforms (list, optional): Keep jobs posted via any of these platforms
+            job_types (list, optional): Keep jobs of any of these types, e.g. "Full-time", "Remote"
+            max_age_days (float, optional): Keep jobs posted within this many days
+            locations (list, optional): Keep jobs whose location mentions any of these ("Remote" matches remote jobs)
+            experience (str, optional): Experience option from the search form, e.g. "3-5"
+            near (str, optional): Location to measure radius_km from, e.g. "Austin, TX"
+            radius_km (float, optional): Keep jobs located within this distance of near
+            min_salary (float, optional): Keep jobs whose top yearly salary reaches this amount
+            seniority (list, optional): Keep jobs at any of these levels, see SENIORITY_LEVELS
+            work_modes (list, optional): Keep jobs with any of these modes: "remote", "hybrid", "onsite"
+            skills (list, optional): Keep jobs asking for any of these skills, see SKILLS
+        """
+        self.platforms = list(platforms or [])
+        self.job_types = list(job_types or [])
+        self.max_age_days = max_age_days
+        self.locations = list(locations or [])
+        self.experience = experience
+        self.near = near
+        self.radius_km = radius_km
+        self.min_salary = min_salary
+        self.seniority = list(seniority or [])
+        self.work_modes = list(work_modes or [])
+        self.skills = list(skills or [])
+
+    def active(self):
+        """Names of the predicates this filter actually constrains."""
+        names = []
+        if self.platforms:
+            names.append(PLATFORM)
+        if self.job_types:
+            names.append(JOB_TYPE)
+        if self.max_age_days is not None:
+            names.append(RECENCY)
+        if self.locations:
+            names.append(LOCATION)
+        if self.experience and EXPERIENCE_RANGES.get(self.experience) is not None:
+            names.append(EXPERIENCE)
+        if self.near and self.radius_km is not None:
+            names.append(RADIUS)
+        if self.min_salary is not None:
+            names.append(SALARY)
+        if self.seniority:
+            names.append(SENIORITY)
+        if self.work_modes:
+            names.append(WORK_MODE)
+        if self.skills:
+            names.append(SKILL)
+        return names
+
+    def pushdown(self, supported):
+        """
+        Split into the part a provider applies itself and the part left to apply locally.
+
+        A job_type predicate is only pushed down when every selected type has
+        a native employment type.
+
+        Args:
+            supported (iterable): Predicate names the provider handles natively
+
+        Returns:
+            tuple: (pushed, residual) JobFilter objects
+        """
+        supported = set(supported)
+        if self.job_types and not all(job_type.lower() in EMPLOYMENT_TYPES for job_type in self.job_types):
+            supported.discard(JOB_TYPE)
+        pushed, residual = JobFilter(), JobFilter()
+        for name, attributes in _FIELDS:
+            target = pushed if name in supported else residual
+            for attribute in attributes:
+                setattr(target, attribute, getattr(self, attribute))
+        return pushed, residual
+
+    def employment_types(self):
+        """Native employment type codes for the selected job types that have one."""
+        return [EMPLOYMENT_TYPES[job_type.lower()] for job_type in self.job_types if job_type.lower() in EMPLOYMENT_TYPES]
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class JobTable:
+    """Columnar view of a job list, filtered with boolean masks.
+
+    Each column is parsed from the job dictionaries the first time a filter
+    needs it; every filter after that is a handful of vectorized array
+    operations instead of a Python loop over job dictionaries. Attributes
+    extracted at ingestion (salary, seniority, years, work mode, skills) are
+    read as they are; only jobs without them fall back to parsing text.
+    """
+
+    # Column name -> (dtype, function computing the value from one job)
+    COLUMNS = {
+        "platform": (str, lambda job: canonical_platform(job.get("platform"))),
+        "job_type": (str, lambda job: _job_type_text(job.get("job_type"))),
+        "location": (str, lambda job: str(job.get("location") or "").lower()),
+        "title": (str, lambda job: " ".join(str(job.get("title") or "").lower().split())),
+        "job_id": (str, lambda job: str(job.get("job_id") or "")),
+        "company": (int, company_id),
+        "age_days": (float, lambda job: parse_age_days(job.get("date_posted"))),
+        "min_years": (float, _extracted("min_years", lambda job: parse_min_years(
+            f"{job.get('title', '')} {job.get('description', '')}"
+        ))),
+        "place": (int, lambda job: _place_index(job.get("location"))),
+        "work_mode": (str, _work_mode),
+        "remote": (bool, lambda job: _work_mode(job) == "remote"),
+        "salary_min": (float, _annual("salary_min")),  # yearly, NaN if unknown
+        "salary_max": (float, _annual("salary_max")),
+        "seniority": (int, lambda job: SENIORITY_LEVELS.index(job["seniority"]) if job.get("seniority") else -1),
+    }
+
+    def __init__(self, jobs):
+        """
+        Args:
+            jobs (list): Job dictionaries; the table keeps a reference, not a copy
+        """
+        self.jobs = jobs
+
+    def __getattr__(self, name):
+        if name not in JobTable.COLUMNS:
+            raise AttributeError(name)
+        dtype, value = JobTable.COLUMNS[name]
+        column = np.array([value(job) for job in self.jobs], dtype=dtype).reshape(len(self.jobs))
+        # Later lookups find the column as a plain attribute and skip __getattr__
+        setattr(self, name, column)
+        return column
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @property
+    def skill_matrix(self):
+        """Boolean matrix of rows by SKILLS, True where the job asks for the skill."""
+        matrix = self.__dict__.get("_skill_matrix")
+        if matrix is None:
+            matrix = np.zeros((len(self), len(_SKILL_IDS)), dtype=bool)
+            rows, columns = [], []
+            for row, job in enumerate(self.jobs):
+                for skill in job.get("skills") or ():
+                    column = _SKILL_IDS.get(skill.lower())
+                    if column is not None:
+                        rows.append(row)
+                        columns.append(column)
+            matrix[rows, columns] = True
+            self._skill_matrix = matrix
+        return matrix
+
+    def _contains_any(self, column, needles):
+        mask = np.zeros(len(self), dtype=bool)
+        for needle in needles:
+            mask |= np.char.find(column, needle.lower()) >= 0
+        return mask
+
+    def mask(self, job_filter):
+        """
+        Evaluate a filter over every row.
+
+        Rows with an unknown job type, posting date, experience requirement,
+        salary or seniority pass the matching predicate; an unknown work mode
+        does not. A radius keeps only rows whose location
+        resolves to a place within it, and is ignored when its center is
+        not a known place (e.g. "Remote").
+
+        Args:
+            job_filter (JobFilter): Filter to apply
+
+        Returns:
+            numpy.ndarray: Boolean mask, True for rows to keep
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if not len(self) or job_filter is None:
+            return keep
+
+        if job_filter.platforms:
+            keep &= self._contains_any(self.platform, job_filter.platforms)
+
+        if job_filter.job_types:
+            typed = [job_type for job_type in job_filter.job_types if job_type.lower() != "remote"]
+            matches = self._contains_any(self.job_type, [job_type.replace("-", "") for job_type in typed])
+            matches |= self._contains_any(self.job_type, typed)
+            if len(typed) < len(job_filter.job_types):
+                matches |= self.remote
+            keep &= matches | (self.job_type == "")
+
+        if job_filter.max_age_days is not None:
+            keep &= np.isnan(self.age_days) | (self.age_days <= job_filter.max_age_days)
+
+        if job_filter.locations:
+            places = [place.split(",")[0].strip() for place in job_filter.locations if place.lower() != "remote"]
+            matches = self._contains_any(self.location, places)
+            if len(places) < len(job_filter.locations):
+                matches |= self.remote
+            keep &= matches
+
+        max_years = EXPERIENCE_RANGES.get(job_filter.experience) if job_filter.experience else None
+        if max_years is not None:
+            keep &= np.isnan(self.min_years) | (self.min_years <= max_years)
+
+        center = _center(job_filter.near) if job_filter.radius_km is not None else None
+        if center is not None:
+            keep &= np.isin(self.place, gazetteer.near(center, job_filter.radius_km))
+
+        if job_filter.min_salary is not None:
+            keep &= np.isnan(self.salary_max) | (self.salary_max >= job_filter.min_salary)
+
+        if job_filter.seniority:
+            levels = [SENIORITY_LEVELS.index(level) for level in job_filter.seniority if level in SENIORITY_LEVELS]
+            keep &= np.isin(self.seniority, levels + [-1])
+
+        if job_filter.work_modes:
+            keep &= np.isin(self.work_mode, [mode.lower() for mode in job_filter.work_modes])
+
+        if job_filter.skills:
+            columns = [_SKILL_IDS[skill.lower()] for skill in job_filter.skills if skill.lower() in _SKILL_IDS]
+            keep &= self.skill_matrix[:, columns].any(axis=1)
+
+        return keep
+
+    def rows(self, job_filter):
+        """Indices of the rows passing job_filter, in table order."""
+        return np.flatnonzero(self.mask(job_filter))
+
+    def take(self, rows):
+        """Jobs at the given row indices, in that order."""
+        return [self.jobs[i] for i in rows]
+
+    def order_by_age(self, rows=None):
+        """Row indices sorted newest first, unknown ages last."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        ages = np.where(np.isnan(self.age_days[rows]), np.inf, self.age_days[rows])
+        return rows[np.argsort(ages, kind="stable")]
+
+    def order_by_salary(self, rows=None):
+        """Row indices sorted by top yearly salary, highest first, unknown salaries last."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        salaries = np.where(np.isnan(self.salary_max[rows]), -np.inf, self.salary_max[rows])
+        return rows[np.argsort(-salaries, kind="stable")]
+
+    def order_by_score(self, scores, rows=None):
+        """Row indices sorted by a per-row score array, highest first."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        return rows[np.argsort(-np.asarray(scores)[rows], kind="stable")]
+
+    def order_by_company(self, rows=None):
+        """Row indices sorted by canonical company name, using the interned sort ranks."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        # Building the company column interns new names, so it must come before the ranks
+        ids = self.company[rows]
+        return rows[np.argsort(companies.ranks()[ids], kind="stable")]
+
+    def company_groups(self, rows=None):
+        """
+        Group rows by canonical company.
+
+        Returns:
+            dict: Company ID -> row indices, in table order within each group
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        ids = self.company[rows]
+        order = np.argsort(ids, kind="stable")
+        unique_ids, starts = np.unique(ids[order], return_index=True)
+        return {int(cid): group for cid, group in zip(unique_ids, np.split(rows[order], starts[1:]))}
+
+    def dedupe(self, rows=None):
+        """
+        Drop repeated postings.
+
+        Rows with a provider job_id are the same posting only when their
+        job_id is, so separate openings with the same title at one company
+        and place are kept. Rows without one match on canonical company,
+        title, place and platform; locations that are not in the gazetteer
+        compare as written.
+
+        Returns:
+            numpy.ndarray: Row indices of the first occurrence of each posting, in table order
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        if not len(rows):
+            return rows
+        job_ids = self.job_id[rows]
+        fuzzy = job_ids == ""
+        places = self.place[rows]
+        keys = np.rec.fromarrays([
+            job_ids,
+            np.where(fuzzy, self.company[rows], -1),
+            np.where(fuzzy, places, -1),
+            np.where(fuzzy & (places < 0), self.location[rows], ""),
+            np.where(fuzzy, self.title[rows], ""),
+            np.where(fuzzy, self.platform[rows], ""),
+        ])
+        _, first = np.unique(keys, return_index=True)
+        return rows[np.sort(first)]
+
+    def distances_km(self, near, rows=None):
+        """Distance in km from near to each row's place, NaN where the location is unknown."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        center = _center(near)
+        places = self.place[rows]
+        if center is None:
+            return np.full(len(rows), np.nan)
+        distances = gazetteer.distances_km(center, np.maximum(places, 0))
+        return np.where(places >= 0, distances, np.nan)
+
+    def metro_groups(self, rows=None):
+        """
+        Group rows by metro area.
+
+        Returns:
+            dict: Metro name -> row indices, in metro name order; rows with an
+                unknown location are left out
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        rows = rows[self.place[rows] >= 0]
+        metros = gazetteer.metro_ids[self.place[rows]]
+        order = np.argsort(metros, kind="stable")
+        ids, starts = np.unique(metros[order], return_index=True)
+        return {
+            gazetteer.metros[metro]: group
+            for metro, group in zip(ids, np.split(rows[order], starts[1:]))
+        }
+
+    def order_by_location(self, rows=None, near=None):
+        """
+        Row indices grouped by metro area, unknown locations last.
+
+        With near, metros are ordered by distance from it and rows within a
+        metro by their own distance; otherwise both are alphabetical.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        places = self.place[rows]
+        known = places >= 0
+        safe = np.maximum(places, 0)
+        metros = gazetteer.metro_ids[safe]
+        center = _center(near)
+        if center is not None:
+            metro_key = gazetteer.distances_km(center, gazetteer.metro_anchors[metros])
+            place_key = gazetteer.distances_km(center, safe)
+        else:
+            metro_key = metros.astype(float)
+            place_key = gazetteer.name_ranks[safe].astype(float)
+        metro_key = np.where(known, metro_key, np.inf)
+        place_key = np.where(known, place_key, np.inf)
+        # lexsort sorts by the last key first
+        return rows[np.lexsort((place_key, metros, metro_key))]
+
+
+def dedupe_jobs(jobs):
+    """Remove repeated postings from a job list, keeping the first of each."""
+    table = JobTable(jobs)
+    return table.take(table.dedupe())
+
+
+def filter_jobs(jobs, job_filter):
+    """Apply a JobFilter to a job list."""
+    if job_filter is None or not job_filter.active():
+        return list(jobs)
+    table = JobTable(jobs)
+    return table.take(table.rows(job_filter))
@@ -0,0 +1,175 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from config import JOB_DETAIL_CACHE_SIZE
+from utils.companies import companies, company_id
+from utils.instrumentation import metrics
+
+# Fields that only the job detail view needs; list views hold everything else
+DETAIL_FIELDS = ("description",)
+
+# Fields whose change makes a previously seen posting count as updated.
+# date_posted is left out because its relative text ("2 days ago") changes daily.
+CONTENT_FIELDS = ("title", "company", "location", "job_type", "apply_url", "description")
+
+
+def job_fingerprint(job):
+    """
+    Stable identifier for a job listing.
+
+    Uses the provider's job_id when there is one, otherwise the normalized
+    title, canonical company, location and platform.
+
+    Args:
+        job (dict): Job dictionary
+
+    Returns:
+        str: 16 character hex fingerprint
+    """
+    if job.get("job_id"):
+        basis = f"id:{job['job_id']}"
+    else:
+        basis = "|".join(
+            " ".join(str(value or "").lower().split())
+            for value in (job.get("title"), companies.key(company_id(job)), job.get("location"), job.get("platform"))
+        )
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def job_content_hash(job):
+    """
+    Hash of the fields a user would notice changing in a posting.
+
+    Args:
+        job (dict): Job dictionary
+
+    Returns:
+        str: 16 character hex hash
+    """
+    basis = "\x1f".join(" ".join(str(job.get(field) or "").split()) for field in CONTENT_FIELDS)
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+class JobDetailStore:
+    """Bounded, process-wide LRU of job details keyed by job fingerprint.
+
+    Details live here once per process instead of inside every session's
+    result list, so sessions only pay for the jobs they actually open.
+    """
+
+    def __init__(self, max_entries=JOB_DETAIL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, details):
+        with self._lock:
+            self._entries[key] = details
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with metrics.span("cache_lookup", cache="job_details"):
+            with self._lock:
+                details = self._entries.get(key)
+                if details is not None:
+                    self._entries.move_to_end(key)
+        metrics.inc("cache_requests_total", cache="job_details", result="hit" if details is not None else "miss")
+        return details
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+detail_store = JobDetailStore()
+
+
+def _detail_fields(job):
+    return {field: job[field] for field in DETAIL_FIELDS if field in job}
+
+
+def summarize_job(job, store=None):
+    """
+    Split a full job into a lightweight summary and stored details.
+
+    Args:
+        job (dict): Full job dictionary as returned by a search provider
+        store (JobDetailStore, optional): Where to keep the details, defaults to detail_store
+
+    Returns:
+        dict: The job without detail fields, plus "job_key" and "has_description"
+    """
+    store = store if store is not None else detail_store
+    key = job.get("job_key") or job_fingerprint(job)
+    details = _detail_fields(job)
+    if details:
+        store.put(key, details)
+
+    summary = {field: value for field, value in job.items() if field not in DETAIL_FIELDS}
+    summary["job_key"] = key
+    summary["has_description"] = bool(details.get("description")) or job.get("has_description", False)
+    return summary
+
+
+def summarize_jobs(jobs, store=None):
+    """
+    summarize_job over a job list, also returning the details it split off.
+
+    The details are meant to be kept with the summaries (see
+    utils.result_store), so they outlive the bounded detail store.
+
+    Args:
+        jobs (list): Full job dictionaries
+        store (JobDetailStore, optional): Where to keep the details, defaults to detail_store
+
+    Returns:
+        tuple: (summaries, details), details maps job_key to its detail fields
+    """
+    summaries = []
+    details = {}
+    for job in jobs:
+        summary = summarize_job(job, store)
+        job_details = _detail_fields(job)
+        if job_details:
+            details[summary["job_key"]] = job_details
+        summaries.append(summary)
+    return summaries, details
+
+
+def load_job_details(summary, provider=None, store=None, results=None):
+    """
+    Fetch the details for a job summary, from the store, its result set or else the provider.
+
+    Args:
+        summary (dict): Job summary produced by summarize_job
+        provider (optional): Object with get_job_details(job_id), used on a cache miss
+        store (JobDetailStore, optional): Detail store, defaults to detail_store
+        results (optional): Object with job_details(job_key), such as the ResultSet
+            the summary came from, tried before the provider
+
+    Returns:
+        dict: Detail fields such as "description", empty if unavailable
+    """
+    store = store if store is not None else detail_store
+    key = summary.get("job_key") or job_fingerprint(summary)
+
+    details = store.get(key)
+    if details is not None:
+        return details
+
+    if results is not None:
+        details = results.job_details(key)
+        if details:
+            store.put(key, details)
+            return details
+
+    if provider is not None and summary.get("job_id"):
+        details = provider.get_job_details(summary["job_id"])
+        if details:
+            store.put(key, details)
+            return details
+
+    return {}
@@ -1,15 +1,33 @@
 
 import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import re
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from config import PROVIDER_CONNECT_TIMEOUT
+from utils.instrumentation import metrics
+from utils.circuit_breaker import get_breaker
+from utils.companies import companies
+from utils.job_attributes import extract_all
+from utils.http import get_session
+from utils.providers import SearchProvider, ProviderCapabilities
 
-class JobScraper:
+class JobScraper(SearchProvider):
     """Job scraper for multiple platforms."""
+
+    name = "scraper"
+    # Generates placeholder listings linking to each board's search page
+    capabilities = ProviderCapabilities(real_listings=False, fallback_only=True, filter_pushdown=("platform",))
     
-    def __init__(self):
+    def __init__(self, verify_urls=True, session=None):
+        """
+        Args:
+            verify_urls (bool): Check search URLs with a HEAD request before using them
+            session (requests.Session, optional): HTTP session, defaults to the shared "job_boards" session
+        """
+        self.verify_urls = verify_urls
+        self.session = session or get_session("job_boards")
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
@@ -37,30 +55,58 @@ class JobScraper:
                 "base_url": "https://www.monster.com"
             }
         }
+
+        # Platform name -> search method; add a board here and to self.platforms
+        self.platform_searchers = {
+            "LinkedIn": self.search_linkedin,
+            "Indeed": self.search_indeed,
+            "Glassdoor": self.search_glassdoor,
+            "ZipRecruiter": self.search_ziprecruiter,
+            "Monster": self.search_monster
+        }
     
     def verify_url(self, url):
         """Verify that a URL is valid and reachable."""
+        if not self.verify_urls:
+            return True
+
+        # Unreachable job boards fail fast instead of costing a timeout per search
+        breaker = get_breaker(f"verify:{urlparse(url).netloc}", consecutive_failures=2, open_seconds=60)
+        if not breaker.allow_request():
+            return False
+
+        start = time.perf_counter()
         try:
-            response = requests.head(url, timeout=5)
-            return response.status_code < 400
+            with metrics.span("verify_url"):
+                response = self.session.head(url, headers=self.headers, timeout=(PROVIDER_CONNECT_TIMEOUT, 5))
         except:
+            breaker.record_failure(time.perf_counter() - start)
             return False
-    
-    def search_jobs(self, keywords, location, platform="Indeed", count=5):
-        """Search for jobs across selected platforms."""
-        if platform == "LinkedIn":
-            return self.search_linkedin(keywords, location, count)
-        elif platform == "Indeed":
-            return self.search_indeed(keywords, location, count)
-        elif platform == "Glassdoor":
-            return self.search_glassdoor(keywords, location, count)
-        elif platform == "ZipRecruiter":
-            return self.search_ziprecruiter(keywords, location, count)
-        elif platform == "Monster":
-            return self.search_monster(keywords, location, count)
+
+        if response.status_code >= 500:
+            breaker.record_failure(time.perf_counter() - start)
         else:
+            breaker.record_success(time.perf_counter() - start)
+        return response.status_code < 400
+    
+    def search_jobs(self, keywords, location, platform="Indeed", count=5, days_ago=None, pages=1, stale_ok=True,
+                    filters=None):
+        """Search for jobs on one platform. The other provider interface arguments are accepted but ignored."""
+        search = self.platform_searchers.get(platform)
+        if search is None:
             print(f"Platform {platform} not supported.")
             return []
+        with metrics.span("provider_call", provider="scraper", platform=platform):
+            jobs = search(keywords, location, count)
+        for job in jobs:
+            job["company_id"] = companies.intern(job.get("company"))
+        try:
+            extract_all(jobs)
+        except Exception as e:
+            # The jobs are still usable: JobTable parses the attributes from text instead
+            metrics.inc("extraction_errors_total", provider="scraper")
+            print(f"Job attribute extraction failed: {e}")
+        return jobs
     
     def search_indeed(self, keywords, location, count=5):
         """Search for jobs on Indeed with working URLs."""
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import random
+import threading
+import time
+
+from config import (
+    GEMINI_API_KEY, GEMINI_MODEL, LLM_BACKEND, LOCAL_LLM_LATENCY_MS, LOCAL_LLM_TOKENS_PER_SECOND,
+    LOCAL_LLM_CHUNK_TOKENS
+)
+
+# Rough characters per token of English text, used where no tokenizer is at hand
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Approximate token count of text, without calling a tokenizer."""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class LLMBackend:
+    """Base class for text generation backends.
+
+    Subclasses set name and model and implement stream. Register a factory
+    for them with register_backend to make them selectable by LLM_BACKEND.
+    """
+
+    name = None
+    model = None
+
+    def is_available(self):
+        """Return False when calls cannot succeed, e.g. without an API key."""
+        return True
+
+    def stream(self, prompt, schema=None):
+        """
+        Generate a response, yielding text as it is produced.
+
+        Args:
+            prompt (str): The prompt
+            schema (dict, optional): JSON schema the response must follow; without
+                one the response is free text
+
+        Yields:
+            str: Consecutive pieces of the response
+        """
+        raise NotImplementedError
+
+    def generate(self, prompt, schema=None):
+        """The whole response of stream() as one string."""
+        return "".join(self.stream(prompt, schema))
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through google.generativeai.
+
+    The SDK is configured once and one model is kept per response schema,
+    so calls reuse the client instead of rebuilding it.
+    """
+
+    name = "gemini"
+
+    def __init__(self, api_key=GEMINI_API_KEY, model=GEMINI_MODEL):
+        """
+        Args:
+            api_key (str): Gemini API key
+            model (str): Model name
+        """
+        self.api_key = api_key
+        self.model = model
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return bool(self.api_key)
+
+    def _model_for(self, schema):
+        key = json.dumps(schema, sort_keys=True) if schema else None
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                # The SDK is slow to import, so only load it here
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                config = None
+                if schema:
+                    config = genai.GenerationConfig(response_mime_type="application/json", response_schema=schema)
+                model = self._models[key] = genai.GenerativeModel(model_name=self.model, generation_config=config)
+            return model
+
+    def stream(self, prompt, schema=None):
+        for chunk in self._model_for(schema).generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+class LocalLLMBackend(LLMBackend):
+    """Deterministic stand-in for an LLM, for offline runs and load tests.
+
+    Responses depend only on the prompt and schema: a schema is filled with
+    integers and phrases drawn from the prompt, seeded by the prompt's hash,
+    and free text is a short digest of the prompt. Timing follows a real
+    model: nothing arrives before latency_ms, then text streams at
+    tokens_per_second in chunks of chunk_tokens.
+    """
+
+    name = "local"
+    model = "local"
+
+    def __init__(self, latency_ms=LOCAL_LLM_LATENCY_MS, tokens_per_second=LOCAL_LLM_TOKENS_PER_SECOND,
+                 chunk_tokens=LOCAL_LLM_CHUNK_TOKENS):
+        """
+        Args:
+            latency_ms (float): Time to the first chunk
+            tokens_per_second (float): Output throughput after the first chunk, 0 for no limit
+            chunk_tokens (int): Tokens per streamed chunk
+        """
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.chunk_tokens = max(1, chunk_tokens)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def respond(self, prompt, schema=None):
+        """The full response text for prompt, without any delay."""
+        rnd = random.Random(hashlib.sha256(f"{prompt}\0{json.dumps(schema, sort_keys=True)}".encode("utf-8")).digest())
+        lines = prompt.splitlines()
+        # In a prompt with "=== SECTION ===" markers, the instructions before the first one are not content
+        start = next((i for i, line in enumerate(lines) if line.strip().startswith("===")), 0)
+        phrases = [line.strip(" -*•\t") for line in lines[start:]]
+        # Skip headings and labels ("=== JOB ===", "Description:") and numbered instructions
+        phrases = [phrase[:80] for phrase in phrases
+                   if len(phrase) > 3 and not phrase.startswith("=") and not phrase.endswith(":")
+                   and not phrase[0].isdigit()] or ["n/a"]
+        if not schema:
+            return " ".join(rnd.sample(phrases, min(3, len(phrases))))
+        return json.dumps(self._fill(schema, rnd, phrases))
+
+    def _fill(self, schema, rnd, phrases):
+        kind = schema.get("type", "string").lower()
+        if kind == "object":
+            return {key: self._fill(value, rnd, phrases) for key, value in schema.get("properties", {}).items()}
+        if kind == "array":
+            return [self._fill(schema.get("items", {}), rnd, phrases) for _ in range(rnd.randint(2, 4))]
+        if kind == "integer":
+            return rnd.randint(0, 100)
+        if kind == "number":
+            return round(rnd.uniform(0, 100), 1)
+        if kind == "boolean":
+            return rnd.random() < 0.5
+        if schema.get("enum"):
+            return rnd.choice(schema["enum"])
+        return rnd.choice(phrases)
+
+    def stream(self, prompt, schema=None):
+        text = self.respond(prompt, schema)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += estimate_tokens(prompt)
+            self.output_tokens += estimate_tokens(text)
+
+        chunk_chars = self.chunk_tokens * CHARS_PER_TOKEN
+        seconds_per_chunk = self.chunk_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        time.sleep(self.latency_ms / 1000.0)
+        for start in range(0, len(text), chunk_chars):
+            if start and seconds_per_chunk:
+                time.sleep(seconds_per_chunk)
+            yield text[start:start + chunk_chars]
+
+
+_factories = {"gemini": GeminiBackend, "local": LocalLLMBackend}
+_instances = {}
+_lock = threading.Lock()
+
+
+def register_backend(name, factory):
+    """
+    Register an LLM backend factory, replacing any backend already built under name.
+
+    Args:
+        name (str): Backend name, as used in LLM_BACKEND
+        factory (callable): Zero-argument callable returning an LLMBackend
+    """
+    with _lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+
+def get_llm_backend(name=None):
+    """
+    Get the shared instance of an LLM backend, building it on first use.
+
+    Args:
+        name (str, optional): Backend name, defaults to LLM_BACKEND
+
+    Returns:
+        LLMBackend: The backend instance
+
+    Raises:
+        KeyError: If no backend is registered under name
+    """
+    name = name or LLM_BACKEND
+    with _lock:
+        instance = _instances.get(name)
+        if instance is None:
+            if name not in _factories:
+                raise KeyError(f"No LLM backend registered as {name!r}")
+            instance = _instances[name] = _factories[name]()
+        return instance
@@ -0,0 +1,193 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import PROCESS_POOL_WORKERS, PARALLEL_MIN_BATCH, PARALLEL_CHUNK_SIZE
+from utils.instrumentation import metrics
+
+
+class SharedColumns:
+    """Columnar batch copied once into shared memory.
+
+    Numpy arrays are stored as they are; text columns as one UTF-8 buffer
+    plus offsets. Only the small handle is pickled to worker processes,
+    which map the same memory and read the columns in place. Release the
+    segments with close(), or use the object as a context manager.
+    """
+
+    def __init__(self, arrays=None, texts=None):
+        """
+        Args:
+            arrays (dict, optional): Column name -> numpy array
+            texts (dict, optional): Column name -> list of strings (None is stored as "")
+        """
+        self.handle = {}
+        self._segments = []
+        for name, array in (arrays or {}).items():
+            self.add_array(name, array)
+        for name, values in (texts or {}).items():
+            self.add_text(name, values)
+
+    def add_array(self, name, array):
+        array = np.ascontiguousarray(array)
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(segment)
+        np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+        self.handle[name] = (segment.name, array.shape, array.dtype.str)
+
+    def add_text(self, name, values):
+        encoded = [str(value or "").encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        self.add_array(f"{name}.bytes", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        self.add_array(f"{name}.offsets", offsets)
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AttachedColumns:
+    """Read-only view of a SharedColumns handle from any process."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self._segments = {}
+        self._arrays = {}
+
+    def array(self, name):
+        """Numpy array backed by the shared segment; copy anything that outlives the task."""
+        array = self._arrays.get(name)
+        if array is None:
+            segment_name, shape, dtype = self.handle[name]
+            segment = self._segments.get(segment_name)
+            if segment is None:
+                segment = self._segments[segment_name] = shared_memory.SharedMemory(name=segment_name)
+            array = self._arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=segment.buf)
+        return array
+
+    def text(self, name, index):
+        """String at index of a text column."""
+        offsets = self.array(f"{name}.offsets")
+        return bytes(self.array(f"{name}.bytes")[offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def close(self):
+        self._arrays = {}
+        for segment in self._segments.values():
+            try:
+                segment.close()
+            except BufferError:
+                pass  # a view is still referenced; the mapping goes when it is collected
+        self._segments = {}
+
+
+def _run_task(func, handle, start, stop, args):
+    columns = AttachedColumns(handle)
+    try:
+        return func(columns, start, stop, *args)
+    finally:
+        columns.close()
+
+
+class ProcessPool:
+    """Worker processes for CPU-bound stages, fed columnar batches through shared memory.
+
+    Pure-Python stages such as regex extraction and tokenizing hold the GIL,
+    so on threads they serialize with every Streamlit session. Here a batch
+    is split into chunks and each chunk runs in a worker process. Workers
+    start from a fresh interpreter ("forkserver" where available), never by
+    forking a process full of threads. Interned state such as company IDs
+    is process-local, so tasks return plain values and the caller merges them.
+
+    Only batches of at least min_batch rows are offloaded. Interactive
+    searches arrive a page (~10 jobs) at a time and never reach it, so the
+    pool serves bulk work: batch matching over many postings, large result
+    sets and the benchmarks.
+    """
+
+    def __init__(self, max_workers=PROCESS_POOL_WORKERS, min_batch=PARALLEL_MIN_BATCH,
+                 chunk_size=PARALLEL_CHUNK_SIZE):
+        """
+        Args:
+            max_workers (int): Worker processes; 1 or less runs every task in the caller
+            min_batch (int): Batch size below which offload() says to stay in-process
+            chunk_size (int): Default rows per task
+        """
+        self.max_workers = max_workers
+        self.min_batch = min_batch
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_workers > 1
+
+    def offload(self, size):
+        """Whether a batch of size rows is worth sending to the workers."""
+        return self.enabled and size >= self.min_batch
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def map(self, func, columns, size, *args, chunk_size=None, stage="task"):
+        """
+        Run func over chunks of a shared batch, in worker processes when enabled.
+
+        Args:
+            func (callable): Module-level function func(columns, start, stop, *args) reading
+                rows start:stop from an AttachedColumns and returning picklable results
+            columns (SharedColumns): The batch
+            size (int): Number of rows
+            *args: Extra picklable arguments for func
+            chunk_size (int, optional): Rows per task, defaults to the pool's chunk_size
+            stage (str): Stage name used in metrics
+
+        Returns:
+            list: func's result for each chunk, in row order
+        """
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+        with metrics.span("offload", stage=stage, rows=size, chunks=len(bounds)):
+            if not self.enabled or len(bounds) <= 1:
+                return [_run_task(func, columns.handle, start, stop, args) for start, stop in bounds]
+            futures = [
+                self.executor.submit(_run_task, func, columns.handle, start, stop, args)
+                for start, stop in bounds
+            ]
+            try:
+                return [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed for memory); start a new pool next time and finish here
+                metrics.inc("process_pool_errors_total", stage=stage)
+                print(f"Process pool failed during {stage}, running it in-process: {e}")
+                with self._lock:
+                    self._executor = None
+                return [_run_task(func, columns.handle, start, stop, args) for start, stop in bounds]
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+process_pool = ProcessPool()
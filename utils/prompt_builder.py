@@ -0,0 +1,205 @@
+import json
+import math
+import re
+from functools import lru_cache
+
+from config import PROMPT_TOKEN_BUDGET, PROMPT_RESUME_SHARE, PROMPT_RESUME_CACHE_SIZE, PROMPT_LINE_CHARS
+from utils.job_attributes import extract_skills, parse_min_years
+from utils.llm import estimate_tokens
+
+_WHITESPACE = re.compile(r"\s+")
+_BULLET = re.compile(r"^(?:[•·▪◦‣●○■□➢➤✓✔*\-–—]|\d{1,2}[.)])\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])")
+
+# Words that mark a sentence as stating a requirement rather than describing the company
+_REQUIREMENT_CUES = re.compile(
+    r"\b(?:requir\w*|must|need\w*|experience\w*|proficien\w*|knowledge|familiar\w*|skill\w*|abilit\w*|able to|"
+    r"degree|bachelor\w*|master\w*|certif\w*|qualif\w*|expert\w*|strong|understanding|responsib\w*|"
+    r"you will|you'll|preferred|plus)\b",
+    re.IGNORECASE
+)
+_BOILERPLATE = re.compile(
+    r"\b(?:equal opportunity|eeo|benefits?|401\(?k\)?|paid time off|pto|health insurance|dental|vision|"
+    r"about us|our mission|apply now|click|reasonable accommodation)\b",
+    re.IGNORECASE
+)
+
+_INSTRUCTIONS = """Assess how well the resume matches the job. Return, in this order:
+match_score: 0-100 fit to the job requirements.
+key_matches: 3-5 resume skills or experiences that meet the requirements.
+gaps: 2-4 requirements the resume does not clearly show.
+recommendations: 3-5 specific actions to improve the candidate's fit.
+Be specific and use only the content below."""
+
+
+def _clean(text, max_chars=PROMPT_LINE_CHARS):
+    """Collapse whitespace, drop a leading bullet and cut at a word boundary past max_chars."""
+    text = _BULLET.sub("", _WHITESPACE.sub(" ", str(text or "")).strip())
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + "…"
+    return text
+
+
+def _dedupe(items):
+    """Cleaned, non-empty items without case-insensitive repeats, in order."""
+    seen = set()
+    kept = []
+    for item in items:
+        text = _clean(item)
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            kept.append(text)
+    return kept
+
+
+def _as_list(value):
+    if not value:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+@lru_cache(maxsize=PROMPT_RESUME_CACHE_SIZE)
+def _compact_resume(resume_key):
+    resume_data = json.loads(resume_key)
+    skills = _dedupe(_as_list(resume_data.get("skills")))
+    experience = _dedupe(_as_list(resume_data.get("experience")))
+    education = _dedupe(_as_list(resume_data.get("education")))
+    # Canonical skills named elsewhere in the resume count as skills too
+    known = {skill.lower() for skill in skills}
+    text = "\n".join(experience + education + [str(resume_data.get("summary") or "")])
+    skills += [skill for skill in extract_skills(text) if skill.lower() not in known]
+    return tuple(skills), tuple(experience), tuple(education)
+
+
+def compact_resume(resume_data):
+    """
+    Deduplicated, whitespace-compressed resume sections used in prompts.
+
+    Computed once per distinct resume and memoized, so a session analysing
+    many jobs with the same resume pays for it on the first call only.
+
+    Args:
+        resume_data (dict): The parsed resume data
+
+    Returns:
+        tuple: (skills, experience lines, education lines), each a tuple of strings
+    """
+    return _compact_resume(json.dumps(resume_data or {}, sort_keys=True, default=str))
+
+
+def requirement_sentences(description):
+    """
+    Sentences of a job description that state requirements, with a relevance score.
+
+    Sentences naming skills, years of experience or requirement words score
+    higher; benefits, EEO statements and company blurbs are dropped.
+
+    Args:
+        description (str): Job description text
+
+    Returns:
+        list: (score, sentence) in description order; score 0 means no requirement cue
+    """
+    sentences = []
+    for line in str(description or "").splitlines():
+        sentences.extend(_SENTENCE_END.split(line))
+    scored = []
+    for sentence in _dedupe(sentences):
+        # Headings ("Requirements") carry no requirement of their own
+        if len(sentence.split()) < 3 or _BOILERPLATE.search(sentence):
+            continue
+        score = len(_REQUIREMENT_CUES.findall(sentence)) + 2 * len(extract_skills(sentence))
+        if not math.isnan(parse_min_years(sentence)):
+            score += 2
+        scored.append((score, sentence))
+    return scored
+
+
+def _fit(lines, budget):
+    """Lines, in order, whose estimated tokens fit in budget; a line too long for what is left is skipped."""
+    kept = []
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if cost > budget:
+            continue
+        kept.append(line)
+        budget -= cost
+    return kept
+
+
+class MatchPrompt:
+    """A match analysis prompt and its estimated token counts per section."""
+
+    def __init__(self, text, tokens, budget, trimmed):
+        """
+        Args:
+            text (str): The prompt
+            tokens (dict): Estimated tokens of "instructions", "resume" and "job"
+            budget (int): Token budget the prompt was built for
+            trimmed (bool): Whether resume or job content was left out to meet the budget
+        """
+        self.text = text
+        self.tokens = tokens
+        self.budget = budget
+        self.trimmed = trimmed
+
+    @property
+    def total_tokens(self):
+        return estimate_tokens(self.text)
+
+
+def build_match_prompt(resume_data, job_data, budget=PROMPT_TOKEN_BUDGET, resume_share=PROMPT_RESUME_SHARE):
+    """
+    Build a compact match analysis prompt within a token budget.
+
+    The resume is reduced to its deduplicated skills, experience and
+    education; the job to its title and requirement-bearing sentences. When
+    both do not fit, each side gets its share of the budget and whichever
+    needs less than its share passes the rest to the other. Experience
+    lines are kept in resume order and requirements by score.
+
+    Args:
+        resume_data (dict): The parsed resume data
+        job_data (dict): The job listing data
+        budget (int): Estimated tokens the prompt may use
+        resume_share (float): Share of the content budget reserved for the resume
+
+    Returns:
+        MatchPrompt: The prompt and its token counts
+    """
+    skills, experience, education = compact_resume(resume_data)
+    title = _clean(job_data.get("title", ""))
+    requirements = requirement_sentences(job_data.get("description", ""))
+    # Short or unusual descriptions without requirement cues are sent as they are
+    if not any(score for score, _ in requirements):
+        ranked = [sentence for _, sentence in requirements]
+    else:
+        ranked = [sentence for score, sentence in sorted(requirements, key=lambda item: -item[0]) if score]
+
+    instructions_tokens = estimate_tokens(_INSTRUCTIONS) + estimate_tokens(title) + 16
+    available = max(0, budget - instructions_tokens)
+    resume_lines = [f"Skills: {', '.join(skills)}"] if skills else []
+    resume_lines += [f"- {line}" for line in experience] + [f"Education: {line}" for line in education]
+    job_lines = [f"- {line}" for line in ranked]
+
+    resume_need = sum(estimate_tokens(line) + 1 for line in resume_lines)
+    job_need = sum(estimate_tokens(line) + 1 for line in job_lines)
+    resume_budget = max(int(available * resume_share), available - job_need)
+    kept_resume = _fit(resume_lines, resume_budget)
+    if skills and not kept_resume:
+        # Keep as many skills as fit rather than none
+        kept_resume = [f"Skills: {', '.join(_fit(skills, resume_budget - 3))}"]
+    resume_used = sum(estimate_tokens(line) + 1 for line in kept_resume)
+    kept_job = set(_fit(job_lines, available - resume_used))
+    kept_job = [line for line in (f"- {sentence}" for _, sentence in requirements) if line in kept_job]
+
+    resume_block = "\n".join(kept_resume) or "(empty)"
+    job_block = "\n".join(kept_job) or "(no description)"
+    text = f"{_INSTRUCTIONS}\n\n=== RESUME ===\n{resume_block}\n\n=== JOB ===\nTitle: {title}\nRequirements:\n{job_block}"
+    tokens = {
+        "instructions": estimate_tokens(_INSTRUCTIONS),
+        "resume": estimate_tokens(resume_block),
+        "job": estimate_tokens(job_block) + estimate_tokens(title),
+    }
+    trimmed = len(kept_resume) < len(resume_lines) or len(kept_job) < len(job_lines) or resume_used < resume_need
+    return MatchPrompt(text, tokens, budget, trimmed)
@@ -0,0 +1,179 @@
+import threading
+
+
+class ProviderCapabilities:
+    """What a search provider can do and what it costs to call."""
+
+    def __init__(self, supports_paging=False, supports_date_filter=False, cost_per_call=0.0,
+                 real_listings=True, fallback_only=False, results_per_page=10, filter_pushdown=()):
+        """
+        Args:
+            supports_paging (bool): Can fetch further pages of the same query
+            supports_date_filter (bool): Honors days_ago on the provider side
+            cost_per_call (float): Relative cost of one search call (API credits)
+            real_listings (bool): Returns real postings rather than generated placeholders
+            fallback_only (bool): Only query when the other providers returned nothing
+            results_per_page (int): Listings returned per page before platform filtering
+            filter_pushdown (tuple): JobFilter predicates applied by the provider itself
+                ("platform", "job_type", "recency", "location", "experience")
+        """
+        self.supports_paging = supports_paging
+        self.supports_date_filter = supports_date_filter
+        self.cost_per_call = cost_per_call
+        self.real_listings = real_listings
+        self.fallback_only = fallback_only
+        self.results_per_page = results_per_page
+        self.filter_pushdown = tuple(filter_pushdown)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class SearchProvider:
+    """Base class for job search backends.
+
+    Subclasses set name and capabilities and implement search_jobs. Register
+    a factory for them with registry.register to make them available to
+    JobSearchAgent.
+    """
+
+    name = None
+    capabilities = ProviderCapabilities()
+
+    def search_jobs(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, stale_ok=True,
+                    filters=None):
+        """
+        Search for jobs on one platform.
+
+        Args:
+            keywords (str): Search keywords or job title
+            location (str): Job location
+            platform (str, optional): Platform to restrict results to, None or "all" for any
+            count (int): Maximum number of jobs to return
+            days_ago (int): Only jobs posted within this many days, if supported
+            pages (int): Result pages to fetch at most, if paging is supported
+            stale_ok (bool): Accept a stale cached answer, if the provider caches
+            filters (JobFilter, optional): The predicates listed in capabilities.filter_pushdown
+
+        Returns:
+            list: Job dictionaries, empty on failure
+        """
+        raise NotImplementedError
+
+    def is_available(self):
+        """Return False when calls would currently fail fast (e.g. open circuit)."""
+        return True
+
+    def health(self):
+        """Rolling health statistics, empty if the provider does not track any."""
+        return {}
+
+    def quota_remaining(self):
+        """Calls left before the provider's quota runs out, None if unlimited."""
+        return None
+
+    def is_cached(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, filters=None):
+        """Whether search_jobs with these arguments would be answered from the cache without waiting."""
+        return False
+
+    def is_refreshing(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, filters=None):
+        """Whether a cached answer for this search is being refreshed in the background."""
+        return False
+
+    def get_job_details(self, job_id):
+        """Fetch one job's detail fields, or None if the provider cannot."""
+        return None
+
+
+class ProviderRegistry:
+    """Process-wide registry of job search backends.
+
+    Each backend is registered as a factory and built once, on first use.
+    Every caller (the app, the agent, benchmarks) then shares the same
+    instance, and with it the backend's HTTP session, response cache, rate
+    limiter and circuit breaker.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory):
+        """
+        Register a backend factory.
+
+        Re-registering a name replaces the factory and drops any instance
+        already built from the old one.
+
+        Args:
+            name (str): Backend name, e.g. "scrapingdog"
+            factory (callable): Zero-argument callable returning the backend
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name):
+        """
+        Get the shared instance of a backend, building it on first use.
+
+        Args:
+            name (str): Backend name
+
+        Returns:
+            object: The backend instance
+
+        Raises:
+            KeyError: If no backend is registered under name
+        """
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                if name not in self._factories:
+                    raise KeyError(f"No search provider registered as {name!r}")
+                instance = self._instances[name] = self._factories[name]()
+            return instance
+
+    def set(self, name, instance):
+        """Use an already-built instance for a backend, e.g. one pointed at a test server."""
+        with self._lock:
+            self._factories.setdefault(name, lambda: instance)
+            self._instances[name] = instance
+
+    def reset(self, name=None):
+        """Drop built instances so the next get() rebuilds them from their factories."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def names(self):
+        with self._lock:
+            return list(self._factories)
+
+    def providers(self):
+        """Every registered provider instance, in registration order."""
+        return [self.get(name) for name in self.names()]
+
+
+def _build_scrapingdog():
+    # Imported here so the registry itself stays cheap to import
+    from utils.serp_api_searcher import SerpApiSearcher
+    return SerpApiSearcher()
+
+
+def _build_scraper():
+    from utils.job_scraper import JobScraper
+    return JobScraper()
+
+
+registry = ProviderRegistry()
+registry.register("scrapingdog", _build_scrapingdog)
+registry.register("scraper", _build_scraper)
+
+
+def get_provider(name):
+    """Shortcut for registry.get(name)."""
+    return registry.get(name)
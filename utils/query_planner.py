@@ -0,0 +1,235 @@
+import math
+import threading
+
+from config import (
+    SEARCH_MAX_PAGES, SEARCH_MAX_COST_PER_CALL, SEARCH_LATENCY_BUDGET, PLANNER_SMOOTHING
+)
+from utils.instrumentation import metrics
+
+
+class PlannedCall:
+    """One provider search the planner decided to make."""
+
+    def __init__(self, provider, platform, pages, cached=False, expected_jobs=0.0,
+                 expected_latency=0.0, expected_cost=0.0):
+        self.provider = provider
+        self.platform = platform
+        self.pages = pages
+        self.cached = cached
+        self.expected_jobs = expected_jobs
+        self.expected_latency = expected_latency
+        self.expected_cost = expected_cost
+
+    def to_dict(self):
+        return {
+            "provider": self.provider.name,
+            "platform": self.platform,
+            "pages": self.pages,
+            "cached": self.cached,
+            "expected_jobs": round(self.expected_jobs, 1),
+            "expected_latency": round(self.expected_latency, 3),
+            "expected_cost": self.expected_cost,
+        }
+
+
+class QueryPlan:
+    """Calls to make for one search, in a primary and a fallback tier."""
+
+    def __init__(self, primary=None, fallback=None, skipped=None):
+        """
+        Args:
+            primary (list): PlannedCall objects to run first, concurrently
+            fallback (list): PlannedCall objects to run only if primary returns nothing
+            skipped (dict): Provider name -> reason it was left out
+        """
+        self.primary = primary or []
+        self.fallback = fallback or []
+        self.skipped = skipped or {}
+
+    @property
+    def expected_cost(self):
+        return sum(call.expected_cost for call in self.primary)
+
+    @property
+    def expected_latency(self):
+        # Calls run concurrently, so the slowest one bounds the search
+        return max((call.expected_latency for call in self.primary), default=0.0)
+
+    def to_dict(self):
+        return {
+            "primary": [call.to_dict() for call in self.primary],
+            "fallback": [call.to_dict() for call in self.fallback],
+            "skipped": dict(self.skipped),
+            "expected_cost": self.expected_cost,
+            "expected_latency": round(self.expected_latency, 3),
+        }
+
+
+class QueryPlanner:
+    """Decides which providers to call for a search and how many pages each fetches.
+
+    For every (provider, platform) pair the planner keeps a smoothed hit rate:
+    the share of a page's listings that survive the platform filter. With the
+    provider's rolling latency, cost per call and remaining quota it then:
+
+    - skips providers that are unavailable, over the cost limit, over the
+      latency budget or out of quota
+    - answers from the provider's cache when it holds the query, fresh or
+      stale while it refreshes in the background (no cost on the request path)
+    - fetches just enough pages to expect count listings, within
+      SEARCH_MAX_PAGES, the latency budget and the remaining quota
+    - stops adding providers for a platform once the cheaper ones already
+      cover the requested count
+    """
+
+    def __init__(self, max_pages=SEARCH_MAX_PAGES, max_cost_per_call=SEARCH_MAX_COST_PER_CALL,
+                 latency_budget=SEARCH_LATENCY_BUDGET, smoothing=PLANNER_SMOOTHING):
+        """
+        Args:
+            max_pages (int): Pages fetched per provider and platform at most
+            max_cost_per_call (float, optional): Skip providers costing more per call
+            latency_budget (float): Seconds a single provider call may be expected to take
+            smoothing (float): Weight of the newest observation in the hit rate average
+        """
+        self.max_pages = max_pages
+        self.max_cost_per_call = max_cost_per_call
+        self.latency_budget = latency_budget
+        self.smoothing = smoothing
+        self._hit_rates = {}
+        self._lock = threading.Lock()
+
+    def hit_rate(self, provider_name, platform):
+        """Smoothed share of fetched listings kept for this platform, 1.0 until observed."""
+        with self._lock:
+            return self._hit_rates.get((provider_name, platform), 1.0)
+
+    def record(self, provider_name, platform, pages, results_per_page, jobs_returned, count):
+        """
+        Update the hit rate after a provider call.
+
+        Args:
+            provider_name (str): Provider that was called
+            platform (str): Platform filter used
+            pages (int): Pages the call was allowed to fetch
+            results_per_page (int): Listings per page before filtering
+            jobs_returned (int): Listings the call returned
+            count (int): Listings requested
+        """
+        if pages <= 0 or results_per_page <= 0:
+            return
+        # A call that met count may have stopped early, so it only bounds the rate from below
+        observed = jobs_returned / float(pages * results_per_page)
+        if jobs_returned >= count:
+            observed = max(observed, self.hit_rate(provider_name, platform))
+        observed = min(1.0, observed)
+        key = (provider_name, platform)
+        with self._lock:
+            previous = self._hit_rates.get(key)
+            if previous is None:
+                self._hit_rates[key] = observed
+            else:
+                self._hit_rates[key] = previous + self.smoothing * (observed - previous)
+
+    def _skip_reason(self, provider):
+        capabilities = provider.capabilities
+        if not provider.is_available():
+            return "circuit open"
+        if self.max_cost_per_call is not None and capabilities.cost_per_call > self.max_cost_per_call:
+            return "cost"
+        p95 = provider.health().get("p95_latency")
+        if p95 is not None and p95 > self.latency_budget:
+            return "latency"
+        if provider.quota_remaining() == 0:
+            return "quota"
+        return None
+
+    def _pages_for(self, provider, platform, needed, page_latency):
+        """Pages expected to yield needed listings, within the page and latency limits."""
+        capabilities = provider.capabilities
+        if not capabilities.supports_paging:
+            return 1
+        per_page = capabilities.results_per_page * max(self.hit_rate(provider.name, platform), 0.05)
+        pages = min(self.max_pages, max(1, int(math.ceil(needed / per_page))))
+        if page_latency:
+            # Pages are fetched one after another, so each one adds a full round trip
+            pages = min(pages, max(1, int(self.latency_budget // page_latency)))
+        return pages
+
+    def plan(self, providers, keywords, location, platforms, count, days_ago=5, job_filter=None):
+        """
+        Build the plan for one search.
+
+        Args:
+            providers (list): Candidate SearchProvider instances
+            keywords (str): Search keywords
+            location (str): Job location
+            platforms (list): Platforms to search
+            count (int): Listings wanted per platform
+            days_ago (int): Recency filter
+            job_filter (JobFilter, optional): Structured filters; the pushed-down part is part of the cache key
+
+        Returns:
+            QueryPlan: Calls to make
+        """
+        plan = QueryPlan()
+        candidates = []
+        for provider in providers:
+            reason = self._skip_reason(provider)
+            if reason:
+                plan.skipped[provider.name] = reason
+                metrics.inc("planner_skips_total", provider=provider.name, reason=reason)
+            elif provider.capabilities.fallback_only:
+                plan.fallback.extend(PlannedCall(provider, platform, 1) for platform in platforms)
+            else:
+                candidates.append(provider)
+
+        # Cheapest first, then fastest, so the count is covered for the least spend
+        def rank(provider):
+            p50 = provider.health().get("p50_latency")
+            return provider.capabilities.cost_per_call, p50 if p50 is not None else 0.0
+
+        candidates.sort(key=rank)
+        quota_left = {provider.name: provider.quota_remaining() for provider in candidates}
+
+        for platform in platforms:
+            expected = 0.0
+            for provider in candidates:
+                if expected >= count:
+                    break
+                capabilities = provider.capabilities
+                hit_rate = self.hit_rate(provider.name, platform)
+                page_latency = provider.health().get("p50_latency") or 0.0
+
+                filters = job_filter.pushdown(capabilities.filter_pushdown)[0] if job_filter is not None else None
+                # Pages are part of the provider's cache key, so ask about the call we would make
+                pages = self._pages_for(provider, platform, count - expected, page_latency)
+                if provider.is_cached(keywords, location, platform=platform, count=count, days_ago=days_ago,
+                                      pages=pages, filters=filters):
+                    # A cached entry answers the full request without waiting; trust it to cover count
+                    plan.primary.append(PlannedCall(provider, platform, pages, cached=True, expected_jobs=count))
+                    expected = count
+                    continue
+
+                remaining_quota = quota_left[provider.name]
+                if remaining_quota is not None and remaining_quota <= 0:
+                    plan.skipped.setdefault(provider.name, "quota")
+                    continue
+
+                if remaining_quota is not None:
+                    pages = min(pages, remaining_quota)
+                    quota_left[provider.name] = remaining_quota - pages
+
+                jobs = min(count, pages * capabilities.results_per_page * hit_rate)
+                plan.primary.append(PlannedCall(
+                    provider, platform, pages,
+                    expected_jobs=jobs,
+                    expected_latency=pages * page_latency,
+                    expected_cost=pages * capabilities.cost_per_call
+                ))
+                expected += jobs
+
+        metrics.observe("planned_cost", plan.expected_cost)
+        return plan
+
+
+planner = QueryPlanner()
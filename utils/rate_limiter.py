@@ -0,0 +1,106 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to burst. Each request
+    takes one token; callers either wait for one or give up after a timeout.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): Sustained requests per second
+            burst (int, optional): Bucket size, defaults to max(1, rate)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """
+        Wait for a token.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait, None waits indefinitely
+
+        Returns:
+            bool: True if a token was taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else 0.05
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class CallQuota:
+    """Fixed-window call allowance, e.g. a provider's daily API credits."""
+
+    def __init__(self, limit, period_seconds=86400):
+        """
+        Args:
+            limit (int, optional): Calls allowed per period, None for unlimited
+            period_seconds (float): Length of the quota window
+        """
+        self.limit = limit
+        self.period_seconds = period_seconds
+        self._used = 0
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _roll(self):
+        if time.monotonic() - self._window_start >= self.period_seconds:
+            self._window_start = time.monotonic()
+            self._used = 0
+
+    def remaining(self):
+        """Calls left in the current window, or None if unlimited."""
+        if self.limit is None:
+            return None
+        with self._lock:
+            self._roll()
+            return max(0, self.limit - self._used)
+
+    def consume(self, calls=1):
+        """
+        Count calls against the quota.
+
+        Returns:
+            bool: False if the quota was already exhausted (nothing is counted then)
+        """
+        if self.limit is None:
+            return True
+        with self._lock:
+            self._roll()
+            if self._used + calls > self.limit:
+                return False
+            self._used += calls
+            return True
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+from utils.instrumentation import metrics
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries go stale after ttl seconds.
+
+    A stale entry can still be served for up to stale_ttl more seconds while
+    the caller refreshes it in the background (stale-while-revalidate).
+    """
+
+    def __init__(self, name, ttl, max_entries=1000, stale_ttl=0):
+        """
+        Args:
+            name (str): Cache name used in metrics
+            ttl (float): Seconds an entry stays fresh, 0 disables caching
+            max_entries (int): Entries kept before the least recently used is evicted
+            stale_ttl (float): Extra seconds a stale entry may be served while it is refreshed
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Look up key, accepting stale entries.
+
+        Returns:
+            tuple: (value, fresh, stored_at) or None if missing or past the stale window
+        """
+        with metrics.span("cache_lookup", cache=self.name):
+            with self._lock:
+                entry = self._entries.get(key)
+                age = time.monotonic() - entry[0] if entry is not None else None
+                if entry is not None and age > self.ttl + self.stale_ttl:
+                    del self._entries[key]
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+        if entry is None:
+            metrics.inc("cache_requests_total", cache=self.name, result="miss")
+            return None
+        fresh = age <= self.ttl
+        metrics.inc("cache_requests_total", cache=self.name, result="hit" if fresh else "stale")
+        return entry[1], fresh, entry[0]
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or no longer fresh."""
+        found = self.lookup(key)
+        return found[0] if found is not None and found[1] else None
+
+    def is_fresh(self, key):
+        """Whether key has an unexpired entry, without counting a lookup or touching LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[0] <= self.ttl
+
+    def is_servable(self, key):
+        """Whether key has a fresh or still servable stale entry, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[0] <= self.ttl + self.stale_ttl
+
+    def stored_at(self, key):
+        """Monotonic time the entry for key was stored, or None. Changes whenever it is refreshed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
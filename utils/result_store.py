@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from config import RESULTS_DIR, RESULT_STORE_SIZE, RESULT_STORE_DISK_FILES
+from utils.instrumentation import metrics
+
+# Interned IDs are only valid in the process that assigned them; they are
+# re-interned from the company name when a result set is read back from disk
+_PROCESS_LOCAL_FIELDS = ("company_id",)
+
+_DETAILS_SUFFIX = ".details.json.gz"
+
+
+def _encode(jobs):
+    """Columnar JSON of a job list: one value list per field, plus the rows lacking it."""
+    fields = {}
+    for job in jobs:
+        for field in job:
+            fields.setdefault(field, None)
+    columns = {}
+    for field in fields:
+        if field in _PROCESS_LOCAL_FIELDS:
+            continue
+        column = {"values": [job.get(field) for job in jobs]}
+        missing = [row for row, job in enumerate(jobs) if field not in job]
+        if missing:
+            column["missing"] = missing
+        columns[field] = column
+    return json.dumps({"size": len(jobs), "columns": columns}, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode(payload):
+    data = json.loads(payload)
+    jobs = [{} for _ in range(data["size"])]
+    for field, column in data["columns"].items():
+        missing = set(column.get("missing", ()))
+        for row, value in enumerate(column["values"]):
+            if row not in missing:
+                jobs[row][field] = value
+    return jobs
+
+
+class ResultSet:
+    """One search's job summaries, shared read-only by every session showing them.
+
+    The jobs' detail fields (descriptions) are kept with the set but apart
+    from the summaries: on disk they are only read when a job's details are
+    no longer in the detail store.
+    """
+
+    def __init__(self, result_id, jobs, details=None, store=None):
+        """
+        Args:
+            result_id (str): Content ID from the result store
+            jobs (list): Job summaries; callers must not modify them
+            details (dict, optional): job_key -> detail fields, None to read them from store when needed
+            store (ResultStore, optional): Store the set was written to
+        """
+        self.id = result_id
+        self.jobs = jobs
+        self._details = details
+        self._store = store
+        self._table = None
+
+    @property
+    def table(self):
+        """JobTable over the jobs, built once and shared with its column caches."""
+        if self._table is None:
+            from utils.job_filters import JobTable
+            self._table = JobTable(self.jobs)
+        return self._table
+
+    def details(self):
+        """Detail fields of every job, by job_key; empty if they were never stored."""
+        if self._details is None:
+            self._details = self._store.read_details(self.id) if self._store is not None else {}
+        return self._details
+
+    def job_details(self, job_key):
+        """Detail fields of one job, None if the set has none for it."""
+        return self.details().get(job_key)
+
+    def __len__(self):
+        return len(self.jobs)
+
+
+class ResultStore:
+    """Process-wide store of search results, so sessions hold only a result set ID.
+
+    Result sets are keyed by a hash of their content: sessions that get the
+    same results share one copy, and its JobTable. The most recently used
+    sets stay in memory; every set is also written to disk as gzipped
+    columnar JSON, with its jobs' details in a file beside it, so an
+    evicted set, or one from before a restart, is read back with its
+    descriptions when a session asks for it.
+    """
+
+    def __init__(self, max_entries=RESULT_STORE_SIZE, directory=RESULTS_DIR, max_files=RESULT_STORE_DISK_FILES):
+        """
+        Args:
+            max_entries (int): Result sets kept in memory
+            directory (str): Where result sets are written, None to keep them in memory only
+            max_files (int): Result sets kept on disk, oldest removed first; 0 disables the disk
+        """
+        self.max_entries = max_entries
+        self.directory = directory if max_files else None
+        self.max_files = max_files
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._file_count = None
+
+    def _path(self, result_id):
+        return os.path.join(self.directory, f"{result_id}.json.gz")
+
+    def _details_path(self, result_id):
+        return os.path.join(self.directory, f"{result_id}{_DETAILS_SUFFIX}")
+
+    def _remember(self, result):
+        with self._lock:
+            self._entries[result.id] = result
+            self._entries.move_to_end(result.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, jobs, details=None):
+        """
+        Store a result list.
+
+        Args:
+            jobs (list): Job summaries, in display order
+            details (dict, optional): job_key -> detail fields split off the summaries,
+                see utils.job_model.summarize_jobs
+
+        Returns:
+            str: The result set ID, the same for the same jobs and details in the same order
+        """
+        payload = _encode(jobs)
+        details_payload = json.dumps(details or {}, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8")
+        result_id = hashlib.sha1(payload + b"\0" + details_payload).hexdigest()[:20]
+        with self._lock:
+            shared = result_id in self._entries
+            if shared:
+                self._entries.move_to_end(result_id)
+        metrics.inc("result_sets_stored_total", result="shared" if shared else "new")
+        if shared:
+            return result_id
+
+        # Details written to disk are read back only when needed; otherwise they stay in memory
+        written = bool(self.directory) and (
+            os.path.exists(self._path(result_id)) or self._write(result_id, payload, details_payload)
+        )
+        self._remember(ResultSet(result_id, list(jobs), None if written else dict(details or {}), self))
+        return result_id
+
+    def _write_file(self, path, payload):
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wb", compresslevel=1) as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+    def _write(self, result_id, payload, details_payload):
+        """Write a result set and its details; returns False if it could not be written."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # The set file goes last, so a set on disk always has its details
+            self._write_file(self._details_path(result_id), details_payload)
+            self._write_file(self._path(result_id), payload)
+        except OSError as e:
+            print(f"Could not write result set {result_id}: {e}")
+            return False
+        self._prune()
+        return True
+
+    def read_details(self, result_id):
+        """
+        Read the details stored with a result set.
+
+        Returns:
+            dict: job_key -> detail fields, empty if there are none on disk
+        """
+        if not self.directory or not os.path.exists(self._details_path(result_id)):
+            return {}
+        with metrics.span("cache_lookup", cache="result_details"):
+            try:
+                with gzip.open(self._details_path(result_id), "rb") as f:
+                    return json.loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"Could not read details of result set {result_id}: {e}")
+                return {}
+
+    def _set_files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(".json.gz") and not name.endswith(_DETAILS_SUFFIX)]
+
+    def _prune(self):
+        with self._lock:
+            if self._file_count is None:
+                self._file_count = len(self._set_files())
+            else:
+                self._file_count += 1
+            if self._file_count <= self.max_files:
+                return
+            # Drop the oldest tenth at once so the directory isn't listed on every write
+            paths = self._set_files()
+            paths.sort(key=lambda path: os.path.getmtime(path))
+            excess = len(paths) - self.max_files + self.max_files // 10
+            for path in paths[:max(0, excess)]:
+                for stale in (path, path[:-len(".json.gz")] + _DETAILS_SUFFIX):
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+            self._file_count = len(paths) - max(0, excess)
+
+    def get(self, result_id):
+        """
+        Get a result set by ID, from memory or else from disk.
+
+        Returns:
+            ResultSet: The result set, or None if it is unknown or was removed
+        """
+        with metrics.span("cache_lookup", cache="result_sets"):
+            with self._lock:
+                result = self._entries.get(result_id)
+                if result is not None:
+                    self._entries.move_to_end(result_id)
+            source = "hit" if result is not None else "miss"
+            if result is None and self.directory and os.path.exists(self._path(result_id)):
+                try:
+                    with gzip.open(self._path(result_id), "rb") as f:
+                        result = ResultSet(result_id, _decode(f.read()), store=self)
+                except (OSError, ValueError) as e:
+                    print(f"Could not read result set {result_id}: {e}")
+                else:
+                    self._remember(result)
+                    source = "disk"
+        metrics.inc("cache_requests_total", cache="result_sets", result=source)
+        return result
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+result_store = ResultStore()
@@ -0,0 +1,328 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    SAVED_SEARCHES_PATH, NOTIFICATIONS_PATH, NOTIFICATION_INBOX_SIZE,
+    SAVED_SEARCH_INTERVAL_MINUTES, SCHEDULER_TICK_SECONDS, SCHEDULER_MAX_WORKERS
+)
+from utils.delta import delta_tracker, query_key
+from utils.instrumentation import metrics
+
+
+class SavedSearch:
+    """A user's saved search spec and its refresh schedule."""
+
+    def __init__(self, owner, keywords, location, platforms=None, count=5, days_ago=7, job_types=None,
+                 experience=None, name=None, interval_minutes=SAVED_SEARCH_INTERVAL_MINUTES, search_id=None,
+                 created_at=None, last_run_at=None):
+        """
+        Args:
+            owner (str): User the search belongs to
+            keywords (str): Search keywords
+            location (str): Job location
+            platforms (list, optional): Platforms to search, None for all
+            count (int): Jobs per platform
+            days_ago (int): Recency filter
+            job_types (list, optional): Job types to keep, e.g. "Full-time"
+            experience (str, optional): Experience option from the search form, e.g. "3-5"
+            name (str, optional): Label shown to the user, defaults to "keywords in location"
+            interval_minutes (float): How often the scheduler refreshes it
+            search_id (str, optional): Existing id when loading, a new one is generated otherwise
+            created_at (float, optional): Unix time the search was saved
+            last_run_at (float, optional): Unix time the scheduler last refreshed it
+        """
+        self.id = search_id or uuid.uuid4().hex[:12]
+        self.owner = owner
+        self.keywords = keywords
+        self.location = location
+        self.platforms = list(platforms or [])
+        self.count = count
+        self.days_ago = days_ago
+        self.job_types = list(job_types or [])
+        self.experience = experience
+        self.name = name or f"{keywords} in {location}"
+        self.interval_minutes = interval_minutes
+        self.created_at = created_at or time.time()
+        self.last_run_at = last_run_at
+
+    @property
+    def query_key(self):
+        """Key shared by every saved search with the same query, used for delta tracking."""
+        return query_key(self.keywords, self.location, self.platforms, self.days_ago, self.job_filter())
+
+    @property
+    def spec_key(self):
+        """Key shared by every saved search needing the same upstream fetch."""
+        return (self.query_key, self.count)
+
+    def job_filter(self):
+        from utils.job_filters import JobFilter
+        return JobFilter(job_types=self.job_types, max_age_days=self.days_ago, experience=self.experience)
+
+    def search_kwargs(self):
+        """Keyword arguments for JobSearchAgent.search_jobs."""
+        return {
+            "keywords": self.keywords,
+            "location": self.location,
+            "platforms": self.platforms or None,
+            "count": self.count,
+            "days_ago": self.days_ago,
+            "job_filter": self.job_filter(),
+        }
+
+    def is_due(self, now=None):
+        if self.last_run_at is None:
+            return True
+        return (now or time.time()) - self.last_run_at >= self.interval_minutes * 60
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "owner": self.owner,
+            "name": self.name,
+            "keywords": self.keywords,
+            "location": self.location,
+            "platforms": self.platforms,
+            "count": self.count,
+            "days_ago": self.days_ago,
+            "job_types": self.job_types,
+            "experience": self.experience,
+            "interval_minutes": self.interval_minutes,
+            "created_at": self.created_at,
+            "last_run_at": self.last_run_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["search_id"] = data.pop("id", None)
+        return cls(**data)
+
+
+class SavedSearchStore:
+    """Saved searches persisted as one JSON file, rewritten atomically on every change."""
+
+    def __init__(self, path=SAVED_SEARCHES_PATH):
+        """
+        Args:
+            path (str): JSON file holding the saved searches
+        """
+        self.path = path
+        self._searches = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load saved searches from {self.path}: {e}")
+            return
+        for record in records:
+            search = SavedSearch.from_dict(record)
+            self._searches[search.id] = search
+
+    def save(self):
+        """Write every saved search to disk."""
+        # The scheduler thread and session threads save concurrently; they share the temp file
+        with self._lock:
+            records = [search.to_dict() for search in self._searches.values()]
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=2)
+            os.replace(temp_path, self.path)
+
+    def add(self, search):
+        with self._lock:
+            self._searches[search.id] = search
+        self.save()
+        return search
+
+    def remove(self, search_id):
+        with self._lock:
+            removed = self._searches.pop(search_id, None)
+        if removed is not None:
+            self.save()
+        return removed
+
+    def get(self, search_id):
+        with self._lock:
+            return self._searches.get(search_id)
+
+    def for_owner(self, owner):
+        with self._lock:
+            return sorted(
+                (search for search in self._searches.values() if search.owner == owner),
+                key=lambda search: search.created_at
+            )
+
+    def all(self):
+        with self._lock:
+            return list(self._searches.values())
+
+
+class LocalNotificationSink:
+    """Delivers new-match notifications to an in-process inbox per user and a JSON-lines log.
+
+    The app reads a user's inbox on its next rerun, so alerts reach users
+    without them re-running searches.
+    """
+
+    def __init__(self, path=NOTIFICATIONS_PATH, inbox_size=NOTIFICATION_INBOX_SIZE):
+        """
+        Args:
+            path (str, optional): JSON-lines file every notification is appended to, None to skip
+            inbox_size (int): Notifications kept per user
+        """
+        self.path = path
+        self.inbox_size = inbox_size
+        self._inboxes = defaultdict(lambda: deque(maxlen=self.inbox_size))
+        self._lock = threading.Lock()
+
+    def notify(self, owner, search, jobs):
+        """
+        Record new or changed matches for a saved search.
+
+        Args:
+            owner (str): User to notify
+            search (SavedSearch): The saved search that matched
+            jobs (list): New or changed job dictionaries
+        """
+        notification = {
+            "owner": owner,
+            "search_id": search.id,
+            "search_name": search.name,
+            "created_at": time.time(),
+            "jobs": [
+                {field: job.get(field) for field in ("title", "company", "location", "platform", "apply_url", "delta")}
+                for job in jobs
+            ],
+        }
+        with self._lock:
+            self._inboxes[owner].append(notification)
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(notification) + "\n")
+        metrics.inc("notifications_total", sink="local")
+
+    def pending(self, owner):
+        """Undelivered notifications for owner, oldest first."""
+        with self._lock:
+            return list(self._inboxes.get(owner, ()))
+
+    def pop(self, owner):
+        """Return and clear owner's undelivered notifications."""
+        with self._lock:
+            inbox = self._inboxes.pop(owner, None)
+        return list(inbox or ())
+
+
+class SearchScheduler:
+    """Refreshes due saved searches in the background and notifies users of new matches.
+
+    Due searches are grouped by spec, so identical searches from many users
+    cost one upstream fetch per tick. Each group's results then go through
+    every member's delta seen-set, and only new or changed postings are
+    pushed to the notification sink.
+    """
+
+    def __init__(self, store, agent, sink, tracker=None, tick_seconds=SCHEDULER_TICK_SECONDS,
+                 max_workers=SCHEDULER_MAX_WORKERS):
+        """
+        Args:
+            store (SavedSearchStore): Saved searches to refresh
+            agent (JobSearchAgent): Runs the searches
+            sink (LocalNotificationSink): Where new matches are delivered
+            tracker (DeltaTracker, optional): Seen-sets, defaults to the shared delta_tracker
+            tick_seconds (float): How often to check for due searches
+            max_workers (int): Distinct specs fetched concurrently
+        """
+        self.store = store
+        self.agent = agent
+        self.sink = sink
+        self.tracker = tracker or delta_tracker
+        self.tick_seconds = tick_seconds
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self, now=None):
+        """
+        Refresh every due saved search once.
+
+        Returns:
+            dict: fetches (upstream searches run), searches (saved searches refreshed)
+                and notified (saved searches with new matches)
+        """
+        now = now or time.time()
+        groups = defaultdict(list)
+        for search in self.store.all():
+            if search.is_due(now):
+                groups[search.spec_key].append(search)
+        if not groups:
+            return {"fetches": 0, "searches": 0, "notified": 0}
+
+        with metrics.trace("scheduled_refresh", specs=len(groups)):
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="saved-search") as executor:
+                # The scheduler wants current data, not a stale cached answer
+                results = executor.map(
+                    lambda members: self.agent.search_jobs({}, stale_ok=False, **members[0].search_kwargs()),
+                    groups.values()
+                )
+                results = list(results)
+
+            notified = 0
+            for members, jobs in zip(groups.values(), results):
+                for search in members:
+                    # The first run only records a baseline. Seen-sets live in memory, so
+                    # the first run after a restart does too, instead of re-announcing
+                    # everything the user already saw.
+                    baseline = search.last_run_at is None or not self.tracker.seen_count(search.owner, search.query_key)
+                    changes = self.tracker.delta(search.owner, search.query_key, jobs)
+                    if changes and not baseline:
+                        self.sink.notify(search.owner, search, changes)
+                        notified += 1
+                    search.last_run_at = now
+
+        self.store.save()
+        metrics.inc("scheduler_fetches_total", len(groups))
+        metrics.inc("scheduler_searches_total", sum(len(members) for members in groups.values()))
+        return {
+            "fetches": len(groups),
+            "searches": sum(len(members) for members in groups.values()),
+            "notified": notified,
+        }
+
+    def _loop(self):
+        while not self._stop.wait(self.tick_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Saved search refresh failed: {e}")
+
+    def start(self):
+        """Start refreshing on a background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="search-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
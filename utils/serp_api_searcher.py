@@ -1,107 +1,442 @@
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from config import SERPAPI_API_KEY
+from config import (
+    SERPAPI_API_KEY, SCRAPINGDOG_API_KEY, SCRAPINGDOG_API_URL, SCRAPINGDOG_JOB_DETAILS_URL,
+    PROVIDER_CONNECT_TIMEOUT, PROVIDER_READ_TIMEOUT,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_MIN_REQUESTS, CIRCUIT_CONSECUTIVE_FAILURES,
+    CIRCUIT_OPEN_SECONDS, CIRCUIT_SLOW_CALL_SECONDS,
+    SCRAPINGDOG_RATE_LIMIT, SCRAPINGDOG_RATE_BURST, RATE_LIMIT_WAIT_SECONDS,
+    RESULT_CACHE_TTL, RESULT_CACHE_SIZE, RESULT_CACHE_STALE_TTL, BACKGROUND_REFRESH_WORKERS,
+    SCRAPINGDOG_DAILY_QUOTA
+)
+from utils.instrumentation import metrics
+from utils.circuit_breaker import get_breaker, OPEN
+from utils.companies import companies
+from utils.job_attributes import extract_all
+from utils.http import get_session
+from utils.job_filters import PLATFORM, RECENCY, JOB_TYPE, platform_matches
+from utils.providers import SearchProvider, ProviderCapabilities
+from utils.rate_limiter import TokenBucket, CallQuota
+from utils.result_cache import ResultCache
+from utils.streaming_json import iter_object_stream, iter_text_chunks
 
+# Bytes read from the response body per streaming step
+STREAM_CHUNK_SIZE = 64 * 1024
 
+class ScrapingDogError(Exception):
+    """Raised when ScrapingDog returns a non-200 status or an error payload."""
 
 
-import requests
+class SerpApiSearcher(SearchProvider):
+    """ScrapingDog google_jobs client.
+
+    Use utils.providers.get_provider("scrapingdog") rather than constructing
+    one directly, so the whole process shares one connection pool, response
+    cache and rate limit.
+    """
+
+    name = "scrapingdog"
+    capabilities = ProviderCapabilities(
+        supports_paging=True, supports_date_filter=True, cost_per_call=1.0,
+        filter_pushdown=(PLATFORM, RECENCY, JOB_TYPE)
+    )
+
+    def __init__(self, api_url=None, api_key=None, session=None, rate_limiter=None, cache=None, quota=None):
+        """
+        Args:
+            api_url (str, optional): ScrapingDog google_jobs endpoint, defaults to config
+            api_key (str, optional): ScrapingDog API key, defaults to config
+            session (requests.Session, optional): HTTP session, defaults to the shared "scrapingdog" session
+            rate_limiter (TokenBucket, optional): Request rate limit, defaults to a new bucket from config
+            cache (ResultCache, optional): Response cache, defaults to a new cache from config
+            quota (CallQuota, optional): API credit allowance, defaults to SCRAPINGDOG_DAILY_QUOTA
+        """
+        self.api_url = api_url or SCRAPINGDOG_API_URL
+        self.api_key = api_key or SCRAPINGDOG_API_KEY
+        self.timeout = (PROVIDER_CONNECT_TIMEOUT, PROVIDER_READ_TIMEOUT)
+        self.session = session or get_session("scrapingdog")
+        self.rate_limiter = rate_limiter or TokenBucket(SCRAPINGDOG_RATE_LIMIT, SCRAPINGDOG_RATE_BURST)
+        self.cache = cache if cache is not None else ResultCache(
+            "scrapingdog", RESULT_CACHE_TTL, RESULT_CACHE_SIZE, stale_ttl=RESULT_CACHE_STALE_TTL
+        )
+        self.quota = quota or CallQuota(SCRAPINGDOG_DAILY_QUOTA)
+        # Cache keys with a background refresh in flight, so each is refreshed once
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor = None
+        # One breaker per endpoint, shared by every searcher in the process
+        self.breaker = get_breaker(
+            f"scrapingdog:{self.api_url}",
+            failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+            min_requests=CIRCUIT_MIN_REQUESTS,
+            consecutive_failures=CIRCUIT_CONSECUTIVE_FAILURES,
+            open_seconds=CIRCUIT_OPEN_SECONDS,
+            slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS
+        )
+
+    def is_available(self):
+        """Return False without an API key, or while the ScrapingDog circuit is open and calls fail fast."""
+        return bool(self.api_key) and self.breaker.state != OPEN
+
+    def health(self):
+        """Circuit state plus rolling error rate and latency for ScrapingDog."""
+        return self.breaker.snapshot()
+
+    def quota_remaining(self):
+        """API calls left in the current quota window, None if unlimited."""
+        return self.quota.remaining()
+
+    def _chips(self, days_ago, filters):
+        """Google Jobs chips for the pushed-down recency and employment type filters."""
+        chips = [f"date_posted:{days_ago}d"]
+        employment_types = filters.employment_types() if filters is not None else []
+        if employment_types:
+            chips.append("employment_type:" + ",".join(sorted(employment_types)))
+        return ",".join(chips)
 
-# SerpDogAPI
+    @staticmethod
+    def _query(keywords, location):
+        """Query text, with known locations spelled canonically so variants share one query and cache entry."""
+        from utils.geo import gazetteer
+
+        place = gazetteer.lookup(location)
+        return f"{keywords} jobs in {place.label if place is not None else location}"
+
+    def _cache_key(self, keywords, location, platform, count, days_ago, pages=1, filters=None):
+        # Every argument that shapes the fetch is part of the key: a result fetched with
+        # fewer pages must not answer a search allowed more
+        return (self._query(keywords, location), self._chips(days_ago, filters), (platform or "all").lower(), count,
+                max(1, pages))
+
+    def is_cached(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, filters=None):
+        """Whether this search would be answered from the cache, fresh or stale, without waiting."""
+        return self.cache.is_servable(self._cache_key(keywords, location, platform, count, days_ago, pages, filters))
+
+    def is_refreshing(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, filters=None):
+        """Whether a background refresh for this search is still in flight."""
+        with self._refresh_lock:
+            return self._cache_key(keywords, location, platform, count, days_ago, pages, filters) in self._refreshing
+
+    def search_jobs(self, keywords, location, platform=None, count=5, days_ago=5, pages=1, stale_ok=True,
+                    filters=None):
+        """
+        Search ScrapingDog google_jobs, answering from the shared cache when possible.
+
+        A stale cached result is returned immediately when stale_ok is set,
+        and a background refresh replaces it in the cache for the next call.
+
+        Args:
+            keywords (str): Search keywords or job title
+            location (str): Job location
+            platform (str, optional): Keep only jobs posted via this platform
+            count (int): Maximum number of jobs to return
+            days_ago (int): Only jobs posted within this many days
+            pages (int): Result pages to fetch at most
+            stale_ok (bool): Serve a stale cached result instead of waiting for the API
+            filters (JobFilter, optional): Pushed-down filters; employment types become a chip
+
+        Returns:
+            list: Job dictionaries, empty on failure
+        """
+        if not self.api_key:
+            print("SCRAPINGDOG_API_KEY is not set, skipping ScrapingDog search.")
+            return []
 
-class SerpApiSearcher:
-    def search_jobs(self, keywords, location, platform=None, count=5, days_ago=5):
+        params = {
+            "api_key": self.api_key,
+            "query": self._query(keywords, location),
+            # "country": "us",
+            "language": "en_us",
+            "chips": self._chips(days_ago, filters)
+        }
+
+        # Identical searches from any session reuse one response while it is fresh
+        cache_key = self._cache_key(keywords, location, platform, count, days_ago, pages, filters)
+        found = self.cache.lookup(cache_key)
+        if found is not None:
+            cached, fresh, _ = found
+            if fresh or stale_ok:
+                if not fresh:
+                    self._refresh_in_background(cache_key, params, platform, count, pages)
+                return [dict(job) for job in cached]
+
+        jobs = self._fetch_pages(params, platform, count, pages)
+        if jobs is None:
+            return []
+        self.cache.put(cache_key, [dict(job) for job in jobs])
+        return jobs
+
+    def _fetch_pages(self, params, platform, count, pages):
+        """Fetch up to pages result pages until count jobs matched. Returns None if the first page failed."""
+        jobs = []
+        for page in range(max(1, pages)):
+            page_jobs, next_page_token = self._request_page(params, platform, count - len(jobs))
+            if page_jobs is None:
+                # A failed first page means no usable answer; later failures keep what we have
+                if page == 0:
+                    return None
+                break
+            jobs.extend(page_jobs)
+            if len(jobs) >= count or not next_page_token:
+                break
+            params = dict(params, next_page_token=next_page_token)
+
+        metrics.inc("provider_jobs_total", len(jobs), provider="scrapingdog")
+        return jobs
+
+    def _refresh_in_background(self, cache_key, params, platform, count, pages):
+        """Re-fetch a stale result off the request path; the stale entry stays until it succeeds."""
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=BACKGROUND_REFRESH_WORKERS, thread_name_prefix="scrapingdog-refresh"
+                )
+
+        def refresh():
+            try:
+                with metrics.span("background_refresh", provider="scrapingdog"):
+                    jobs = self._fetch_pages(params, platform, count, pages)
+                if jobs is not None:
+                    self.cache.put(cache_key, [dict(job) for job in jobs])
+                metrics.inc("background_refreshes_total", provider="scrapingdog",
+                            result="ok" if jobs is not None else "failed")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+
+        metrics.inc("stale_served_total", provider="scrapingdog")
+        self._refresh_executor.submit(refresh)
+
+    def _request_page(self, params, platform, count):
+        """
+        Fetch one result page through the quota, rate limit and circuit breaker.
+
+        Returns:
+            tuple: (jobs, next_page_token), jobs is None if the page could not be fetched
+        """
+        if self.quota.remaining() == 0:
+            metrics.inc("quota_exhausted_total", provider="scrapingdog")
+            print("ScrapingDog quota exhausted, skipping request.")
+            return None, None
+
+        if not self.rate_limiter.acquire(timeout=RATE_LIMIT_WAIT_SECONDS):
+            metrics.inc("rate_limited_total", provider="scrapingdog")
+            print("ScrapingDog rate limit reached, skipping request.")
+            return None, None
+
+        if not self.breaker.allow_request():
+            print("ScrapingDog circuit is open, skipping request.")
+            return None, None
+
+        self.quota.consume()
+        start = time.perf_counter()
         try:
-            url = "https://api.scrapingdog.com/google_jobs"
-            api_key = "68031c85580e2c83a197311a"
-
-            params = {
-                "api_key": api_key,
-                "query": f"{keywords} jobs in {location}",
-                # "country": "us",
-                "language": "en_us",
-                "chips": f"date_posted:{days_ago}d"
-            }
-
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # return data
-            # else:
-            #     print(f"Request failed with status code: {response.status_code}")
-            #     return []
-            if "error" in data:
-                print(f"ScrapingDog API error: {data['error']}")
-                return []
+            jobs, extensions, next_page_token = self._request_jobs(params, platform, count)
+        except Exception as e:
+            self.breaker.record_failure(time.perf_counter() - start)
+            metrics.inc("provider_errors_total", provider="scrapingdog")
+            print(f"ScrapingDog API error: {e}")
+            return None, None
+        self.breaker.record_success(time.perf_counter() - start)
 
-            jobs = []
-            if "jobs_results" in data:
-                job_results = data["jobs_results"]
+        if jobs is None:
+            print("No job results found in response.")
+            return None, next_page_token
 
-                for i, job in enumerate(job_results):
-                    if i >= count:
+        # Extraction is local work: its failures must not count against ScrapingDog or cost the page
+        self._extract_attributes(jobs, extensions)
+        return jobs, next_page_token
+
+    def _extract_attributes(self, jobs, extensions):
+        """
+        Pull salary, seniority, skills and the like out of a page's jobs once.
+
+        Filters and ranking then never rescan descriptions. Large pages are
+        extracted in worker processes. If extraction fails, the jobs are kept
+        without the attributes and JobTable parses them from text instead.
+        """
+        try:
+            extract_all(jobs, extensions)
+        except Exception as e:
+            metrics.inc("extraction_errors_total", provider="scrapingdog")
+            print(f"Job attribute extraction failed: {e}")
+
+    def _request_jobs(self, params, platform, count):
+        """Call the google_jobs endpoint and parse the response body as it streams in, see _parse_jobs_stream."""
+        with metrics.span("provider_call", provider="scrapingdog"):
+            response = self.session.get(self.api_url, params=params, timeout=self.timeout, stream=True)
+        metrics.inc("provider_requests_total", provider="scrapingdog", status=response.status_code)
+
+        # Closing the response also abandons any part of the body we did not need
+        with response:
+            if response.status_code != 200:
+                raise ScrapingDogError(f"request failed with status code: {response.status_code}")
+
+            with metrics.span("parse", provider="scrapingdog"):
+                chunks = iter_text_chunks(
+                    response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                    response.encoding or "utf-8"
+                )
+                return self._parse_jobs_stream(chunks, platform, count)
+
+    def _parse_jobs_stream(self, chunks, platform, count):
+        """
+        Build job dictionaries from a streamed google_jobs payload.
+
+        jobs_results entries are decoded one at a time and reduced to the
+        fields we use. Parsing stops once count jobs matched the platform
+        filter, unless a kept job still needs the apply link from
+        related_links and that member has not been seen yet.
+
+        Args:
+            chunks (iterable): Text chunks of the response body
+            platform (str): Platform filter, None or "all" to keep every job
+            count (int): Maximum number of jobs to return
+
+        Returns:
+            tuple: (jobs, extensions, next_page_token). jobs is None if the
+                payload had no jobs_results; extensions holds each kept job's
+                detected_extensions, for attribute extraction; next_page_token
+                is None if there is no further page or parsing stopped before
+                reaching it
+
+        Raises:
+            ScrapingDogError: If the payload contains an error member
+        """
+        jobs = []
+        extensions = []  # detected_extensions of each kept job, for attribute extraction
+        pending = []  # jobs that fall back to the related_links apply URL
+        related_apply_url = None
+        seen_related_links = False
+        seen_results = False
+        next_page_token = None
+
+        for key, value in iter_object_stream(chunks, stream_keys=("jobs_results",)):
+            if key == "error":
+                raise ScrapingDogError(value)
+
+            if key == "scrapingdog_pagination":
+                next_page_token = (value or {}).get("next_page_token")
+
+            if key == "related_links":
+                # One scan per response instead of one per job without an apply link
+                seen_related_links = True
+                for link in value or []:
+                    if "apply" in link.get("text", "").lower():
+                        related_apply_url = link.get("link")
                         break
 
-                    title = job.get("title", "Unknown Title")
-                    company = job.get("company_name", "Unknown Company")
-                    location_name = job.get("location", "Unknown Location")
-                    
-                    description = job.get("description") or job.get("snippet", "No available description")
+            elif key == "jobs_results":
+                seen_results = True
+                if len(jobs) >= count:
+                    continue
+                job_entry = self._build_job_entry(value, platform)
+                if job_entry is None:
+                    continue
+                if job_entry["apply_url"] is None and value.get("job_id"):
+                    pending.append((job_entry, value["job_id"]))
+                jobs.append(job_entry)
+                extensions.append(value.get("detected_extensions") or {})
 
-                    # Extract job type
-                    job_type = "Not Specified"
-                    if "detected_extensions" in job:
-                        ext = job["detected_extensions"]
-                        job_type = ext.get("schedule_type") or ext.get("employment_type", job_type)
-            
+            if len(jobs) >= count and (not pending or seen_related_links):
+                break
+
+        if not seen_results:
+            return None, None, next_page_token
 
-                    # Apply URL
-                    apply_url = None
-                    if "apply_link" in job and "link" in job["apply_link"]:
-                        apply_url = job["apply_link"]["link"]
-                    elif "apply_options" in job and job["apply_options"]:
-                        apply_url = job["apply_options"][0].get("link")
-                    elif "job_id" in job and "related_links" in data:
-                        for link in data.get("related_links", []):
-                            if "apply" in link.get("text", "").lower():
-                                apply_url = link.get("link")
-                                break
-                    if not apply_url and "job_id" in job:
-                        apply_url = f"https://www.google.com/search?q={job['job_id']}"
-
-                    date_posted = "Recent"
-                    if "detected_extensions" in job and "posted_at" in job["detected_extensions"]:
-                        date_posted = job["detected_extensions"]["posted_at"]
-
-                    job_platform = job.get("via", "unknown")
-
-                    if platform and platform.lower() != "all" and platform.lower() not in job_platform.lower():
-                        continue
-
-                    job_entry = {
-                        "title": title,
-                        "company": company,
-                        "location": location_name,
-                        "description": description,
-                        "url": apply_url,
-                        "apply_url": apply_url,
-                        "date_posted": date_posted,
-                        "platform": job_platform,
-                        "job_type": job_type,
-                        "is_real_job": True
-                    }
-
-                    jobs.append(job_entry)
-
-                return jobs
-            else:
-                print("No job results found in response.")
-                return []
+        for job_entry, job_id in pending:
+            apply_url = related_apply_url or f"https://www.google.com/search?q={job_id}"
+            job_entry["url"] = job_entry["apply_url"] = apply_url
 
+        return jobs, extensions, next_page_token
+
+    def _build_job_entry(self, job, platform):
+        """Reduce one jobs_results entry to a job dictionary, or None if it fails the platform filter."""
+        job_platform = job.get("via", "unknown")
+        if not platform_matches(job_platform, platform):
+            return None
+
+        title = job.get("title", "Unknown Title")
+        company = job.get("company_name", "Unknown Company")
+        location_name = job.get("location", "Unknown Location")
+
+        description = job.get("description") or job.get("snippet", "No available description")
+
+        # Extract job type
+        job_type = "Not Specified"
+        ext = job.get("detected_extensions") or {}
+        job_type = ext.get("schedule_type") or ext.get("employment_type", job_type)
+
+        # Apply URL; jobs without one are resolved from related_links once parsing is done
+        apply_url = None
+        if "apply_link" in job and "link" in job["apply_link"]:
+            apply_url = job["apply_link"]["link"]
+        elif "apply_options" in job and job["apply_options"]:
+            apply_url = job["apply_options"][0].get("link")
+
+        date_posted = ext.get("posted_at", "Recent")
+
+        return {
+            "title": title,
+            "company": company,
+            "company_id": companies.intern(company),
+            "location": location_name,
+            "description": description,
+            "url": apply_url,
+            "apply_url": apply_url,
+            "date_posted": date_posted,
+            "platform": job_platform,
+            "job_type": job_type,
+            "job_id": job.get("job_id"),
+            "is_real_job": True
+        }
+
+    def get_job_details(self, job_id):
+        """
+        Fetch the full details of one job by its provider job_id.
+
+        Only available when SCRAPINGDOG_JOB_DETAILS_URL is configured.
+
+        Args:
+            job_id (str): The job_id from a google_jobs result
+
+        Returns:
+            dict: Detail fields such as "description", or None if unavailable
+        """
+        if not SCRAPINGDOG_JOB_DETAILS_URL or not self.api_key or not self.rate_limiter.try_acquire():
+            return None
+        if not self.breaker.allow_request():
+            return None
+
+        start = time.perf_counter()
+        try:
+            with metrics.span("provider_call", provider="scrapingdog", call="job_details"):
+                response = self.session.get(
+                    SCRAPINGDOG_JOB_DETAILS_URL,
+                    params={"api_key": self.api_key, "job_id": job_id},
+                    timeout=self.timeout
+                )
+            if response.status_code != 200:
+                raise ScrapingDogError(f"request failed with status code: {response.status_code}")
+            data = response.json()
+            if "error" in data:
+                raise ScrapingDogError(data["error"])
         except Exception as e:
-            print(f"ScrapingDog API error: {e}")
-            return []
+            self.breaker.record_failure(time.perf_counter() - start)
+            print(f"ScrapingDog job details error: {e}")
+            return None
+        self.breaker.record_success(time.perf_counter() - start)
+
+        job = data["jobs_results"][0] if data.get("jobs_results") else data
+        description = job.get("description") or job.get("snippet")
+        return {"description": description} if description else None
 
 # # if __name__ == '__main__':
 # #     search_query = "data scientist jobs in usa"
@@ -0,0 +1,303 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed document is not a well-formed JSON object."""
+
+
+class _TextBuffer:
+    """Unconsumed text from a chunk iterator, refilled on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+        """Append the next chunk, dropping the consumed prefix. Returns False at end of stream."""
+        for chunk in self._chunks:
+            if chunk:
+                self.text = self.text[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.exhausted = True
+        return False
+
+    def peek(self):
+        """Skip whitespace and return the next character, or None at end of stream."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise JSONStreamError(f"Expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def decode_value(self):
+        """Decode one complete JSON value starting at the current position."""
+        if self.peek() is None:
+            raise JSONStreamError("Unexpected end of JSON stream")
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            else:
+                if self.exhausted or self._is_complete(end):
+                    self.pos = end
+                    return value
+            self.fill()
+
+    def _is_complete(self, end):
+        """Whether a value decoded up to end cannot continue in the next chunk."""
+        # Strings, objects and arrays end at their own delimiter
+        if self.text[self.pos] in '"{[':
+            return True
+        # A number or literal may be cut anywhere ("12" of "123", "12." of "12.5",
+        # "1e" of "1e5"), so it is only complete once a separator follows it
+        following = _WHITESPACE.match(self.text, end).end()
+        return following < len(self.text) and self.text[following] in ",]}"
+
+
+def iter_text_chunks(byte_chunks, encoding="utf-8"):
+    """
+    Decode an iterator of byte chunks into text without splitting multi-byte characters.
+
+    Args:
+        byte_chunks (iterable): Raw byte chunks, e.g. response.iter_content()
+        encoding (str): Text encoding of the stream
+
+    Yields:
+        str: Decoded text chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_object_stream(chunks, stream_keys=()):
+    """
+    Incrementally decode a top-level JSON object.
+
+    Members whose key is in stream_keys and whose value is an array are
+    yielded one element at a time as (key, element), so only a single element
+    is held in memory at once. Every other member is decoded whole and
+    yielded as (key, value). The caller may stop iterating at any point to
+    abandon the rest of the document.
+
+    Args:
+        chunks (iterable): Text chunks making up the document
+        stream_keys (tuple): Keys of array members to stream element by element
+
+    Yields:
+        tuple: (key, value) for regular members, (key, element) for streamed arrays
+
+    Raises:
+        JSONStreamError: If the document is not a JSON object
+        json.JSONDecodeError: If a member value is malformed
+    """
+    buf = _TextBuffer(chunks)
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+
+    while True:
+        key = buf.decode_value()
+        if not isinstance(key, str):
+            raise JSONStreamError(f"Expected an object key but found {key!r}")
+        buf.expect(":")
+
+        if key in stream_keys and buf.peek() == "[":
+            buf.pos += 1
+            if buf.peek() == "]":
+                buf.pos += 1
+            else:
+                while True:
+                    yield key, buf.decode_value()
+                    separator = buf.peek()
+                    buf.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise JSONStreamError(f"Expected ',' or ']' in {key!r} but found {separator!r}")
+        else:
+            yield key, buf.decode_value()
+
+        separator = buf.peek()
+        buf.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise JSONStreamError(f"Expected ',' or '}}' but found {separator!r}")
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class PartialJSONParser:
+    """Tolerant incremental parser for a JSON document that arrives in pieces.
+
+    Each feed() scans only the new text and returns the document received
+    so far as a Python value: open strings are closed, open objects and
+    arrays are closed, and a member whose key or scalar value is still
+    incomplete is left out until it is. Text before the first "{" or "["
+    (such as a Markdown code fence) and anything after the top-level value
+    closes are ignored.
+
+    Building that value re-parses the document received so far, so a feed
+    costs time linear in the whole document, not just the chunk. It is
+    skipped when the chunk completed nothing new, e.g. it ended inside a
+    key or number.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        self._started = False
+        self._pos = 0
+        self._stack = []           # open containers, as "{" or "["
+        self._expect_key = False   # inside an object, waiting for a key
+        self._string_start = None  # start of the open string, if any
+        self._string_is_key = False
+        self._escape_start = None  # start of an incomplete escape inside the open string
+        self._scalar = False       # a number or literal is being read
+        self._clean = None         # (end, closers) of the longest prefix that closes into valid JSON
+        self._last = None
+        self._last_candidate = None  # (end, closers) the last snapshot was parsed from
+
+    def _closers(self):
+        return "".join(_CLOSERS[opener] for opener in reversed(self._stack))
+
+    def _mark_clean(self, end):
+        self._clean = (end, self._closers())
+
+    def _value_done(self, end):
+        self._mark_clean(end)
+        if not self._stack:
+            self.complete = True
+
+    def _scan(self):
+        text, i = self.text, self._pos
+        while i < len(text) and not self.complete:
+            char = text[i]
+            if self._string_start is not None:
+                if self._escape_start is not None:
+                    # \uXXXX needs four more characters, any other escape just one
+                    if text[self._escape_start + 1] != "u" or i - self._escape_start >= 5:
+                        self._escape_start = None
+                elif char == "\\":
+                    self._escape_start = i
+                elif char == '"':
+                    self._string_start = None
+                    if not self._string_is_key:
+                        self._value_done(i + 1)
+                i += 1
+                continue
+            if self._scalar and (char in ",]}:" or char.isspace()):
+                self._scalar = False
+                self._value_done(i)
+            if char == '"':
+                self._string_start = i
+                self._string_is_key = bool(self._stack) and self._stack[-1] == "{" and self._expect_key
+            elif char in "{[":
+                self._stack.append(char)
+                self._expect_key = char == "{"
+                self._mark_clean(i + 1)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+                self._value_done(i + 1)
+            elif char == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+            elif char == ":":
+                self._expect_key = False
+            elif not char.isspace():
+                self._scalar = True
+            i += 1
+        self._pos = i
+
+    def _snapshot(self):
+        if self._string_start is not None and not self._string_is_key:
+            # Show the open string value as far as it has arrived
+            end = self._escape_start if self._escape_start is not None else len(self.text)
+            bounds = (end, '"' + self._closers())
+        elif self._clean is not None:
+            bounds = self._clean
+        else:
+            return None
+        if bounds == self._last_candidate:
+            return self._last
+        try:
+            value = json.loads(self.text[:bounds[0]] + bounds[1])
+        except json.JSONDecodeError:
+            return None
+        self._last_candidate = bounds
+        return value
+
+    def feed(self, chunk):
+        """
+        Add the next piece of the document.
+
+        Args:
+            chunk (str): Text following everything fed so far
+
+        Returns:
+            The document received so far, or None if it has not changed
+            since the last call or nothing usable has arrived yet
+        """
+        if self.complete or not chunk:
+            return None
+        if not self._started:
+            start = min((chunk.find(opener) for opener in "{[" if opener in chunk), default=-1)
+            if start < 0:
+                return None
+            chunk = chunk[start:]
+            self._started = True
+        self.text += chunk
+        self._scan()
+        value = self._snapshot()
+        if value is None or value == self._last:
+            return None
+        self._last = value
+        return value
+
+    def value(self):
+        """The document received so far, or None if nothing usable has arrived."""
+        return self._last
+
+
+def iter_partial_values(chunks):
+    """
+    Yield a streamed JSON document as it grows, see PartialJSONParser.
+
+    Args:
+        chunks (iterable): Text chunks making up the document
+
+    Yields:
+        The document received so far, each time it changes
+    """
+    parser = PartialJSONParser()
+    for chunk in chunks:
+        value = parser.feed(chunk)
+        if value is not None:
+            yield value
+        if parser.complete:
+            return